@@ -9,14 +9,29 @@ def main():
     """
     Driver utama untuk parser.
     Mengambil 1 argumen: path ke file source code .pas
+    Opsi --parse-profile[=table|json] mencetak statistik parse per aturan ke stderr.
+    Opsi --generated-parser memakai parser hasil generate (di-cache di syntax/__generated__/).
     """
     
     # --- 1. Validasi Argumen Input ---
-    if len(sys.argv) != 2:
-        print("Usage: python syntax.py <source_file_path.pas>", file=sys.stderr)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    profile_format = None
+    generated = False
+    for option in options:
+        if option == "--generated-parser":
+            generated = True
+        elif option == "--parse-profile":
+            profile_format = "table"
+        elif option.startswith("--parse-profile="):
+            profile_format = option.split("=", 1)[1]
+        else:
+            profile_format = "invalid"
+    if len(args) != 1 or profile_format not in (None, "table", "json") or (generated and profile_format):
+        print("Usage: python compiler.py [--parse-profile[=table|json] | --generated-parser] <source_file_path.pas>", file=sys.stderr)
         sys.exit(1)
 
-    source_file_path = sys.argv[1]
+    source_file_path = args[0]
     if not source_file_path.lower().endswith('.pas'):
         print(f"Input Error: Source file harus berekstensi .pas. Diberikan: '{source_file_path}'", file=sys.stderr)
         sys.exit(1)
@@ -37,7 +52,7 @@ def main():
     lexer = Lexer(DFA_FILE_PATH)
     tokens = []
     try:
-        tokens = lexer.tokenize(source_code)
+        tokens = lexer.tokenize_buffer(source_code)
     except LexicalError as e:
         print(str(e), file=sys.stderr)
         sys.exit(1) # Keluar jika ada error leksikal
@@ -48,10 +63,13 @@ def main():
     # print("--------------------\n")
 
     # --- 4. Jalankan Parser ---
-    parser = SyntaxAnalyzer()
+    # Parse tree tidak dicetak, jadi AST langsung dibangun oleh aksi semantik parser.
+    # Pencatatan error hanya dilakukan jika parse pertama gagal. Kode parser hasil generate
+    # hanya dipakai jika diminta (--generated-parser), karena modulnya ditulis ke source tree.
+    profile = profile_format is not None
+    parser = SyntaxAnalyzer(build_ast=True, two_phase=True, generated=generated, profile=profile)
     try:
-        parse_tree = parser.parse(tokens=tokens)
-        # print(parse_tree)
+        ast = parser.parse(tokens=tokens)
     except SyntaxError as e:
         print(str(e), file=sys.stderr)
         sys.exit(1) # Keluar jika ada error sintaks
@@ -60,14 +78,19 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if profile:
+            report = parser.profiler.toJSON() if profile_format == "json" else parser.profiler.formatTable()
+            print(report, file=sys.stderr)
 
-    # --- 4. Jalankan Semantic Analyzer (parse_tree -> AST -> [ASTDecorated, SymbolTable]) ---
+    # --- 4. Jalankan Semantic Analyzer (AST -> [ASTDecorated, SymbolTable]) ---
     try:
         semantic_analyzer = SemanticAnalyzer()
-        decorated_ast, symbol_table, ast = semantic_analyzer.analyze(parse_tree, debug=True)
+        decorated_ast, symbol_table, ast = semantic_analyzer.analyze(ast, debug=True)
         # Print Output
         print(symbol_table)
-        print(decorated_ast)
+        decorated_ast.write_ast_decorated(sys.stdout.write)
+        print()
 
     except SemanticError as e:
         print(str(e), file=sys.stderr)
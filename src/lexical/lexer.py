@@ -1,9 +1,11 @@
 import json
 import sys
 import os
-from typing import List
+from array import array
+from bisect import bisect_left
+from typing import Generator, Iterator, List, Optional, TextIO, Tuple
 
-from lexical.token import Token
+from lexical.token import Token, SourceToken, TokenBuffer, TokenEdit, TokenStream
 
 class LexicalError(Exception):
     """Custom exception untuk error leksikal."""
@@ -37,6 +39,9 @@ class Lexer:
         # Daftar keyword yang mengandung tanda hubung (hyphen)
         # self.hyphenated_keywords = {'selain-itu', 'turun-ke'}
 
+        self.whitespace = frozenset(self.char_classes.get('whitespace', ''))
+        self._compile_dfa()
+
     def _get_char_class(self, char:str):
         """Mendapatkan kelas karakter (letter, digit, dll.) dari sebuah karakter."""
         for class_name, chars in self.char_classes.items():
@@ -44,6 +49,139 @@ class Lexer:
                 return class_name
         return char
 
+    def _resolve_transition(self, state:str, char:str) -> Optional[str]:
+        """
+        Mencari state tujuan dari `state` dengan input `char` langsung dari aturan dfa.json.
+        Hanya dipakai saat kompilasi tabel, bukan di loop tokenize.
+        """
+        possible_transitions = self.transitions.get(state, {})
+        # Prioritas 1: Apakah ada aturan untuk kelas karakter karakter
+        char_class = self._get_char_class(char)
+        if char_class in possible_transitions:
+            return possible_transitions[char_class]
+        # Prioritas 2: Apakah ada aturan untuk karakter literal
+        if char in possible_transitions:
+            return possible_transitions[char]
+        # Prioritas 3: Cek aturan khusus seperti "any_except_..."
+        for rule, target_state in possible_transitions.items():
+            if rule.startswith("any_except_"):
+                excluded_chars = rule.split('_')[-1]
+                if char not in excluded_chars:
+                    return target_state
+        return None
+
+    def _compile_dfa(self) -> None:
+        """
+        Kompilasi aturan DFA menjadi tabel integer (dilakukan sekali saat load).
+        - Setiap state diberi id integer.
+        - Setiap karakter dipetakan ke id kelas lewat array lookup (minimal 256 entri,
+          diperluas jika dfa.json menyebut karakter Unicode di atasnya). Karakter yang
+          perilakunya sama di semua state digabung menjadi satu kelas.
+        - Transisi disimpan dalam satu array datar: table[state * n_classes + kelas],
+          bernilai -1 jika tidak ada transisi.
+        """
+        # 1. Id integer untuk setiap state (termasuk state yang hanya muncul sebagai tujuan)
+        state_names = [self.start_state]
+        for name in list(self.transitions) + list(self.final_states):
+            if name not in state_names:
+                state_names.append(name)
+        for rules in self.transitions.values():
+            for target_state in rules.values():
+                if target_state not in state_names:
+                    state_names.append(target_state)
+        state_ids = {name: idx for idx, name in enumerate(state_names)}
+
+        # 2. Tentukan ukuran tabel karakter dari semua karakter yang disebut dfa.json
+        mentioned_chars = set()
+        for chars in self.char_classes.values():
+            mentioned_chars.update(chars)
+        for rules in self.transitions.values():
+            for rule in rules:
+                if rule.startswith("any_except_"):
+                    mentioned_chars.update(rule.split('_')[-1])
+                elif rule not in self.char_classes:
+                    mentioned_chars.update(rule)
+        table_size = max([256] + [ord(c) + 1 for c in mentioned_chars])
+
+        # 3. Kelompokkan karakter berdasarkan kolom transisinya (kelas ekuivalen).
+        #    Kode `table_size` mewakili semua karakter di luar tabel (tidak disebut dfa.json).
+        columns = {}
+        char_class_ids = array('i')
+        for code in range(table_size + 1):
+            char = chr(code)
+            column = tuple(
+                state_ids[target] if target else -1
+                for target in (self._resolve_transition(name, char) for name in state_names)
+            )
+            char_class_ids.append(columns.setdefault(column, len(columns)))
+        default_class = char_class_ids.pop()
+
+        # 4. Tabel transisi datar
+        n_classes = len(columns)
+        table = array('i', [-1]) * (len(state_names) * n_classes)
+        for column, class_id in columns.items():
+            for state_id, target_id in enumerate(column):
+                table[state_id * n_classes + class_id] = target_id
+
+        self.state_names = state_names
+        self.state_ids = state_ids
+        self.start_state_id = state_ids[self.start_state]
+        # Token type untuk setiap state final, None untuk state non-final
+        self.accept_types: List[Optional[str]] = [self.final_states.get(name) for name in state_names]
+        self.char_class_ids = char_class_ids
+        self.default_class_id = default_class
+        self.n_classes = n_classes
+        self.transition_table = table
+        # State yang dianggap string belum ditutup ketika bertemu EOF
+        self.unterminated_state_ids = frozenset(
+            state_ids[name] for name in ("S_STRING_CONTENT", "S_STRING_QUOTE_END") if name in state_ids
+        )
+        self.max_overrun = self._compute_overrun()
+
+    def _compute_overrun(self) -> Optional[int]:
+        """
+        Jumlah karakter maksimum setelah akhir sebuah token yang mungkin dibaca DFA saat
+        mencari token tersebut (karakter yang dilewati setelah state final terakhir, ditambah
+        karakter yang menghentikan DFA). None jika tidak terbatas (ada siklus state non-final
+        setelah state final). Dipakai relex untuk menentukan token yang terdampak edit.
+        """
+        n_states = len(self.state_names)
+        n_classes = self.n_classes
+        table = self.transition_table
+        # longest[state]: karakter terbanyak yang bisa dibaca dari `state` (non-final) tanpa
+        # melewati state final; -1 = sedang dihitung (deteksi siklus)
+        longest = {}
+
+        def run(state: int) -> Optional[int]:
+            if state in longest:
+                return None if longest[state] < 0 else longest[state]
+            longest[state] = -1
+            best = 0
+            for class_id in range(n_classes):
+                target = table[state * n_classes + class_id]
+                if target < 0 or self.accept_types[target] is not None:
+                    continue
+                length = run(target)
+                if length is None:
+                    return None
+                best = max(best, length + 1)
+            longest[state] = best
+            return best
+
+        overrun = 0
+        for state in range(n_states):
+            if self.accept_types[state] is None:
+                continue
+            for class_id in range(n_classes):
+                target = table[state * n_classes + class_id]
+                if target < 0 or self.accept_types[target] is not None:
+                    continue
+                length = run(target)
+                if length is None:
+                    return None
+                overrun = max(overrun, length + 1)
+        return overrun + 1
+
     # def _merge_hyphenated_keywords(self, tokens:List[Token]) -> List[Token]:
     #     """
     #     Post-processing untuk menggabungkan token yang membentuk keyword ber-hyphen.
@@ -86,18 +224,141 @@ class Lexer:
     def tokenize(self, source_code:str) -> List[Token]:
         """
         Memproses source code dan mengubahnya menjadi daftar token.
+        Setiap token menyimpan offset ke `source_code` (SourceToken), lexeme hanya
+        di-slice saat dibutuhkan.
+        Melempar LexicalError jika ada kesalahan.
+        """
+        return [
+            SourceToken(token_type, source_code, start, end, line, column)
+            for token_type, start, end, line, column in self._scan(source_code)
+        ]
+
+    def tokenize_buffer(self, source_code:str) -> TokenBuffer:
+        """
+        Sama seperti tokenize, tetapi hasilnya disimpan dalam TokenBuffer
+        (struct-of-arrays) yang dikonsumsi langsung oleh parser.
+        """
+        buffer = TokenBuffer(source_code)
+        for token_type, start, end, line, column in self._scan(source_code):
+            buffer.append(token_type, start, end, line, column)
+        return buffer
+
+    def tokenize_stream(self, fileobj:TextIO, chunk_size:int=65536) -> Iterator[Token]:
+        """
+        Generator token dari file object yang dibaca per chunk, sehingga memori tetap
+        terbatas walaupun source sangat besar. Token dan komentar yang terpotong di
+        batas chunk ditahan sampai chunk berikutnya dibaca.
+        Melempar LexicalError jika ada kesalahan.
+        """
+        pending = ""
+        line, column = 1, 1
+        read_size = chunk_size
+        while True:
+            chunk = fileobj.read(read_size)
+            final = not chunk
+            pending += chunk
+
+            scanner = self._scan(pending, final=final, line=line, column=column)
+            while True:
+                try:
+                    token_type, start, end, token_line, token_col = next(scanner)
+                except StopIteration as stop:
+                    position, line, column = stop.value
+                    break
+                yield Token(token_type, pending[start:end], token_line, token_col)
+
+            if final:
+                return
+            # Jika tidak ada kemajuan (token/komentar lebih panjang dari chunk),
+            # perbesar ukuran baca agar tidak men-scan ulang berkali-kali
+            read_size = chunk_size if position > 0 else max(chunk_size, len(pending))
+            pending = pending[position:]
+
+    def tokenize_lazy(self, fileobj:TextIO, chunk_size:int=65536) -> TokenStream:
+        """
+        TokenStream dari tokenize_stream: token baru di-lex saat parser membutuhkannya,
+        sehingga parsing berjalan bersamaan dengan pembacaan dan lexing file.
+        """
+        return TokenStream(self.tokenize_stream(fileobj, chunk_size))
+
+    def relex(self, tokens:TokenBuffer, offset:int, removed_len:int, inserted_text:str) -> Tuple[TokenBuffer, TokenEdit]:
+        """
+        Tokenize ulang `tokens` (hasil tokenize_buffer) setelah edit teks: `removed_len`
+        karakter mulai `offset` diganti `inserted_text`. Scan dimulai dari akhir token
+        terakhir yang tidak mungkin terdampak (lihat _compute_overrun) dan berhenti begitu
+        sebuah token baru di setelah edit dimulai tepat di awal token lama (DFA kembali
+        sinkron); token sesudahnya disalin dengan offset/baris/kolom yang digeser.
+        Hasilnya sama dengan tokenize_buffer pada source baru.
         Melempar LexicalError jika ada kesalahan.
+
+        Returns:
+            (buffer baru, TokenEdit rentang token yang berubah)
+        """
+        source = tokens.source
+        new_source = source[:offset] + inserted_text + source[offset + removed_len:]
+        shift = len(inserted_text) - removed_len
+        edit_end = offset + len(inserted_text)  # akhir teks sisipan di source baru
+        starts, lengths = tokens.starts, tokens.lengths
+        n = len(tokens)
+
+        # Token pertama yang pembacaan DFA-nya bisa mencapai offset
+        if self.max_overrun is None:
+            first = 0
+        else:
+            first = bisect_left(range(n), offset, key=lambda index: starts[index] + lengths[index] + self.max_overrun)
+        if first > 0:
+            position = starts[first - 1] + lengths[first - 1]
+            line, column = tokens.lines[first - 1], tokens.columns[first - 1]
+        else:
+            position, line, column = 0, 1, 1
+
+        scanned = []
+        old_index = first
+        resync = n
+        line_shift = column_shift = 0
+        for token in self._scan(new_source, line=line, column=column, start=position):
+            token_start = token[1]
+            if token_start >= edit_end:
+                old_start = token_start - shift
+                while old_index < n and starts[old_index] < old_start:
+                    old_index += 1
+                if old_index < n and starts[old_index] == old_start:
+                    resync = old_index
+                    line_shift = token[3] - tokens.lines[resync]
+                    column_shift = token[4] - tokens.columns[resync]
+                    break
+            scanned.append(token)
+
+        buffer = tokens.splice(new_source, first, resync, scanned, shift, line_shift, column_shift)
+        return buffer, TokenEdit(first, resync, first + len(scanned))
+
+    def _scan(self, source_code:str, final:bool=True, line:int=1, column:int=1, start:int=0) -> Generator[Tuple[str, int, int, int, int], None, Tuple[int, int, int]]:
+        """
+        Simulasi DFA di atas source code.
+        Menghasilkan tuple (token_type, start, end, line, column) untuk setiap token,
+        dengan line/column adalah posisi setelah karakter terakhir token.
+
+        Jika `final` False, `source_code` dianggap potongan dari input yang lebih panjang:
+        scan berhenti sebelum token/komentar yang belum pasti selesai di akhir potongan.
+        Scan dimulai dari offset `start` (di luar token/komentar) dengan posisi line/column.
+        Return value generator adalah (position, line, column) tempat scan berhenti.
         """
-        tokens = []
-        position = 0
-        line = 1
-        column = 1
+        position = start
+
+        # Tabel DFA hasil kompilasi (lihat _compile_dfa)
+        whitespace = self.whitespace
+        char_class_ids = self.char_class_ids
+        n_char_codes = len(char_class_ids)
+        default_class_id = self.default_class_id
+        n_classes = self.n_classes
+        transition_table = self.transition_table
+        accept_types = self.accept_types
 
         # Main Loop: Memproses semua karakter sampai karakter habis
         while position < len(source_code):
             char = source_code[position]
             # Jika karakter adalah whitespace, lewati dan perbarui posisi
-            if char in self.char_classes.get('whitespace', ''):
+            if char in whitespace:
                 if char == '\n':
                     # Jika newline, perbarui baris dan kolom
                     line += 1
@@ -110,6 +371,7 @@ class Lexer:
             
             # Handle komentar blok { ... }
             if char == '{':
+                comment_start = (position, line, column)
                 position += 1
                 column += 1
                 while position < len(source_code) and source_code[position] != '}':
@@ -123,16 +385,22 @@ class Lexer:
                 if position < len(source_code):
                     position += 1
                     column += 1
+                elif not final:
+                    # Komentar belum ditutup di potongan ini, tunggu potongan berikutnya
+                    return comment_start
                 continue
             
             # Handle komentar line (* ... *)
             if char == '(' and position + 1 < len(source_code) and source_code[position + 1] == '*':
+                comment_start = (position, line, column)
                 position += 2
                 column += 2
+                closed = False
                 while position + 1 < len(source_code):
                     if source_code[position] == '*' and source_code[position + 1] == ')':
                         position += 2
                         column += 2
+                        closed = True
                         break
                     if source_code[position] == '\n':
                         line += 1
@@ -140,11 +408,13 @@ class Lexer:
                     else:
                         column += 1
                     position += 1
+                if not closed and not final:
+                    # Komentar belum ditutup di potongan ini, tunggu potongan berikutnya
+                    return comment_start
                 continue
 
             # Mulai dari state awal DFA
-            current_state = self.start_state
-            current_lexeme = ""
+            current_state = self.start_state_id
             last_match = None # Menyimpan token terakhir yang valid
             
             start_line, start_col = line, column
@@ -157,39 +427,25 @@ class Lexer:
             while True: 
                 # Cek apakah EOF?
                 if temp_pos >= len(source_code):
+                    if not final:
+                        # Token mungkin masih berlanjut di potongan berikutnya
+                        return position, line, column
                     # Error handling untuk string yang tidak ditutup
-                    if current_state in ["S_STRING_CONTENT", "S_STRING_QUOTE_END"]:
+                    if current_state in self.unterminated_state_ids:
                         raise LexicalError("Unterminated string literal", start_line, start_col)
                     break
 
                 # Ambil karakter dan tentukan kelasnya
                 char = source_code[temp_pos]
-                char_class = self._get_char_class(char)
-                
-                next_state = None
-                
-                # Pencarian transisi DFA
-                if current_state in self.transitions:
-                    possible_transitions = self.transitions[current_state]
-                    # Prioritas 1: Apakah ada aturan untuk kelas karakter karakter
-                    if char_class in possible_transitions:
-                        next_state = possible_transitions[char_class]
-                    # Prioritas 2: Apakah ada aturan untuk karakter literal
-                    elif char in possible_transitions:
-                        next_state = possible_transitions[char]
-                    else:
-                        # Prioritas 3: Cek aturan khusus seperti "any_except_..."
-                        for rule, target_state in possible_transitions.items():
-                            if rule.startswith("any_except_"):
-                                excluded_chars = rule.split('_')[-1]
-                                if char not in excluded_chars:
-                                    next_state = target_state
-                                    break
-                
+                code = ord(char)
+                char_class = char_class_ids[code] if code < n_char_codes else default_class_id
+
+                # Pencarian transisi DFA (-1 berarti tidak ada transisi)
+                next_state = transition_table[current_state * n_classes + char_class]
+
                 # Pemrosesan hasil transisi
-                if next_state:
+                if next_state >= 0:
                     current_state = next_state
-                    current_lexeme += char
                     
                     # Majukan pointer sementara
                     if char == '\n':
@@ -200,8 +456,8 @@ class Lexer:
                     temp_pos += 1
 
                     # Jika sudah state final, simpan token di last_match
-                    if current_state in self.final_states:
-                        last_match = (current_lexeme, self.final_states[current_state], temp_line, temp_col)
+                    if accept_types[current_state] is not None:
+                        last_match = (temp_pos, accept_types[current_state], temp_line, temp_col)
                 else:
                     # Jika tidak ada transisi yang valid, keluar dari loop
                     break
@@ -209,21 +465,21 @@ class Lexer:
             # Finalisasi token setelah inner loop
             if last_match:
                 # Jika last_match ada, berarti kita menemukan token valid
-                lexeme, token_type, end_line, end_col = last_match
+                end_pos, token_type, end_line, end_col = last_match
                 
                 if token_type == "IDENTIFIER":
                     # Jika token adalah identifier, cek apakah itu keyword atau reserved word menggunakan DFA mapping
-                    lexeme_lower = lexeme.lower()
+                    lexeme_lower = source_code[position:end_pos].lower()
                     if lexeme_lower in self.keywords:
                         token_type = self.keywords[lexeme_lower]
                     elif lexeme_lower in self.reserved_operators:
                         token_type = self.reserved_operators[lexeme_lower]
                 
-                # Tambahkan token ke daftar token
-                tokens.append(Token(token_type, lexeme, end_line, end_col))
+                # Hasilkan token yang ditemukan
+                yield token_type, position, end_pos, end_line, end_col
                 
                 # Perbarui posisi utama ke posisi setelah token yang ditemukan
-                position += len(lexeme)
+                position = end_pos
                 # Perbarui baris dan kolom utama
                 line, column = end_line, end_col
             else:
@@ -232,9 +488,8 @@ class Lexer:
         
         # Post-processing: Gabungkan keyword ber-hyphen seperti "selain-itu" dan "turun-ke"
         # tokens = self._merge_hyphenated_keywords(tokens)
-        
-        # return daftar token yang ditemukan
-        return tokens
+
+        return position, line, column
 
 def main():
     """
@@ -264,31 +519,44 @@ def main():
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # src/lexical/
     DFA_FILE_PATH = os.path.join(BASE_DIR, 'dfa.json')
     
-    try:
-        with open(source_file_path, 'r') as f:
-            source_code = f.read()
-    except FileNotFoundError:
+    if not os.path.isfile(source_file_path):
         print(f"Error: Input file tidak ditemukan di '{source_file_path}'", file=sys.stderr)
         sys.exit(1)
         
     lexer = Lexer(DFA_FILE_PATH)
+    # Operasi file yang sedang berjalan ("read"/"write"), untuk membedakan pesan IOError
+    # karena source dibaca per chunk di sela penulisan token
+    operation = "read"
     
     try:
-        tokens = lexer.tokenize(source_code)
-        
         if output_file_path:
-            # Output ke file
+            # Output ke file: token ditulis satu per satu selama source dibaca per chunk
             output_dir = os.path.dirname(output_file_path)
-            if output_dir:
-                os.makedirs(output_dir, exist_ok=True)
-                
-            with open(output_file_path, 'w') as f:
-                for token_type, lexeme in tokens:
-                    f.write(f"{token_type}({lexeme})\n")
+            with open(source_file_path, 'r') as src:
+                operation = "write"
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+
+                with open(output_file_path, 'w') as f:
+                    try:
+                        operation = "read"
+                        for token_type, lexeme in lexer.tokenize_stream(src):
+                            operation = "write"
+                            f.write(f"{token_type}({lexeme})\n")
+                            operation = "read"
+                        operation = "write"
+                    except (LexicalError, IOError):
+                        # Jangan tinggalkan output parsial jika ada error
+                        os.remove(output_file_path)
+                        raise
             
             print(f"Tokenization successful. Output written to '{output_file_path}'")
         else:
             # Output ke terminal
+            with open(source_file_path, 'r') as f:
+                source_code = f.read()
+            operation = "write"
+            tokens = lexer.tokenize(source_code)
             print("Tokenization successful. Daftar token:")
             print("=" * 40)
             for token in tokens:
@@ -298,9 +566,11 @@ def main():
         print(str(e), file=sys.stderr)
         sys.exit(1)
     except IOError as e:
-        print(f"Error writing to file '{output_file_path}': {e}", file=sys.stderr)
+        if operation == "read":
+            print(f"Error reading file '{source_file_path}': {e}", file=sys.stderr)
+        else:
+            print(f"Error writing to file '{output_file_path}': {e}", file=sys.stderr)
         sys.exit(1)
 
 if __name__ == "__main__":
     main()
-
@@ -1,5 +1,7 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 # ===== Class for Token =====
 
@@ -8,7 +10,7 @@ class TokenType(str):
 class Lexeme(str):
     pass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Token:
     token_type: TokenType
     lexeme: Lexeme
@@ -31,4 +33,337 @@ class Token:
     
     # Override __hash__ untuk memastikan hash yang konsisten dengan __eq__
     def __hash__(self):
-        return hash((self.token_type, self.lexeme))
\ No newline at end of file
+        return hash((self.token_type, self.lexeme))
+
+class SourceToken(Token):
+    """
+    Token yang lexeme-nya disimpan sebagai offset (start, end) ke source code asli.
+    Lexeme di-slice dari source setiap kali `lexeme` diakses (tidak disimpan).
+    API-nya sama dengan Token (iterasi, __eq__, __hash__, __str__).
+    """
+    __slots__ = ('source', 'start', 'end')
+
+    def __init__(self, token_type:TokenType, source:str, start:int, end:int,
+                 line:Optional[int]=None, column:Optional[int]=None):
+        object.__setattr__(self, 'token_type', token_type)
+        object.__setattr__(self, 'source', source)
+        object.__setattr__(self, 'start', start)
+        object.__setattr__(self, 'end', end)
+        object.__setattr__(self, 'line', line)
+        object.__setattr__(self, 'column', column)
+
+    @property
+    def lexeme(self) -> Lexeme:
+        return self.source[self.start:self.end]
+
+    def __reduce__(self):
+        return (SourceToken, (self.token_type, self.source, self.start, self.end, self.line, self.column))
+
+@dataclass(frozen=True)
+class TokenEdit:
+    """
+    Perubahan pada daftar token akibat edit teks (lihat Lexer.relex): token lama
+    [start, old_end) diganti token baru [start, new_end). Token sebelum `start` sama
+    persis, token lama mulai `old_end` sama dengan token baru mulai `new_end`.
+    """
+    start: int
+    old_end: int
+    new_end: int
+
+# ===== Class for Token Buffer =====
+
+class TokenBuffer:
+    """
+    Penyimpanan token dalam bentuk struct-of-arrays.
+    Setiap kolom adalah array('i') paralel:
+        kinds   : id token_type (di-intern per buffer, lihat kind_names)
+        lexemes : id lexeme (di-intern per buffer, lihat lexeme_names)
+        starts, lengths : offset dan panjang lexeme di `source`
+        lines, columns  : posisi token (0 jika tidak diketahui)
+    Indexing mengembalikan TokenView ringan, sehingga buffer tetap bisa dipakai
+    seperti List[Token].
+    """
+    def __init__(self, source:str="") -> None:
+        self.source = source
+        self.kinds = array('i')
+        self.lexemes = array('i')
+        self.starts = array('i')
+        self.lengths = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.kind_names: List[TokenType] = []
+        self.kind_ids: Dict[str, int] = {}
+        self.lexeme_names: List[Lexeme] = []
+        self.lexeme_ids: Dict[str, int] = {}
+
+    @classmethod
+    def from_tokens(cls, tokens:List[Token]) -> "TokenBuffer":
+        """Membangun buffer dari daftar Token biasa (source = gabungan lexeme)."""
+        lexemes = [token.lexeme for token in tokens]
+        buffer = cls("".join(lexemes))
+        start = 0
+        for token, lexeme in zip(tokens, lexemes):
+            buffer.append(token.token_type, start, start + len(lexeme), token.line, token.column)
+            start += len(lexeme)
+        return buffer
+
+    def slice(self, start:int, end:int) -> "TokenBuffer":
+        """Buffer baru berisi token [start, end) saja, dengan source dipotong seperlunya."""
+        if start >= end:
+            return TokenBuffer()
+        offset = self.starts[start]
+        buffer = TokenBuffer(self.source[offset:self.starts[end - 1] + self.lengths[end - 1]])
+        for index in range(start, end):
+            token_start = self.starts[index] - offset
+            buffer.append(self.kind_names[self.kinds[index]], token_start, token_start + self.lengths[index],
+                          self.lines[index], self.columns[index])
+        return buffer
+
+    def splice(self, source:str, start:int, end:int, tokens:List[Tuple[str, int, int, int, int]],
+               offset_shift:int=0, line_shift:int=0, column_shift:int=0) -> "TokenBuffer":
+        """
+        Buffer baru untuk `source` (source lama yang sudah diedit): token [start, end) diganti
+        `tokens` (tuple hasil Lexer._scan), token sebelumnya disalin apa adanya, dan token
+        mulai `end` digeser offset-nya sebesar `offset_shift` dan barisnya `line_shift`.
+        `column_shift` hanya berlaku untuk token yang berakhir di baris yang sama dengan
+        token `end` (token sesudahnya diawali newline sehingga kolomnya tidak berubah).
+        Id kind/lexeme dari buffer ini tetap berlaku di buffer baru.
+        """
+        buffer = TokenBuffer(source)
+        buffer.kind_names = list(self.kind_names)
+        buffer.kind_ids = dict(self.kind_ids)
+        buffer.lexeme_names = list(self.lexeme_names)
+        buffer.lexeme_ids = dict(self.lexeme_ids)
+        buffer.kinds = self.kinds[:start]
+        buffer.lexemes = self.lexemes[:start]
+        buffer.starts = self.starts[:start]
+        buffer.lengths = self.lengths[:start]
+        buffer.lines = self.lines[:start]
+        buffer.columns = self.columns[:start]
+        for token_type, token_start, token_end, line, column in tokens:
+            buffer.append(token_type, token_start, token_end, line, column)
+
+        buffer.kinds += self.kinds[end:]
+        buffer.lexemes += self.lexemes[end:]
+        buffer.lengths += self.lengths[end:]
+        starts = self.starts[end:]
+        if offset_shift:
+            starts = array('i', [offset + offset_shift for offset in starts])
+        buffer.starts += starts
+        lines = self.lines[end:]
+        if line_shift:
+            lines = array('i', [line + line_shift for line in lines])
+        buffer.lines += lines
+        columns = self.columns[end:]
+        if column_shift and len(columns):
+            first_line = self.lines[end]
+            index = 0
+            while index < len(columns) and self.lines[end + index] == first_line:
+                columns[index] += column_shift
+                index += 1
+        buffer.columns += columns
+        return buffer
+
+    def append(self, token_type:TokenType, start:int, end:int, line:Optional[int]=None, column:Optional[int]=None) -> None:
+        kind = self.kind_ids.get(token_type)
+        if kind is None:
+            kind = self.kind_ids[token_type] = len(self.kind_names)
+            self.kind_names.append(token_type)
+        lexeme = self.source[start:end]
+        lexeme_id = self.lexeme_ids.get(lexeme)
+        if lexeme_id is None:
+            lexeme_id = self.lexeme_ids[lexeme] = len(self.lexeme_names)
+            self.lexeme_names.append(lexeme)
+        self.kinds.append(kind)
+        self.lexemes.append(lexeme_id)
+        self.starts.append(start)
+        self.lengths.append(end - start)
+        self.lines.append(line or 0)
+        self.columns.append(column or 0)
+
+    def fill(self, index:int) -> bool:
+        """Apakah token ke-`index` tersedia (TokenStream me-lex token baru sampai index tersebut)."""
+        return index < len(self.kinds)
+
+    def kind_id(self, token_type:str) -> int:
+        """Id token_type di buffer ini, -1 jika tidak pernah muncul."""
+        return self.kind_ids.get(token_type, -1)
+
+    def lexeme_id(self, lexeme:str) -> int:
+        """Id lexeme di buffer ini, -1 jika tidak pernah muncul."""
+        return self.lexeme_ids.get(lexeme, -1)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index:int) -> "TokenView":
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("TokenBuffer index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self) -> Iterator["TokenView"]:
+        for index in range(len(self.kinds)):
+            yield TokenView(self, index)
+
+class TokenStream(TokenBuffer):
+    """
+    TokenBuffer yang diisi bertahap dari iterator token (misal Lexer.tokenize_stream), agar
+    parser bisa mulai sebelum lexing selesai: CFG memanggil fill saat membaca melewati token
+    terakhir yang tersedia, dan token berikutnya di-lex per `chunk_size`. len() adalah jumlah
+    token yang sudah di-lex; LexicalError muncul saat parser mencapai posisi error.
+
+    Token sebelum posisi yang tidak mungkin dibaca lagi oleh parser dibuang lewat trim, jadi
+    token yang disimpan tetap sedikit walaupun input sangat besar. Index tetap absolut (posisi
+    di seluruh input): kolom array berisi token [base, len()), dan indexing mengembalikan Token
+    biasa (bukan TokenView) agar token di parse tree tetap berlaku setelah trim.
+
+    kind_id/lexeme_id langsung mengalokasikan id yang belum ada, sehingga terminal grammar
+    yang di-bind sebelum tokennya muncul tetap cocok dengan token yang di-lex kemudian. Id
+    tersebut dipertahankan selama stream hidup; id lexeme lain hanya hidup selama masih ada
+    token tersimpan yang memakainya (lexeme_refs), lalu dibuang oleh trim dan dipakai ulang,
+    jadi tabel lexeme juga tidak bertambah seiring jumlah identifier/literal berbeda di input.
+    Source tidak disimpan, jadi starts/lengths tidak diisi.
+    """
+    def __init__(self, tokens:Iterable[Token], chunk_size:int=1024) -> None:
+        super().__init__()
+        self.pending = iter(tokens)
+        self.chunk_size = chunk_size
+        self.base = 0
+        self.done = False
+        # Jumlah token tersimpan per id lexeme (+1 permanen untuk id dari lexeme_id)
+        self.lexeme_refs: List[int] = []
+        self.pinned_lexemes: set = set()
+        self.free_lexemes: List[int] = []
+
+    def fill(self, index:int) -> bool:
+        while index >= self.base + len(self.kinds) and not self.done:
+            count = len(self.kinds)
+            for token in islice(self.pending, self.chunk_size):
+                self.push(token)
+            if len(self.kinds) - count < self.chunk_size:
+                self.done = True
+                self.pending = iter(())
+        return index < self.base + len(self.kinds)
+
+    def fill_all(self) -> None:
+        """Lex semua token yang tersisa."""
+        while not self.done:
+            self.fill(len(self))
+
+    def drain(self, index:int) -> None:
+        """
+        Lex semua token yang tersisa (LexicalError tetap dilempar) tetapi hanya menyimpan
+        token sampai `index`; token sesudahnya langsung dibuang.
+        """
+        self.fill(index)
+        for _ in self.pending:
+            pass
+        self.done = True
+        self.pending = iter(())
+
+    def trim(self, index:int) -> int:
+        """
+        Buang token sebelum `index` (tidak bisa diakses lagi) beserta lexeme yang hanya dipakai
+        token tersebut. Mengembalikan base yang baru.
+        """
+        count = min(index, len(self)) - self.base
+        if count > 0:
+            refs = self.lexeme_refs
+            for lexeme_id in self.lexemes[:count]:
+                refs[lexeme_id] -= 1
+                if not refs[lexeme_id]:
+                    del self.lexeme_ids[self.lexeme_names[lexeme_id]]
+                    self.lexeme_names[lexeme_id] = None
+                    self.free_lexemes.append(lexeme_id)
+            for column in (self.kinds, self.lexemes, self.lines, self.columns):
+                del column[:count]
+            self.base += count
+        return self.base
+
+    def push(self, token:Token) -> None:
+        lexeme_id = self.intern_lexeme(token.lexeme)
+        self.lexeme_refs[lexeme_id] += 1
+        self.kinds.append(self.kind_id(token.token_type))
+        self.lexemes.append(lexeme_id)
+        self.lines.append(token.line or 0)
+        self.columns.append(token.column or 0)
+
+    def kind_id(self, token_type:str) -> int:
+        kind = self.kind_ids.get(token_type)
+        if kind is None:
+            kind = self.kind_ids[token_type] = len(self.kind_names)
+            self.kind_names.append(token_type)
+        return kind
+
+    def lexeme_id(self, lexeme:str) -> int:
+        lexeme_id = self.intern_lexeme(lexeme)
+        if lexeme_id not in self.pinned_lexemes:
+            self.pinned_lexemes.add(lexeme_id)
+            self.lexeme_refs[lexeme_id] += 1
+        return lexeme_id
+
+    def intern_lexeme(self, lexeme:str) -> int:
+        """Id untuk `lexeme`, memakai ulang id yang sudah dibuang trim jika ada."""
+        lexeme_id = self.lexeme_ids.get(lexeme)
+        if lexeme_id is None:
+            if self.free_lexemes:
+                lexeme_id = self.free_lexemes.pop()
+                self.lexeme_names[lexeme_id] = lexeme
+            else:
+                lexeme_id = len(self.lexeme_names)
+                self.lexeme_names.append(lexeme)
+                self.lexeme_refs.append(0)
+            self.lexeme_ids[lexeme] = lexeme_id
+        return lexeme_id
+
+    def __len__(self) -> int:
+        return self.base + len(self.kinds)
+
+    def __getitem__(self, index:int) -> Token:
+        if index < 0:
+            self.fill_all()
+            index += len(self)
+        else:
+            self.fill(index)
+        if index < self.base:
+            raise IndexError("Token TokenStream sudah dibuang oleh trim")
+        if index >= len(self):
+            raise IndexError("TokenStream index out of range")
+        index -= self.base
+        return Token(self.kind_names[self.kinds[index]], self.lexeme_names[self.lexemes[index]],
+                     self.lines[index] or None, self.columns[index] or None)
+
+    def __iter__(self) -> Iterator[Token]:
+        index = self.base
+        while self.fill(index):
+            yield self[index]
+            index += 1
+
+class TokenView(Token):
+    """View ringan ke satu token di TokenBuffer (hanya menyimpan buffer dan index)."""
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer:TokenBuffer, index:int):
+        object.__setattr__(self, 'buffer', buffer)
+        object.__setattr__(self, 'index', index)
+
+    def __reduce__(self):
+        return (TokenView, (self.buffer, self.index))
+
+    @property
+    def token_type(self) -> TokenType:
+        return self.buffer.kind_names[self.buffer.kinds[self.index]]
+
+    @property
+    def lexeme(self) -> Lexeme:
+        return self.buffer.lexeme_names[self.buffer.lexemes[self.index]]
+
+    @property
+    def line(self) -> Optional[int]:
+        return self.buffer.lines[self.index] or None
+
+    @property
+    def column(self) -> Optional[int]:
+        return self.buffer.columns[self.index] or None
@@ -1,6 +1,16 @@
+from types import GeneratorType
 from typing import Optional
 from .ast_nodes import *
-from .symbol_table import SymbolTable, ObjectKind, TypeKind, TabEntry
+from .symbol_table import (SymbolTable, ObjectKind, TypeKind, TabEntry, PascalType, NO_TYPE,
+                           INTEGER_TYPE, BOOLEAN_TYPE, CHAR_TYPE, REAL_TYPE, STRING_TYPE)
+
+# Prosedur bawaan yang tidak ada di symbol table
+BUILTIN_PROCEDURES = ('writeln', 'write', 'readln', 'read')
+# Nama tipe dasar (huruf besar) -> TypeKind
+BASIC_TYPE_NAMES = {
+    'INTEGER': TypeKind.INTEGER, 'REAL': TypeKind.REAL, 'BOOLEAN': TypeKind.BOOLEAN,
+    'CHAR': TypeKind.CHAR, 'STRING': TypeKind.STRING,
+}
 
 class ASTAnalyzerError(Exception):
     """Custom exception untuk error dalam AST Analyzer."""
@@ -16,16 +26,55 @@ class ASTAnalyzerError(Exception):
 class ASTAnalyzer:
     def __init__(self):
         self.symbol_table = SymbolTable()
+        # Kelas node -> method visit_NamaNode (termasuk override di subclass)
+        self.dispatch = NodeDispatch(self, 'visit_', self.generic_visit)
 
     def visit(self, node: ASTNode):
-        """Dispatcher utama untuk mengunjungi node AST."""
+        """
+        Dispatcher utama untuk mengunjungi node AST.
+        Method visit_NamaNode yang mengunjungi anak ditulis sebagai generator: `yield child`
+        mengunjungi child dan mengembalikan hasilnya (override di subclass memakai
+        `yield from super().visit_NamaNode(node)`). Generator-generator itu dijalankan di
+        stack eksplisit, jadi kedalaman AST tidak dibatasi recursion limit Python.
+        Exception dari anak diteruskan ke generator induknya seperti pada rekursi biasa.
+        """
         if node is None: 
             return None
         
         # Panggil method visit_NamaNode
-        method_name = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        result = self.dispatch[node.__class__](node)
+        if not isinstance(result, GeneratorType):
+            return result
+
+        stack = [result]
+        value, error = None, None
+        while stack:
+            try:
+                child = stack[-1].send(value) if error is None else stack[-1].throw(error)
+            except StopIteration as stop:
+                stack.pop()
+                value, error = stop.value, None
+                continue
+            except Exception as exc:
+                stack.pop()
+                if not stack:
+                    raise
+                value, error = None, exc
+                continue
+
+            value, error = None, None
+            if child is None:
+                continue
+            try:
+                result = self.dispatch[child.__class__](child)
+            except Exception as exc:
+                error = exc
+                continue
+            if isinstance(result, GeneratorType):
+                stack.append(result)
+            else:
+                value = result
+        return value
 
     def generic_visit(self, node):
         """Fallback untuk node yang belum ada handler spesifiknya."""
@@ -46,31 +95,17 @@ class ASTAnalyzer:
 
         # 2. Visit Declarations
         for decl in node.declarations:
-            self.visit(decl)
+            yield decl
             
         # 3. Visit Main Block
-        self.visit(node.block)
+        yield node.block
 
     # =========================================================================
     # DECLARATIONS
     # =========================================================================
     
     def visit_VarDeclNode(self, node: VarDeclNode):
-        # Cek apakah tipe-nya adalah ArrayTypeNode (definisi array langsung)
-        if isinstance(node.type_node, ArrayTypeNode):
-            # Resolve struktur array dan dapatkan referensi ke atab
-            type_kind, ref_idx = self._resolve_array_type(node.type_node)
-        else:
-            type_name = node.type_node.type_name if hasattr(node.type_node, 'type_name') else str(node.type_node)
-            type_kind = self._resolve_type_str(type_name)
-            ref_idx = 0 
-            if type_kind == TypeKind.NOTYPE:
-                type_entry_idx = self.symbol_table.lookup(type_name)
-                if type_entry_idx != 0:
-                    entry = self.symbol_table.get_entry(type_entry_idx)
-                    if entry.obj == ObjectKind.TYPE:
-                        type_kind = entry.type
-                        ref_idx = entry.ref
+        type_kind, ref_idx = self._resolve_declared_type(node.type_node)
 
         try:
             idx = self.symbol_table.add_variable(node.var_name, type_kind, ref=ref_idx)
@@ -82,7 +117,7 @@ class ASTAnalyzer:
 
             entry = self.symbol_table.get_entry(idx)
             node.type = entry.type.name
-            node.symbol_entry = {'tab_index': idx, 'lev': entry.lev}
+            node.symbol_entry = SymbolAnnotation(tab_index=idx, lev=entry.lev, adr=entry.adr, ref=entry.ref)
         
         except ASTAnalyzerError as e:
             raise ASTAnalyzerError(message=e)
@@ -91,6 +126,38 @@ class ASTAnalyzer:
             # print(f"[Semantic Error] {e}")
             raise ASTAnalyzerError(message=e)
 
+    def _resolve_declared_type(self, type_node: ASTNode):
+        """(TypeKind, ref) dari tipe di deklarasi variabel/field: array, record, tipe dasar, atau nama tipe."""
+        # Cek apakah tipe-nya adalah ArrayTypeNode (definisi array langsung)
+        if isinstance(type_node, ArrayTypeNode):
+            # Resolve struktur array dan dapatkan referensi ke atab
+            return self._resolve_array_type(type_node)
+        if isinstance(type_node, RecordTypeNode):
+            return self._resolve_record_type(type_node)
+
+        type_name = type_node.type_name if hasattr(type_node, 'type_name') else str(type_node)
+        type_kind = self._resolve_type_str(type_name)
+        ref_idx = 0
+        if type_kind == TypeKind.NOTYPE:
+            type_entry_idx = self.symbol_table.lookup(type_name)
+            if type_entry_idx != 0:
+                entry = self.symbol_table.get_entry(type_entry_idx)
+                if entry.obj == ObjectKind.TYPE:
+                    type_kind = entry.type
+                    ref_idx = entry.ref
+        return type_kind, ref_idx
+
+    def _resolve_record_type(self, node: RecordTypeNode):
+        """
+        Memproses RecordTypeNode menjadi tipe record ter-intern dan mengembalikan
+        (TypeKind.RECORD, ref_index); record dengan field (nama, tipe) yang sama mendapat ref yang sama.
+        """
+        fields = []
+        for field in node.fields:
+            type_kind, ref_idx = self._resolve_declared_type(field.type_node)
+            fields.append((field.var_name, self.symbol_table.structural_type(type_kind, ref_idx)))
+        return TypeKind.RECORD, self.symbol_table.add_record_type(fields)
+
     def _resolve_array_type(self, node: ArrayTypeNode):
         """
         Memproses ArrayTypeNode, mendaftarkan ke atab, dan mengembalikan (TypeKind.ARRAY, ref_index)
@@ -109,6 +176,8 @@ class ASTAnalyzer:
 
         if isinstance(node.element_type, ArrayTypeNode):
             etyp, eref = self._resolve_array_type(node.element_type)
+        elif isinstance(node.element_type, RecordTypeNode):
+            etyp, eref = self._resolve_record_type(node.element_type)
         else:
             # Simple Type / Named Type
             type_name = getattr(node.element_type, 'type_name', str(node.element_type))
@@ -154,7 +223,7 @@ class ASTAnalyzer:
 
     def visit_ConstDeclNode(self, node: ConstDeclNode):
         # 1. Evaluasi Tipe Nilai
-        value_type = self.visit(node.value) # Mengembalikan TypeKind
+        value_type = yield node.value # Mengembalikan TypeKind
         
         # 2. Ambil Nilai Raw (untuk disimpan di adr)
         raw_value = 0
@@ -162,7 +231,8 @@ class ASTAnalyzer:
             raw_value = node.value.value
 
         try:
-            idx = self.symbol_table.add_constant(node.const_name, value_type, raw_value)
+            type_kind = value_type.kind if value_type is not None else None
+            idx = self.symbol_table.add_constant(node.const_name, type_kind, raw_value)
             
             # SAFETY CHECK
             if idx is None:
@@ -174,7 +244,7 @@ class ASTAnalyzer:
             entry = self.symbol_table.get_entry(idx)
             if entry:
                 node.type = entry.type.name
-                node.symbol_entry = {'tab_index': idx, 'lev': entry.lev}
+                node.symbol_entry = SymbolAnnotation(tab_index=idx, lev=entry.lev)
                 
         except ASTAnalyzerError as e:
             raise ASTAnalyzerError(message=e)
@@ -192,6 +262,9 @@ class ASTAnalyzer:
         # 1. Cek apakah value-nya adalah Definisi Array
         if isinstance(node.value, ArrayTypeNode):
             type_kind, ref_idx = self._resolve_array_type(node.value)
+
+        elif isinstance(node.value, RecordTypeNode):
+            type_kind, ref_idx = self._resolve_record_type(node.value)
             
         # 2. Cek apakah value-nya adalah Tipe Lain (Alias, misal: TYPE Angka = Integer)
         elif isinstance(node.value, TypeNode):
@@ -243,10 +316,10 @@ class ASTAnalyzer:
 
         if hasattr(node, 'local_vars'):
             for decl in node.local_vars:
-                self.visit(decl)
+                yield decl
          # 4. Proses Block (yang sudah include deklarasi lokal & statements)
         if node.block:
-            self.visit(node.block)
+            yield node.block
         
         # 5. Keluar Scope
         self.symbol_table.exit_scope()
@@ -272,25 +345,30 @@ class ASTAnalyzer:
 
         if hasattr(node, 'local_vars'):
             for decl in node.local_vars:
-                self.visit(decl)
+                yield decl
             
         # 4. Proses Block (yang sudah include deklarasi & body)
         if node.block:
-            self.visit(node.block)
+            yield node.block
         
         # 5. Keluar Scope
         self.symbol_table.exit_scope()
 
     def visit_ParameterNode(self, node: ParameterNode):
         type_kind = self._resolve_type_str(node.type_node.type_name)
-        for name in node.names:
+        for position, name in enumerate(node.names):
             try:
                 # Masukkan parameter sebagai variabel lokal
                 nrm_val = 0 if node.is_ref else 1
-                self.symbol_table.enter(
+                idx = self.symbol_table.enter(
                     name, ObjectKind.VARIABLE, type_kind, 0, nrm_val, 
                     self.symbol_table.current_level, 0
                 )
+                # ASTConverter membuat ParameterNode per satu nama, anotasi dari nama pertama
+                if position == 0:
+                    entry = self.symbol_table.get_entry(idx)
+                    node.type = entry.type.name
+                    node.symbol_entry = SymbolAnnotation(tab_index=idx, lev=entry.lev, adr=entry.adr, ref=entry.ref)
             except ASTAnalyzerError as e:
                 raise ASTAnalyzerError(message=e)
             except ValueError as e:
@@ -303,41 +381,42 @@ class ASTAnalyzer:
 
     def visit_CompoundNode(self, node: CompoundNode):
         for child in node.children:
-            self.visit(child)
+            yield child
 
     def visit_AssignNode(self, node: AssignNode):
         # 1. Cek Tipe Target (Variable)
-        target_type = self.visit(node.target)
+        target_type = yield node.target
         
         # 2. Cek Tipe Value (Expression)
-        value_type = self.visit(node.value)
-        if target_type is None: target_type = TypeKind.NOTYPE
-        if value_type is None: value_type = TypeKind.NOTYPE        
+        value_type = yield node.value
+        if target_type is None: target_type = NO_TYPE
+        if value_type is None: value_type = NO_TYPE        
         # 3. Validasi Kompatibilitas
-        if target_type != value_type and target_type != TypeKind.NOTYPE and value_type != TypeKind.NOTYPE:
-            if target_type == TypeKind.REAL and value_type == TypeKind.INTEGER:
+        # Tipe ter-intern (lihat TypeTable), jadi kompatibilitas cukup dicek dengan identitas
+        if target_type is not value_type and target_type is not NO_TYPE and value_type is not NO_TYPE:
+            if target_type is REAL_TYPE and value_type is INTEGER_TYPE:
                 return
             
             # print(f"[Semantic Error] Type mismatch in assignment. "
             #       f"Cannot assign {value_type.name} to {target_type.name}")
-            raise ASTAnalyzerError(message=f"Type mismatch in assignment. Cannot assign {value_type.name} to {target_type.name}")
+            raise ASTAnalyzerError(message=f"Type mismatch in assignment. Cannot assign {value_type!r} to {target_type!r}")
 
     def visit_IfNode(self, node: IfNode):
-        cond_type = self.visit(node.condition)
-        if cond_type != TypeKind.BOOLEAN and cond_type != TypeKind.NOTYPE:
+        cond_type = yield node.condition
+        if cond_type is not BOOLEAN_TYPE and cond_type is not NO_TYPE:
             # print(f"[Semantic Error] IF condition must be BOOLEAN, got {cond_type.name}")
             raise ASTAnalyzerError(message=f"IF condition must be BOOLEAN, got {cond_type.name}")
 
-        self.visit(node.true_block)
+        yield node.true_block
         if node.else_block:
-            self.visit(node.else_block)
+            yield node.else_block
 
     def visit_WhileNode(self, node: WhileNode):
-        cond_type = self.visit(node.condition)
-        if cond_type != TypeKind.BOOLEAN and cond_type != TypeKind.NOTYPE:
+        cond_type = yield node.condition
+        if cond_type is not BOOLEAN_TYPE and cond_type is not NO_TYPE:
             # print(f"[Semantic Error] WHILE condition must be BOOLEAN, got {cond_type.name}")
             raise ASTAnalyzerError(message=f"WHILE condition must be BOOLEAN, got {cond_type.name}")
-        self.visit(node.body)
+        yield node.body
 
     def visit_ForNode(self, node: ForNode):
         # Cek variabel loop
@@ -346,137 +425,142 @@ class ASTAnalyzer:
             # print(f"[Semantic Error] Loop variable '{node.variable}' not declared.")
             raise ASTAnalyzerError(message=f"Loop variable '{node.variable}' not declared.")
 
-        start_type = self.visit(node.start_expr)
-        end_type = self.visit(node.end_expr)
+        start_type = yield node.start_expr
+        end_type = yield node.end_expr
         
-        if start_type != TypeKind.INTEGER or end_type != TypeKind.INTEGER:
+        if start_type is not INTEGER_TYPE or end_type is not INTEGER_TYPE:
             # print("[Semantic Error] FOR loop limits must be INTEGER.")
             raise ASTAnalyzerError(message=f"FOR loop limits must be INTEGER.")
 
-        self.visit(node.body)
+        yield node.body
 
     def visit_ProcedureCallNode(self, node: ProcedureCallNode):
         # Handle Built-in functions
-        if node.proc_name in ['writeln', 'write', 'readln', 'read']:
+        if node.proc_name in BUILTIN_PROCEDURES:
             for arg in node.arguments:
-                self.visit(arg)
+                yield arg
             return
 
         # Lookup Prosedur/Fungsi
         idx = self.symbol_table.lookup(node.proc_name)
         if idx == 0:
             # print(f"[Semantic Error] Identifier '{node.proc_name}' not declared.")
-            # return TypeKind.NOTYPE
+            # return NO_TYPE
             raise ASTAnalyzerError(message=f"Identifier '{node.proc_name}' not declared.")
         
         entry = self.symbol_table.get_entry(idx)
+        node.symbol_entry = SymbolAnnotation(tab_index=idx, lev=entry.lev)
         
         # Validasi: Harus Prosedur atau Fungsi
         if entry.obj == ObjectKind.FUNCTION:
-            return entry.type
-        return TypeKind.NOTYPE
+            return self.symbol_table.type_of(entry)
+        return NO_TYPE
 
     # =========================================================================
     # EXPRESSIONS & FACTORS
     # =========================================================================
     
-    def visit_ArrayAccessNode(self, node: ArrayAccessNode) -> TypeKind:
+    def visit_ArrayAccessNode(self, node: ArrayAccessNode) -> PascalType:
         # 1. Periksa Variabel Array
-        array_type = self.visit(node.array)
+        array_type = yield node.array
         
-        if array_type != TypeKind.ARRAY:
+        if array_type is None or array_type.kind is not TypeKind.ARRAY:
             # print(f"[Semantic Error] Variable is not an array.")
-            # return TypeKind.NOTYPE
+            # return NO_TYPE
             raise ASTAnalyzerError(message=f"Variable is not an array.")
 
         # 2. Periksa Index
-        index_type = self.visit(node.index)
-        if index_type != TypeKind.INTEGER:
+        index_type = yield node.index
+        if index_type is not INTEGER_TYPE:
             # print(f"[Semantic Error] Array index must be INTEGER, got {index_type.name}")
             raise ASTAnalyzerError(message=f"Array index must be INTEGER, got {index_type.name}")
 
-        # 3. Ambil Tipe Elemen dari Symbol Table (atab)
-        if not hasattr(node.array, 'symbol_entry'):
-            return TypeKind.NOTYPE
-
-        # Ambil referensi ke atab
-        tab_idx = node.array.symbol_entry.get('tab_index')
-        entry = self.symbol_table.get_entry(tab_idx)
-        
-        if entry and entry.ref > 0:
-            atab_entry = self.symbol_table.atab[entry.ref]
-            
-            # Validasi Range Index
-            if isinstance(node.index, NumNode):
-                val = int(node.index.value)
-                if val < atab_entry.low or val > atab_entry.high:
-                    # print(f"[Semantic Error] Array index out of bounds: {val}. Valid: [{atab_entry.low}..{atab_entry.high}]")
-                    raise ASTAnalyzerError(message=f"Array index out of bounds: {val}. Valid: [{atab_entry.low}..{atab_entry.high}]")
-
-            # Kembalikan tipe elemen (etyp)
-            return atab_entry.etyp
-            
-        return TypeKind.NOTYPE
-
-
-    def visit_BinOpNode(self, node: BinOpNode) -> TypeKind:
-        left = self.visit(node.left)
-        right = self.visit(node.right)
+        # 3. Ambil Tipe Elemen dari tipe struktural array (ARRAY tanpa elemen: struktur tidak diketahui)
+        if array_type.element is None:
+            return NO_TYPE
+
+        # Validasi Range Index
+        if isinstance(node.index, NumNode):
+            val = int(node.index.value)
+            if val < array_type.low or val > array_type.high:
+                # print(f"[Semantic Error] Array index out of bounds: {val}. Valid: [{array_type.low}..{array_type.high}]")
+                raise ASTAnalyzerError(message=f"Array index out of bounds: {val}. Valid: [{array_type.low}..{array_type.high}]")
+
+        # Kembalikan tipe elemen
+        return array_type.element
+
+    def visit_FieldAccessNode(self, node: FieldAccessNode) -> PascalType:
+        record_type = yield node.record
+        # Tipe yang tidak diketahui (NOTYPE/belum ter-resolve) tidak divalidasi
+        if record_type is None or record_type is NO_TYPE:
+            return NO_TYPE
+        if record_type.kind is not TypeKind.RECORD:
+            raise ASTAnalyzerError(message=f"Variable is not a record.")
+
+        field_type = record_type.field(node.field_name)
+        if field_type is None:
+            raise ASTAnalyzerError(message=f"Record has no field '{node.field_name}'.")
+        return field_type
+
+
+    def visit_BinOpNode(self, node: BinOpNode) -> PascalType:
+        left = yield node.left
+        right = yield node.right
         
-        if left == TypeKind.NOTYPE or right == TypeKind.NOTYPE:
-            return TypeKind.NOTYPE
+        if left is NO_TYPE or right is NO_TYPE:
+            return NO_TYPE
 
         op = node.op.lower()
 
         # Aritmatika: +, -, *, div, mod
         if op in ['+', '-', '*', 'div', 'mod', 'bagi']:
             # Integer operan
-            if left == TypeKind.INTEGER and right == TypeKind.INTEGER:
-                if op == '/' or op == 'bagi': return TypeKind.REAL
-                return TypeKind.INTEGER
+            if left is INTEGER_TYPE and right is INTEGER_TYPE:
+                if op == '/' or op == 'bagi': return REAL_TYPE
+                return INTEGER_TYPE
             
             # Real operan
-            if left == TypeKind.REAL or right == TypeKind.REAL:
+            if left is REAL_TYPE or right is REAL_TYPE:
                 if op == 'div' or op == 'mod':
                     #  print(f"[Semantic Error] Operator '{op}' only for INTEGER.")
-                    #  return TypeKind.NOTYPE
+                    #  return NO_TYPE
                     raise ASTAnalyzerError(message=f"Operator '{op}' only for INTEGER.")
-                return TypeKind.REAL
+                return REAL_TYPE
                 
         # Relasional: =, <>, <, >, <=, >=
         if op in ['=', '<>', '<', '>', '<=', '>=']:
-            return TypeKind.BOOLEAN
+            return BOOLEAN_TYPE
             
         # Logika: and, or
         if op in ['and', 'or', 'dan', 'atau']:
-            if left == TypeKind.BOOLEAN and right == TypeKind.BOOLEAN:
-                return TypeKind.BOOLEAN
+            if left is BOOLEAN_TYPE and right is BOOLEAN_TYPE:
+                return BOOLEAN_TYPE
             else:
                 # print(f"[Semantic Error] Operator '{op}' requires BOOLEAN operands.")
                 raise ASTAnalyzerError(message=f"Operator '{op}' requires BOOLEAN operands.")
 
-        return TypeKind.NOTYPE
+        return NO_TYPE
 
-    def visit_UnaryOpNode(self, node: UnaryOpNode) -> TypeKind:
-        expr_type = self.visit(node.expr)
+    def visit_UnaryOpNode(self, node: UnaryOpNode) -> PascalType:
+        expr_type = yield node.expr
         op = node.op.lower()
         
         if op == 'tidak' or op == 'not':
-            if expr_type == TypeKind.BOOLEAN: return TypeKind.BOOLEAN
+            if expr_type is BOOLEAN_TYPE: return BOOLEAN_TYPE
         elif op == '-':
-            if expr_type in [TypeKind.INTEGER, TypeKind.REAL]: return expr_type
+            if expr_type is INTEGER_TYPE or expr_type is REAL_TYPE: return expr_type
             
         # print(f"[Semantic Error] Invalid unary op '{op}' on {expr_type.name}")
         raise ASTAnalyzerError(message=f"Invalid unary op '{op}' on {expr_type.name}")
-        # return TypeKind.NOTYPE
+        # return NO_TYPE
 
-    def visit_VarNode(self, node: VarNode) -> TypeKind:
+    def visit_VarNode(self, node: VarNode) -> PascalType:
         # 1. Lookup Identifier
         idx = self.symbol_table.lookup(node.name)
         
         if idx == 0:
             # print(f"[Semantic Error] Variable '{node.name}' not declared.")
-            # return TypeKind.NOTYPE
+            # return NO_TYPE
             raise ASTAnalyzerError(message=f"Variable '{node.name}' not declared.")
             
         # 2. Ambil Entry
@@ -484,41 +568,31 @@ class ASTAnalyzer:
         
         node.type = entry.type.name
         # Simpan tab_index beserta info entry lainnya
-        node.symbol_entry = {
-            'tab_index': idx,
-            'lev': entry.lev,
-            'adr': entry.adr,
-            'ref': entry.ref,
-            'obj': entry.obj,
-            'type': entry.type
-        }
+        node.symbol_entry = SymbolAnnotation(tab_index=idx, lev=entry.lev, adr=entry.adr, ref=entry.ref)
         
-        return entry.type
+        return self.symbol_table.type_of(entry)
 
-    def visit_NumNode(self, node: NumNode) -> TypeKind:
-        if isinstance(node.value, float): return TypeKind.REAL
-        return TypeKind.INTEGER
+    def visit_NumNode(self, node: NumNode) -> PascalType:
+        if isinstance(node.value, float): return REAL_TYPE
+        return INTEGER_TYPE
 
-    def visit_StringNode(self, node: StringNode) -> TypeKind:
-        return TypeKind.STRING
+    def visit_StringNode(self, node: StringNode) -> PascalType:
+        return STRING_TYPE
 
-    def visit_BoolNode(self, node: BoolNode) -> TypeKind:
-        return TypeKind.BOOLEAN
+    def visit_BoolNode(self, node: BoolNode) -> PascalType:
+        return BOOLEAN_TYPE
     
-    def visit_CharNode(self, node: CharNode) -> TypeKind:
-        return TypeKind.CHAR
+    def visit_CharNode(self, node: CharNode) -> PascalType:
+        return CHAR_TYPE
 
     def visit_NoOpNode(self, node: NoOpNode):
-        return TypeKind.NOTYPE
+        return NO_TYPE
 
     # --- HELPERS ---
     def _resolve_type_str(self, type_name: str) -> TypeKind:
         tn = type_name.upper()
-        if tn == 'INTEGER': return TypeKind.INTEGER
-        if tn == 'REAL': return TypeKind.REAL
-        if tn == 'BOOLEAN': return TypeKind.BOOLEAN
-        if tn == 'CHAR': return TypeKind.CHAR
-        if tn == 'STRING': return TypeKind.STRING
+        type_kind = BASIC_TYPE_NAMES.get(tn)
+        if type_kind is not None: return type_kind
         # Array/Record 
-        if tn == 'ARRAY' or 'ARRAY' in tn: return TypeKind.ARRAY
+        if 'ARRAY' in tn: return TypeKind.ARRAY
         return TypeKind.NOTYPE
\ No newline at end of file
@@ -0,0 +1,320 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from syntax.parsetree import NonTerminal
+from .ast_nodes import *
+
+# Nilai list dari aturan rekursif-kanan (<StatementListPrime>, <ConstList>, ...) dibangun
+# sebagai cons cell (item, sisa) agar setiap aksi O(1) dan tidak memodifikasi nilai anak
+# (nilai anak bisa dipakai ulang dari memo packrat saat backtracking).
+Cons = Optional[Tuple[Any, "Cons"]]
+
+class ASTBuilder:
+    """
+    Aksi semantik untuk CFG (mode build_ast): setiap non-terminal yang berhasil di-parse
+    langsung diubah menjadi nilai AST dari nilai anak-anaknya, tanpa membangun parse tree.
+
+    Aksi `_build_X` menerima list nilai anak dari alternatif yang cocok untuk <X>
+    (Token untuk terminal, hasil aksi untuk non-terminal, list kosong untuk Epsilon).
+    Hasil akhirnya sama dengan ASTConverter.convert pada parse tree yang sama.
+    Aksi tidak boleh memodifikasi nilai anak.
+    """
+
+    def actions(self) -> Dict[NonTerminal, Callable[[List[Any]], Any]]:
+        """Peta non-terminal -> aksi, untuk CFG.setActions."""
+        return {
+            NonTerminal(f"<{name[len('_build_'):]}>"): getattr(self, name)
+            for name in dir(self) if name.startswith('_build_')
+        }
+
+    # --- HELPERS ---
+    @staticmethod
+    def _to_list(cons: Cons) -> List[Any]:
+        items = []
+        while cons is not None:
+            item, cons = cons
+            items.append(item)
+        return items
+
+    @staticmethod
+    def _number(lexeme: str) -> NumNode:
+        try: val = float(lexeme) if '.' in lexeme else int(lexeme)
+        except: val = 0
+        return NumNode(value=val)
+
+    @staticmethod
+    def _apply_variable_tail(base: ASTNode, tail: Cons) -> ASTNode:
+        while tail is not None:
+            (kind, arg), tail = tail
+            if kind == "[":
+                base = ArrayAccessNode(array=base, index=arg)
+            else:
+                base = FieldAccessNode(record=base, field_name=arg)
+        return base
+
+    # ==================== PROGRAM STRUCTURE ====================
+    def _build_Program(self, values):
+        declarations, compound = values[1]
+        return ProgramNode(name=values[0], declarations=declarations, block=compound)
+
+    def _build_ProgramHeader(self, values):
+        return values[1].lexeme
+
+    def _build_Block(self, values):
+        # (deklarasi, CompoundNode)
+        return values[0], values[1]
+
+    def _build_DeclarationPart(self, values):
+        decls = []
+        for res in values:
+            decls.extend(res)
+        return decls
+
+    # ==================== DECLARATIONS ====================
+    def _build_ConstDeclOpt(self, values):
+        return self._to_list(values[1]) if values else []
+
+    def _build_ConstList(self, values):
+        if not values: return None
+        return ConstDeclNode(const_name=values[0].lexeme, value=values[2]), values[4]
+
+    def _build_TypeDeclOpt(self, values):
+        return self._to_list(values[1]) if values else []
+
+    def _build_TypeList(self, values):
+        if not values: return None
+        return TypeDeclNode(type_name=values[0].lexeme, value=values[2]), values[4]
+
+    def _build_VarDeclOpt(self, values):
+        vars_list = []
+        if values:
+            for curr in self._to_list(values[1]):
+                vars_list.extend(curr)
+        return vars_list
+
+    def _build_VarDeclList(self, values):
+        if not values: return None
+        return values[0], values[2]
+
+    def _build_VarDeclaration(self, values):
+        type_node = values[2]
+        return [VarDeclNode(var_name=name, type_node=type_node) for name in values[0]]
+
+    def _build_IdentifierList(self, values):
+        return [values[0].lexeme] + self._to_list(values[1])
+
+    def _build_IdentifierListPrime(self, values):
+        if not values: return None
+        return values[1].lexeme, values[2]
+
+    # ==================== TYPES & SUBPROGRAMS ====================
+    def _build_Type(self, values):
+        return values[0]
+
+    def _build_SimpleType(self, values):
+        return TypeNode(type_name=values[0].lexeme)
+
+    def _build_ArrayType(self, values):
+        lower, upper = values[2]
+        return ArrayTypeNode(lower=lower, upper=upper, element_type=values[5])
+
+    def _build_RecordType(self, values):
+        return RecordTypeNode(fields=values[1])
+
+    def _build_Range(self, values):
+        return values[0], values[2]
+
+    def _build_SubprogDeclList(self, values):
+        if not values: return []
+        subs = [values[0]]
+        subs.extend(values[2])
+        return subs
+
+    def _build_SubprogramDeclaration(self, values):
+        return values[0]
+
+    def _build_ProcedureDeclaration(self, values):
+        local_decls, body = values[4]
+        return ProcedureDeclNode(name=values[1].lexeme, params=values[2], local_vars=local_decls,
+                                 block=CompoundNode(children=body.children))
+
+    def _build_FunctionDeclaration(self, values):
+        local_decls, body = values[6]
+        return FunctionDeclNode(name=values[1].lexeme, return_type=values[4], params=values[2],
+                                local_vars=local_decls, block=body)
+
+    def _build_FormalParamOpt(self, values):
+        return values[0] if values else []
+
+    def _build_FormalParameterList(self, values):
+        return values[1]
+
+    def _build_ParamSectionList(self, values):
+        params = list(values[0])
+        for p in self._to_list(values[1]):
+            params.extend(p)
+        return params
+
+    def _build_ParamSectionListPrime(self, values):
+        if not values: return None
+        return values[1], values[2]
+
+    def _build_ParamSection(self, values):
+        is_ref, names, type_node = values[0], values[1], values[3]
+        return [ParameterNode(names=[n], type_node=type_node, is_ref=is_ref) for n in names]
+
+    def _build_VarKeywordOpt(self, values):
+        return bool(values)
+
+    # ==================== STATEMENTS ====================
+    def _build_StatementPart(self, values):
+        return values[0]
+
+    def _build_CompoundStatement(self, values):
+        return CompoundNode(children=values[1])
+
+    def _build_StatementList(self, values):
+        if not values: return []
+        stmts = [values[0]] + self._to_list(values[1])
+        return [s for s in stmts if s and not isinstance(s, NoOpNode)]
+
+    def _build_StatementListPrime(self, values):
+        if not values: return None
+        return values[1], values[2]
+
+    def _build_Statement(self, values):
+        # <RepeatStatement> dan <CaseStatement> tidak punya aksi (None), sama seperti
+        # ASTConverter yang tidak punya converter untuk keduanya
+        return values[0] if values else NoOpNode()
+
+    def _build_AssignmentStatement(self, values):
+        target = self._apply_variable_tail(VarNode(name=values[0].lexeme), values[1])
+        return AssignNode(target=target, value=values[3])
+
+    def _build_ProcedureCall(self, values):
+        return ProcedureCallNode(proc_name=values[0].lexeme, arguments=values[1])
+
+    def _build_IfStatement(self, values):
+        return IfNode(condition=values[1], true_block=values[3], else_block=values[4])
+
+    def _build_ElsePart(self, values):
+        return values[1] if values else None
+
+    def _build_WhileStatement(self, values):
+        return WhileNode(condition=values[1], body=values[3])
+
+    def _build_ForStatement(self, values):
+        return ForNode(variable=values[1].lexeme, start_expr=values[3], direction=values[4],
+                       end_expr=values[5], body=values[7])
+
+    def _build_ForDirection(self, values):
+        return values[0].lexeme
+
+    # --- PARAMETER LIST ---
+    def _build_ParameterListOpt(self, values):
+        return values[0] if values else []
+
+    def _build_ParameterList(self, values):
+        return values[1]
+
+    def _build_ExpressionList(self, values):
+        exprs = [values[0]] + self._to_list(values[1])
+        return [expr for expr in exprs if expr]
+
+    def _build_ExpressionListPrime(self, values):
+        if not values: return None
+        return values[1], values[2]
+
+    # ==================== EXPRESSIONS ====================
+    def _build_Expression(self, values):
+        left, prime = values
+        if prime is None: return left
+        op, right = prime
+        return BinOpNode(op=op, left=left, right=right)
+
+    def _build_ExpressionPrime(self, values):
+        if not values: return None
+        return values[0], values[1]
+
+    def _build_SimpleExpression(self, values):
+        left = values[0]
+        for op, right in self._to_list(values[1]):
+            left = BinOpNode(op=op, left=left, right=right)
+        return left
+
+    def _build_SimpleExpressionPrime(self, values):
+        if not values: return None
+        return (values[0], values[1]), values[2]
+
+    def _build_SignedTerm(self, values):
+        unary, term = values
+        if unary == "-": return UnaryOpNode(op="-", expr=term)
+        return term
+
+    def _build_Term(self, values):
+        left = values[0]
+        for op, right in self._to_list(values[1]):
+            left = BinOpNode(op=op, left=left, right=right)
+        return left
+
+    def _build_TermPrime(self, values):
+        if not values: return None
+        return (values[0], values[1]), values[2]
+
+    def _build_Factor(self, values):
+        first = values[0]
+        if len(values) == 3:
+            # ( <Expression> )
+            return values[1]
+        if len(values) == 1:
+            # <Constant>
+            return first
+        if first.token_type == "LOGICAL_OPERATOR":
+            return UnaryOpNode(op="tidak", expr=values[1])
+        # IDENTIFIER <FactorTail>
+        tail = values[1]
+        if isinstance(tail, list):
+            return ProcedureCallNode(proc_name=first.lexeme, arguments=tail)
+        return self._apply_variable_tail(VarNode(name=first.lexeme), tail)
+
+    def _build_FactorTail(self, values):
+        # List argumen jika pemanggilan fungsi (<ParameterList>), cons akses jika <VariableTail>
+        return values[0]
+
+    def _build_VariableTail(self, values):
+        if not values: return None
+        if len(values) == 4:
+            return ("[", values[1]), values[3]
+        return (".", values[1].lexeme), values[2]
+
+    def _build_RelationalOperator(self, values):
+        return values[0].lexeme
+
+    def _build_AdditiveOperator(self, values):
+        return values[0].lexeme
+
+    def _build_MultiplicativeOperator(self, values):
+        return values[0].lexeme
+
+    # ==================== CONSTANTS ====================
+    def _build_Constant(self, values):
+        if len(values) == 2:
+            sign, val = values
+            if sign == "-" and isinstance(val, NumNode): val = NumNode(value=-val.value)
+            return val
+        token = values[0]
+        if token.token_type == "STRING_LITERAL": return StringNode(value=token.lexeme)
+        if token.token_type == "CHAR_LITERAL": return CharNode(value=token.lexeme)
+        if token.lexeme.lower() == "true": return BoolNode(value=True)
+        if token.lexeme.lower() == "false": return BoolNode(value=False)
+        return NoOpNode()
+
+    def _build_UnsignedConstant(self, values):
+        token = values[0]
+        if token.token_type == "NUMBER": return self._number(token.lexeme)
+        return VarNode(name=token.lexeme)
+
+    def _build_SignOpt(self, values):
+        return values[0] if values else None
+
+    def _build_Sign(self, values):
+        return values[0].lexeme
@@ -1,10 +1,37 @@
-from typing import List, Optional, Union
-from syntax.parsetree import Node 
+from typing import Any, Callable, Dict, List, Optional, Union
+from syntax.parsetree import Node, CompactNode
 from lexical.token import Token
 from syntax.cfg import NonTerminal 
 from .ast_nodes import *
 
+# Non-terminal yang hasil konversinya sama dengan anak non-terminal tunggalnya
+# (anak lainnya epsilon). Di parse tree compact, level ini dilewati langsung.
+PASS_THROUGH = {
+    NonTerminal("<Expression>"), NonTerminal("<SimpleExpression>"), NonTerminal("<SignedTerm>"),
+    NonTerminal("<Term>"), NonTerminal("<Factor>"), NonTerminal("<Constant>"), NonTerminal("<Type>"),
+    NonTerminal("<SubprogramDeclaration>"), NonTerminal("<Statement>"), NonTerminal("<StatementPart>"),
+    NonTerminal("<FormalParamOpt>"), NonTerminal("<ParameterListOpt>"),
+}
+
+# Non-terminal yang converter-nya tidak bernama _convert_<nama non-terminal>
+CONVERTER_ALIASES = {
+    NonTerminal("<VarDeclOpt>"): "_convert_VarDeclarationPart",
+    NonTerminal("<ConstDeclOpt>"): "_convert_ConstDeclarationPart",
+    NonTerminal("<TypeDeclOpt>"): "_convert_TypeDeclarationPart",
+}
+
 class ASTConverter:
+    dispatch: Dict[NonTerminal, Callable[[Node], Any]]
+
+    def __init__(self):
+        # Tabel dispatch non-terminal -> converter, dibangun sekali per converter
+        self.dispatch = {
+            NonTerminal(f"<{name[len('_convert_'):]}>"): getattr(self, name)
+            for name in dir(self) if name.startswith('_convert_')
+        }
+        for lhs, name in CONVERTER_ALIASES.items():
+            self.dispatch[lhs] = getattr(self, name)
+
     def convert(self, parse_tree_root: Node) -> ASTNode:
         """Entry point untuk konversi Parse Tree ke AST"""
         if parse_tree_root.value == NonTerminal("<S>"):
@@ -17,38 +44,56 @@ class ASTConverter:
 
     def visit(self, node):
         """Helper untuk menavigasi node secara dinamis."""
+        node = self._unwrap(node)
         if isinstance(node, Node):
-            clean_name = str(node.value).replace('<', '').replace('>', '').replace('-', '_')
-            
-            # --- MAPPING MANUAL ---
-            if clean_name == "VarDeclOpt": method_name = "_convert_VarDeclarationPart"
-            elif clean_name == "ConstDeclOpt": method_name = "_convert_ConstDeclarationPart"
-            elif clean_name == "TypeDeclOpt": method_name = "_convert_TypeDeclarationPart"
-            elif clean_name == "SubprogDeclList": method_name = "_convert_SubprogDeclList"
-            elif clean_name == "StatementPart": method_name = "_convert_StatementPart"
-            else: method_name = '_convert_' + clean_name
-            
-            method = getattr(self, method_name, self._generic_visit)
-            return method(node)
+            return self.dispatch.get(node.value, self._generic_visit)(node)
+        return node
+
+    def _unwrap(self, node):
+        """Bentuk Node biasa dari CompactNode (pass-through dilewati), node lain apa adanya."""
+        if isinstance(node, CompactNode):
+            if node.collapsed:
+                node = self._skip_pass_through(node)
+            # Hitung bentuk lengkap sekali saja, bukan di setiap akses node.children
+            if isinstance(node, CompactNode):
+                node = node.expand()
         return node
 
+    def _list_tail(self, node, lhs: NonTerminal, items: list):
+        """
+        Ekor list rekursif-kanan: node berikutnya jika masih `lhs` (diproses di loop pemanggil),
+        selain itu hasil visit-nya ditambahkan ke `items` dan mengembalikan None.
+        """
+        node = self._unwrap(node)
+        if isinstance(node, Node) and node.value == lhs:
+            return node
+        rest = self.visit(node)
+        if rest: items.extend(rest)
+        return None
+
     def _generic_visit(self, node):
         return None
 
+    def _skip_pass_through(self, node: CompactNode) -> Node:
+        """Lewati non-terminal PASS_THROUGH terluar dari rantai collapsed sebuah CompactNode."""
+        chain = node.collapsed
+        depth = 0
+        while depth < len(chain) and chain[depth][0] in PASS_THROUGH:
+            # Level terdalam hanya pass-through jika anak tunggalnya non-terminal, bukan token
+            if depth + 1 == len(chain) and not isinstance(node.symbol, NonTerminal):
+                break
+            depth += 1
+        return node.inner(depth) if depth else node
+
     # --- HELPERS ---
     def _get_lexeme(self, node_or_token) -> str:
         token = self._get_token(node_or_token)
         return token.lexeme if token else ""
     
     def _get_token(self, node_or_token) -> Optional[Token]:
+        """Token pertama di subtree, dari Node.first yang dicatat parser (tanpa menelusuri subtree)."""
         if isinstance(node_or_token, Token): return node_or_token
-        if isinstance(node_or_token, Node):
-            if isinstance(node_or_token.value, Token): return node_or_token.value
-            if str(node_or_token.value) == "EPSILON": return None
-            if node_or_token.children:
-                for child in node_or_token.children:
-                    found = self._get_token(child)
-                    if found: return found
+        if isinstance(node_or_token, Node): return node_or_token.first
         return None
 
     def _get_operator_lexeme(self, node: Node) -> str:
@@ -93,14 +138,15 @@ class ASTConverter:
         return []
 
     def _convert_ConstList(self, node: Node) -> List[ConstDeclNode]:
-        if not node.children or str(node.children[0].value) == "EPSILON": return []
         consts = []
-        const_name = self._get_lexeme(node.children[0])
-        val_node = self.visit(node.children[2])
-        consts.append(ConstDeclNode(const_name=const_name, value=val_node))
-        if len(node.children) > 4:
-            rest = self.visit(node.children[4])
-            if rest: consts.extend(rest)
+        lhs = node.value
+        while node is not None:
+            children = node.children
+            if not children or str(children[0].value) == "EPSILON": break
+            const_name = self._get_lexeme(children[0])
+            val_node = self.visit(children[2])
+            consts.append(ConstDeclNode(const_name=const_name, value=val_node))
+            node = self._list_tail(children[4], lhs, consts) if len(children) > 4 else None
         return consts
 
     def _convert_TypeDeclarationPart(self, node: Node) -> List[TypeDeclNode]:
@@ -108,14 +154,15 @@ class ASTConverter:
         return self.visit(node.children[1])
 
     def _convert_TypeList(self, node: Node) -> List[TypeDeclNode]:
-        if not node.children or str(node.children[0].value) == "EPSILON": return []
         types = []
-        type_name = self._get_lexeme(node.children[0])
-        type_val = self.visit(node.children[2])
-        types.append(TypeDeclNode(type_name=type_name, value=type_val))
-        if len(node.children) > 4:
-            rest = self.visit(node.children[4])
-            if rest: types.extend(rest)
+        lhs = node.value
+        while node is not None:
+            children = node.children
+            if not children or str(children[0].value) == "EPSILON": break
+            type_name = self._get_lexeme(children[0])
+            type_val = self.visit(children[2])
+            types.append(TypeDeclNode(type_name=type_name, value=type_val))
+            node = self._list_tail(children[4], lhs, types) if len(children) > 4 else None
         return types
 
     def _convert_VarDeclarationPart(self, node: Node) -> List[VarDeclNode]:
@@ -130,18 +177,21 @@ class ASTConverter:
         return []
 
     def _convert_VarDeclList(self, node: Node) -> List[VarDeclNode]:
-        if not node.children or str(node.children[0].value) == "EPSILON": return []
         vars_list = []
-        curr = self.visit(node.children[0])
-        if curr: vars_list.extend(curr)
-        if len(node.children) > 2:
-            vars_list.extend(self._convert_VarDeclList(node.children[2]))
+        while True:
+            children = node.children
+            if not children or str(children[0].value) == "EPSILON": break
+            curr = self.visit(children[0])
+            if curr: vars_list.extend(curr)
+            if len(children) <= 2: break
+            node = children[2]
         return vars_list
 
     def _collect_var_prime(self, node:Node, vars_list):
-        if not node.children or str(node.children[0].value) == "EPSILON": return
-        vars_list.extend(self.visit(node.children[0]))
-        if len(node.children) > 1: self._collect_var_prime(node.children[1], vars_list)
+        while node.children and str(node.children[0].value) != "EPSILON":
+            vars_list.extend(self.visit(node.children[0]))
+            if len(node.children) <= 1: break
+            node = node.children[1]
 
     def _convert_VarDeclaration(self, node: Node) -> List[VarDeclNode]:
         ids = self.visit(node.children[0]) 
@@ -156,9 +206,10 @@ class ASTConverter:
         return ids
 
     def _collect_ids(self, node:Node, ids):
-        if not node.children or str(node.children[0].value) == "EPSILON": return
-        ids.append(self._get_lexeme(node.children[1]))
-        if len(node.children) > 2: self._collect_ids(node.children[2], ids)
+        while node.children and str(node.children[0].value) != "EPSILON":
+            ids.append(self._get_lexeme(node.children[1]))
+            if len(node.children) <= 2: break
+            node = node.children[2]
 
     # ==================== TYPES & SUBPROGRAMS ====================
     def _convert_Type(self, node: Node) -> ASTNode:
@@ -185,17 +236,21 @@ class ASTConverter:
         return fields
 
     def _collect_fields(self, node:Node, fields):
-        if not node.children or str(node.children[0].value) == "EPSILON": return
-        f = self.visit(node.children[0])
-        if f: fields.extend(f)
-        if len(node.children) > 1: self._collect_fields(node.children[1], fields)
+        while node.children and str(node.children[0].value) != "EPSILON":
+            f = self.visit(node.children[0])
+            if f: fields.extend(f)
+            if len(node.children) <= 1: break
+            node = node.children[1]
 
     def _convert_SubprogDeclList(self, node: Node) -> List[ASTNode]:
-        if not node.children or str(node.children[0].value) == "EPSILON": return []
         subs = []
-        sub = self.visit(node.children[0])
-        if sub: subs.append(sub)
-        if len(node.children) > 2: subs.extend(self.visit(node.children[2]))
+        lhs = node.value
+        while node is not None:
+            children = node.children
+            if not children or str(children[0].value) == "EPSILON": break
+            sub = self.visit(children[0])
+            if sub: subs.append(sub)
+            node = self._list_tail(children[2], lhs, subs) if len(children) > 2 else None
         return subs
 
     def _convert_SubprogramDeclaration(self, node: Node):
@@ -258,11 +313,11 @@ class ASTConverter:
         return params
 
     def _collect_param_section_prime(self, node:Node, params):
-        if not node.children or str(node.children[0].value) == "EPSILON": return
-        p = self.visit(node.children[1])
-        if p: params.extend(p)
-        if len(node.children) > 2:
-            self._collect_param_section_prime(node.children[2], params)
+        while node.children and str(node.children[0].value) != "EPSILON":
+            p = self.visit(node.children[1])
+            if p: params.extend(p)
+            if len(node.children) <= 2: break
+            node = node.children[2]
 
     def _convert_ParamSection(self, node: Node) -> List[ParameterNode]:
         """Handle: VAR? <IdentifierList> : <Type>"""
@@ -319,10 +374,11 @@ class ASTConverter:
         return stmts
 
     def _collect_stmt_prime(self, node:Node, stmts):
-        if not node.children or str(node.children[0].value) == "EPSILON": return
-        s = self.visit(node.children[1]) 
-        if s and not isinstance(s, NoOpNode): stmts.append(s)
-        if len(node.children) > 2: self._collect_stmt_prime(node.children[2], stmts)
+        while node.children and str(node.children[0].value) != "EPSILON":
+            s = self.visit(node.children[1]) 
+            if s and not isinstance(s, NoOpNode): stmts.append(s)
+            if len(node.children) <= 2: break
+            node = node.children[2]
 
     def _convert_Statement(self, node: Node):
         if not node.children or str(node.children[0].value) == "EPSILON": return NoOpNode()
@@ -419,18 +475,17 @@ class ASTConverter:
 
     def _collect_expression_list_prime(self, node: Node, exprs: List[ASTNode]):
         """Handle: COMMA(,) <Expression> <ExpressionListPrime> | <Epsilon>"""
-        if not node.children or str(node.children[0].value) == "EPSILON":
-            return
-        
-        # children[0] = ','
-        # children[1] = <Expression>
-        # children[2] = <ExpressionListPrime>
-        expr = self.visit(node.children[1])
-        if expr:
-            exprs.append(expr)
-        
-        if len(node.children) > 2:
-            self._collect_expression_list_prime(node.children[2], exprs)
+        while node.children and str(node.children[0].value) != "EPSILON":
+            # children[0] = ','
+            # children[1] = <Expression>
+            # children[2] = <ExpressionListPrime>
+            expr = self.visit(node.children[1])
+            if expr:
+                exprs.append(expr)
+            
+            if len(node.children) <= 2:
+                break
+            node = node.children[2]
 
     def _convert_IfStatement(self, node: Node) -> IfNode:
         cond = self.visit(node.children[1])
@@ -485,12 +540,13 @@ class ASTConverter:
         return left
 
     def _visit_simple_prime(self, node:Node, left):
-        if not node.children or str(node.children[0].value) == "EPSILON": return left
-        op = self._get_operator_lexeme(node.children[0])
-        right = self.visit(node.children[1])
-        new_left = BinOpNode(op=op, left=left, right=right)
-        if len(node.children) > 2: return self._visit_simple_prime(node.children[2], new_left)
-        return new_left
+        while node.children and str(node.children[0].value) != "EPSILON":
+            op = self._get_operator_lexeme(node.children[0])
+            right = self.visit(node.children[1])
+            left = BinOpNode(op=op, left=left, right=right)
+            if len(node.children) <= 2: break
+            node = node.children[2]
+        return left
 
     def _convert_SignedTerm(self, node: Node):
         sign_node = node.children[0]
@@ -507,12 +563,13 @@ class ASTConverter:
         return left
 
     def _visit_term_prime(self, node:Node, left):
-        if not node.children or str(node.children[0].value) == "EPSILON": return left
-        op = self._get_operator_lexeme(node.children[0])
-        right = self.visit(node.children[1])
-        new_left = BinOpNode(op=op, left=left, right=right)
-        if len(node.children) > 2: return self._visit_term_prime(node.children[2], new_left)
-        return new_left
+        while node.children and str(node.children[0].value) != "EPSILON":
+            op = self._get_operator_lexeme(node.children[0])
+            right = self.visit(node.children[1])
+            left = BinOpNode(op=op, left=left, right=right)
+            if len(node.children) <= 2: break
+            node = node.children[2]
+        return left
 
     def _convert_Factor(self, node: Node):
         first = node.children[0]
@@ -535,12 +592,12 @@ class ASTConverter:
                 except: val = 0
                 return NumNode(value=val)
             if token.token_type == "IDENTIFIER":
-                 if len(node.children) > 1 and self._get_lexeme(node.children[1]) == "(":
-                     params = []
-                     if len(node.children) > 2:
-                          res = self.visit(node.children[2])
-                          if res: params = res
-                     return ProcedureCallNode(proc_name=lex, arguments=params)
+                 if len(node.children) > 1:
+                     # <FactorTail> ::= <ParameterList> | <VariableTail>
+                     tail = self._unwrap(node.children[1]).children[0]
+                     if str(tail.value) == "<ParameterList>":
+                         return ProcedureCallNode(proc_name=lex, arguments=self.visit(tail) or [])
+                     return self._handle_variable_tail(VarNode(name=lex), tail)
                  return VarNode(name=lex)
         
         return NoOpNode()
@@ -552,18 +609,20 @@ class ASTConverter:
         return base
 
     def _handle_variable_tail(self, base, node:Node):
-        if not node.children or str(node.children[0].value) == "EPSILON": return base
-        first = self._get_lexeme(node.children[0])
-        if first == "[":
-             idx = self.visit(node.children[1])
-             new_base = ArrayAccessNode(array=base, index=idx)
-             if len(node.children) > 3: return self._handle_variable_tail(new_base, node.children[3])
-             return new_base
-        if first == ".":
-             field = self._get_lexeme(node.children[1])
-             new_base = FieldAccessNode(record=base, field_name=field)
-             if len(node.children) > 2: return self._handle_variable_tail(new_base, node.children[2])
-             return new_base
+        while node.children and str(node.children[0].value) != "EPSILON":
+            first = self._get_lexeme(node.children[0])
+            if first == "[":
+                 idx = self.visit(node.children[1])
+                 base = ArrayAccessNode(array=base, index=idx)
+                 if len(node.children) <= 3: break
+                 node = node.children[3]
+            elif first == ".":
+                 field = self._get_lexeme(node.children[1])
+                 base = FieldAccessNode(record=base, field_name=field)
+                 if len(node.children) <= 2: break
+                 node = node.children[2]
+            else:
+                 break
         return base
     
     def _convert_Constant(self, node: Node):
@@ -1,6 +1,6 @@
 from .ast_nodes import *
-from .ast_analyzer import ASTAnalyzer
-from .symbol_table import SymbolTable, TypeKind, ObjectKind, TabEntry
+from .ast_analyzer import ASTAnalyzer, BUILTIN_PROCEDURES
+from .symbol_table import SymbolTable, TypeKind, ObjectKind, TabEntry, PascalType, NO_TYPE
 
 # =========================================================================
 # 1. PATCHED SYMBOL TABLE (Pertahankan perbaikan Link Mundur)
@@ -13,6 +13,7 @@ class PatchedSymbolTable(SymbolTable):
             btab_idx = self.display[lev]
             previous_idx = self.btab[btab_idx].last
 
+        # scope_index ikut diperbarui oleh SymbolTable.enter
         current_idx = super().enter(name, obj, type_kind, ref, nrm, lev, adr)
         self.tab[current_idx].link = previous_idx # Backward link fix
         return current_idx
@@ -27,9 +28,9 @@ class ASTDecorator(ASTAnalyzer):
         # Gunakan tabel yang sudah dipatch
         self.symbol_table = PatchedSymbolTable()
 
-    def _set_type(self, node: ASTNode, type_kind: TypeKind):
-        if type_kind and type_kind != TypeKind.NOTYPE:
-            node.type = type_kind.name 
+    def _set_type(self, node: ASTNode, typ: PascalType):
+        if typ and typ is not NO_TYPE:
+            node.type = typ.name 
         else:
             node.type = "VOID"
 
@@ -37,82 +38,44 @@ class ASTDecorator(ASTAnalyzer):
         node.type = "VOID"
 
     # =========================================================================
-    # DECLARATIONS & PARAMETERS (NEW: Handle ParameterNode)
+    # DECLARATIONS & PARAMETERS
     # =========================================================================
 
-    def visit_VarDeclNode(self, node: VarDeclNode):
-        super().visit_VarDeclNode(node)
-        idx = self.symbol_table.lookup_local(node.var_name)
-        if idx > 0:
-            entry = self.symbol_table.get_entry(idx)
-            node.type = entry.type.name
-            node.symbol_entry = {
-                'tab_index': idx, 'lev': entry.lev, 
-                'adr': entry.adr, 'ref': entry.ref
-            }
-
-    def visit_ParameterNode(self, node: ParameterNode):
-        # 1. Jalankan logic asli (insert ke tabel simbol)
-        super().visit_ParameterNode(node)
-        
-        # 2. Decorate
-        # ASTConverter membuat ParameterNode per satu nama, jadi kita ambil names[0]
-        if node.names:
-            name = node.names[0]
-            # Lookup local karena parameter ada di scope prosedur itu sendiri
-            idx = self.symbol_table.lookup_local(name)
-            if idx > 0:
-                entry = self.symbol_table.get_entry(idx)
-                node.type = entry.type.name
-                node.symbol_entry = {
-                    'tab_index': idx,
-                    'lev': entry.lev,
-                    'adr': entry.adr,
-                    'ref': entry.ref
-                }
+    # Anotasi tab_index/lev/adr/ref untuk VarDeclNode, ParameterNode, VarNode, dan
+    # ProcedureCallNode dibuat ASTAnalyzer saat nama di-resolve (satu lookup per nama),
+    # jadi tidak perlu lookup ulang di sini.
 
     # =========================================================================
     # PROGRAM & BLOCKS
     # =========================================================================
 
     def visit_ProgramNode(self, node: ProgramNode):
-        super().visit_ProgramNode(node)
+        yield from super().visit_ProgramNode(node)
         node.type = "PROGRAM"
-        node.symbol_entry = {'lev': 0}
+        node.symbol_entry = SymbolAnnotation(lev=0)
 
     def visit_CompoundNode(self, node: CompoundNode):
         current_lev = self.symbol_table.current_level
         current_block_idx = self.symbol_table.bx
         node.type = "BLOCK"
-        node.symbol_entry = {'block_index': current_block_idx, 'lev': current_lev}
-        super().visit_CompoundNode(node)
+        node.symbol_entry = SymbolAnnotation(block_index=current_block_idx, lev=current_lev)
+        yield from super().visit_CompoundNode(node)
 
     # =========================================================================
     # VARIABLES & OPERATIONS
     # =========================================================================
 
-    def visit_VarNode(self, node: VarNode) -> TypeKind:
-        result_type = super().visit_VarNode(node)
-        idx = self.symbol_table.lookup(node.name)
-        if idx > 0:
-            entry = self.symbol_table.get_entry(idx)
-            node.symbol_entry = {
-                'tab_index': idx, 'lev': entry.lev, 
-                'adr': entry.adr, 'ref': entry.ref
-            }
-        return result_type
-
-    def visit_BinOpNode(self, node: BinOpNode) -> TypeKind:
-        result_type = super().visit_BinOpNode(node)
+    def visit_BinOpNode(self, node: BinOpNode) -> PascalType:
+        result_type = yield from super().visit_BinOpNode(node)
         self._set_type(node, result_type)
         return result_type
 
-    def visit_UnaryOpNode(self, node: UnaryOpNode) -> TypeKind:
-        result_type = super().visit_UnaryOpNode(node)
+    def visit_UnaryOpNode(self, node: UnaryOpNode) -> PascalType:
+        result_type = yield from super().visit_UnaryOpNode(node)
         self._set_type(node, result_type)
         return result_type
 
-    def visit_NumNode(self, node: NumNode) -> TypeKind:
+    def visit_NumNode(self, node: NumNode) -> PascalType:
         result_type = super().visit_NumNode(node)
         self._set_type(node, result_type)
         return result_type
@@ -122,42 +85,39 @@ class ASTDecorator(ASTAnalyzer):
     # =========================================================================
 
     def visit_AssignNode(self, node: AssignNode):
-        super().visit_AssignNode(node)
+        yield from super().visit_AssignNode(node)
         self._set_void(node)
 
     def visit_IfNode(self, node: IfNode):
-        super().visit_IfNode(node)
+        yield from super().visit_IfNode(node)
         node.type = "STATEMENT"
     
     def visit_ForNode(self, node: ForNode):
-        super().visit_ForNode(node)
+        yield from super().visit_ForNode(node)
         node.type = "STATEMENT"
 
     def visit_WhileNode(self, node: WhileNode):
-        super().visit_WhileNode(node)
+        yield from super().visit_WhileNode(node)
         node.type = "STATEMENT"
 
     def visit_ProcedureCallNode(self, node: ProcedureCallNode):
         # Jalankan logic asli (lookup nama prosedur)
-        super().visit_ProcedureCallNode(node)
+        yield from super().visit_ProcedureCallNode(node)
         
-        if node.proc_name in ['writeln', 'write', 'readln', 'read']:
+        if node.proc_name in BUILTIN_PROCEDURES:
              node.type = "PREDEFINED"
         else:
-            # Handle User Defined Procedure
-            idx = self.symbol_table.lookup(node.proc_name)
-            if idx > 0:
-                entry = self.symbol_table.get_entry(idx)
-                node.symbol_entry = {'tab_index': idx, 'lev': entry.lev}
-                if entry.obj == ObjectKind.FUNCTION:
-                    node.type = entry.type.name
-                else:
-                    self._set_void(node)
+            # Handle User Defined Procedure (sudah di-resolve dan dianotasi oleh analyzer)
+            entry = self.symbol_table.get_entry(node.symbol_entry.tab_index)
+            if entry.obj == ObjectKind.FUNCTION:
+                node.type = entry.type.name
+            else:
+                self._set_void(node)
             
             # [FIX] Force visit arguments agar VarNode di dalamnya ter-dekorasi
             # Analyzer asli kadang skip visit argumen user-defined procedure
             for arg in node.arguments:
-                self.visit(arg)
+                yield arg
 
     def generate_decorated_ast(self, root_node: ASTNode) -> ASTNode:
         self.visit(root_node)
@@ -1,11 +1,82 @@
 from dataclasses import dataclass, field, fields
-from typing import List, Optional, Any, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from lexical.token import Token 
 
-@dataclass
+# ===== Tabel Traversal per Kelas Node =====
+# Dipakai bersama oleh ASTAnalyzer/ASTDecorator, ASTPrinter, dan print AST dekorasi,
+# supaya introspeksi kelas (fields(), nama method) dilakukan sekali per kelas, bukan per node.
+
+# Field anotasi semantik (bukan data node)
+ANNOTATION_FIELDS = ('type', 'symbol_entry')
+# Field yang ditampilkan 'inline' di sebelah nama node pada print AST dekorasi
+INLINE_FIELDS = ('name', 'var_name', 'proc_name', 'const_name',
+                 'type_name', 'op', 'value', 'variable', 'field_name')
+
+_node_fields: Dict[type, Tuple[str, ...]] = {}
+_inline_fields: Dict[type, Tuple[str, ...]] = {}
+_child_fields: Dict[type, Tuple[str, ...]] = {}
+
+def node_fields(cls: type) -> Tuple[str, ...]:
+    """Nama field data kelas node (tanpa anotasi semantik), urut deklarasi."""
+    names = _node_fields.get(cls)
+    if names is None:
+        names = _node_fields[cls] = tuple(f.name for f in fields(cls) if f.name not in ANNOTATION_FIELDS)
+    return names
+
+def inline_fields(cls: type) -> Tuple[str, ...]:
+    """Field yang ditampilkan inline (ParameterNode juga menampilkan nama pertamanya)."""
+    names = _inline_fields.get(cls)
+    if names is None:
+        is_param = cls.__name__ == "ParameterNode"
+        names = _inline_fields[cls] = tuple(
+            name for name in node_fields(cls)
+            if name in INLINE_FIELDS or (is_param and name == "names")
+        )
+    return names
+
+def child_fields(cls: type) -> Tuple[str, ...]:
+    """Field yang mungkin berisi node anak pada print AST dekorasi."""
+    names = _child_fields.get(cls)
+    if names is None:
+        # Tipe VarDeclNode/ParameterNode sudah terlihat di anotasi, tidak dicetak sebagai anak
+        skip_type = cls.__name__ in ("VarDeclNode", "ParameterNode")
+        names = _child_fields[cls] = tuple(
+            name for name in node_fields(cls) if not (skip_type and name == "type_node")
+        )
+    return names
+
+class NodeDispatch(dict):
+    """
+    Tabel dispatch kelas node -> handler. Handler untuk kelas X adalah atribut
+    `<prefix>X` milik `owner` (misal visit_VarNode), atau `default` jika tidak ada.
+    Diisi saat kelas pertama kali ditemui, setelah itu hanya satu lookup dict per node.
+    """
+    def __init__(self, owner: Any, prefix: str, default: Callable):
+        super().__init__()
+        self.owner = owner
+        self.prefix = prefix
+        self.default = default
+
+    def __missing__(self, cls: type) -> Callable:
+        handler = self[cls] = getattr(self.owner, self.prefix + cls.__name__, self.default)
+        return handler
+
+@dataclass(slots=True)
+class SymbolAnnotation:
+    """
+    Anotasi simbol hasil dekorasi: index tab, level, alamat, dan ref (index atab/btab)
+    dari entry symbol table, atau index btab untuk blok. Field None tidak ditampilkan.
+    """
+    tab_index: Optional[int] = None
+    lev: Optional[int] = None
+    adr: Optional[int] = None
+    ref: Optional[int] = None
+    block_index: Optional[int] = None
+
+@dataclass(slots=True)
 class ASTNode:
     type: Optional[str] = field(default=None, init=False, repr=False)
-    symbol_entry: Optional[dict] = field(default=None, init=False, repr=False)
+    symbol_entry: Optional[SymbolAnnotation] = field(default=None, init=False, repr=False)
 
     def __str__(self):
         # return self._print_tree()
@@ -21,23 +92,16 @@ class ASTNode:
         di sebelah nama Node (misal: nama variabel, nilai angka, operator).
         """
         details = []
-        # List atribut yang ingin ditampilkan 'inline' (bukan sebagai child node)
-        important_attrs = ['name', 'var_name', 'proc_name', 'const_name', 
-                           'type_name', 'op', 'value', 'variable', 'field_name']
-        
-        for f in fields(self):
-            # Skip atribut internal/semantic
-            if f.name in ['type', 'symbol_entry', 'children']: 
-                continue
-            if self.__class__.__name__ == "ParameterNode" and f.name == "names":
-                if self.names:
-                    details.append(f"'{self.names[0]}'")
+        # Atribut yang ditampilkan 'inline' (bukan sebagai child node), lihat INLINE_FIELDS
+        for name in inline_fields(self.__class__):
+            val = getattr(self, name)
+            if name == "names":
+                if val:
+                    details.append(f"'{val[0]}'")
                 continue
-                
-            val = getattr(self, f.name)
             
-            # Jika atribut ada di list penting dan tipenya primitif (str/int/float/bool)
-            if f.name in important_attrs and isinstance(val, (str, int, float, bool)):
+            # Hanya jika tipenya primitif (str/int/float/bool)
+            if isinstance(val, (str, int, float, bool)):
                 # Khusus string, kasih tanda kutip biar jelas
                 if isinstance(val, str):
                     details.append(f"'{val}'")
@@ -57,28 +121,15 @@ class ASTNode:
             parts.append(f"type:{self.type}")
         
         # 2. Symbol Entry Info 
-        if self.symbol_entry and isinstance(self.symbol_entry, dict):
-            se = self.symbol_entry
-            # Key Map untuk tab_index, b_index, a_index (ref)
-            key_map = {
-                'tab_index': 't_idx', # tab index
-                'block_index': 'b_idx', # block index
-                'ref': 'a_idx',       # array index (ref di tab entry)
-                'lev': 'lev',
-                'adr': 'adr'
-            }
-            
-            # Prioritaskan urutan print agar rapi
-            priority_keys = ['tab_index', 'block_index', 'ref', 'lev', 'adr']
-            
-            for key in priority_keys:
-                if key in se:
-                    # Khusus ref/a_idx, hanya print jika nilainya > 0
-                    if key == 'ref' and se[key] == 0:
-                        continue
-                        
-                    label = key_map.get(key, key)
-                    parts.append(f"{label}:{se[key]}")
+        se = self.symbol_entry
+        if se is not None:
+            # Urutan print: t_idx (tab index), b_idx (block index), a_idx (ref di tab entry), lev, adr
+            if se.tab_index is not None: parts.append(f"t_idx:{se.tab_index}")
+            if se.block_index is not None: parts.append(f"b_idx:{se.block_index}")
+            # Khusus ref/a_idx, hanya print jika nilainya > 0
+            if se.ref: parts.append(f"a_idx:{se.ref}")
+            if se.lev is not None: parts.append(f"lev:{se.lev}")
+            if se.adr is not None: parts.append(f"adr:{se.adr}")
 
         if not parts:
             return ""
@@ -87,109 +138,113 @@ class ASTNode:
 
     def _print_ast_decorated(self, prefix="", is_last=True):
         """
-        Fungsi rekursif utama untuk mencetak AST yang sudah didekorasi.
+        Mencetak AST yang sudah didekorasi sebagai string (lihat write_ast_decorated).
+        """
+        lines = []
+        self.write_ast_decorated(lines.append, prefix, is_last)
+        return "".join(lines)
+
+    def write_ast_decorated(self, write: Callable[[str], Any], prefix="", is_last=True) -> None:
+        """
+        Menulis AST yang sudah didekorasi baris per baris ke `write` (misal sys.stdout.write).
+        Traversal memakai stack eksplisit, jadi kedalaman AST tidak dibatasi recursion limit.
         """
         # --- KONFIGURASI LEBAR KOLOM ---
         ALIGN_WIDTH = 40 
-        
-        # 1. Siapkan komponen visual
-        connector = "└─ " if is_last else "├─ "
-        
-        # 2. Ambil Nama Node
-        node_name = self.__class__.__name__.replace("Node", "")
-        
-        # 3. Ambil Detail Inline
-        inline = self._get_inline_details()
-        
-        # 4. Bangun Bagian Kiri (Tree Structure)
-        line_prefix = "" if prefix == "" else prefix + connector
-        left_part = f"{line_prefix}{node_name}{inline}"
-        
-        # 5. Ambil Anotasi (Kanan)
-        annotations = self._get_annotations()
-
-        # 6. Gabungkan dengan Alignment
-        if annotations:
-            # ljust akan menambahkan spasi di kanan sampai panjang string mencapai ALIGN_WIDTH
-            # Jika string lebih panjang dari ALIGN_WIDTH, panah akan terdorong otomatis (aman)
-            padded_left = left_part.ljust(ALIGN_WIDTH)
-            result = f"{padded_left}  →  {annotations}\n"
-        else:
-            # Jika tidak ada anotasi, tidak perlu panah
-            result = f"{left_part}\n"
-
-        # 7. Siapkan Children untuk Rekursi
-        children = []
-        for f in fields(self):
-            if f.name in ['type', 'symbol_entry']: continue
+
+        # Stack berisi (node, prefix, is_last); anak di-push terbalik agar keluar berurutan
+        stack = [(self, prefix, is_last)]
+        while stack:
+            node, prefix, is_last = stack.pop()
+
+            # 1. Siapkan komponen visual
+            connector = "└─ " if is_last else "├─ "
             
-            # Skip logic khusus
-            if f.name == "type_node":
-                if self.__class__.__name__ in ["VarDeclNode", "ParameterNode"]:
-                    continue
+            # 2. Ambil Nama Node
+            node_name = node.__class__.__name__.replace("Node", "")
             
-            val = getattr(self, f.name)
+            # 3. Ambil Detail Inline
+            inline = node._get_inline_details()
             
-            if isinstance(val, ASTNode):
-                children.append(val)
-            elif isinstance(val, list):
-                for item in val:
-                    if isinstance(item, ASTNode):
-                        children.append(item)
-
-        # 8. Rekursi ke setiap Child
-        child_prefix = prefix + ("   " if is_last else "│  ")
-        count = len(children)
-        
-        for i, child in enumerate(children):
-            is_last_child = (i == count - 1)
-            result += child._print_ast_decorated(child_prefix, is_last_child)
-
-        return result
+            # 4. Bangun Bagian Kiri (Tree Structure)
+            line_prefix = "" if prefix == "" else prefix + connector
+            left_part = f"{line_prefix}{node_name}{inline}"
+            
+            # 5. Ambil Anotasi (Kanan)
+            annotations = node._get_annotations()
+
+            # 6. Gabungkan dengan Alignment
+            if annotations:
+                # ljust akan menambahkan spasi di kanan sampai panjang string mencapai ALIGN_WIDTH
+                # Jika string lebih panjang dari ALIGN_WIDTH, panah akan terdorong otomatis (aman)
+                padded_left = left_part.ljust(ALIGN_WIDTH)
+                write(f"{padded_left}  →  {annotations}\n")
+            else:
+                # Jika tidak ada anotasi, tidak perlu panah
+                write(f"{left_part}\n")
+
+            # 7. Siapkan Children
+            children = []
+            for name in child_fields(node.__class__):
+                val = getattr(node, name)
+                
+                if isinstance(val, ASTNode):
+                    children.append(val)
+                elif isinstance(val, list):
+                    for item in val:
+                        if isinstance(item, ASTNode):
+                            children.append(item)
+
+            # 8. Push setiap Child
+            child_prefix = prefix + ("   " if is_last else "│  ")
+            count = len(children)
+            
+            for i in range(count - 1, -1, -1):
+                stack.append((children[i], child_prefix, i == count - 1))
     
-@dataclass
+@dataclass(slots=True)
 class ProgramNode(ASTNode):
     name: str
     declarations: List[ASTNode] = field(repr=False) 
     block: ASTNode = field(repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclNode(ASTNode):
     var_name: str
     type_node: 'TypeNode'
 
-@dataclass
+@dataclass(slots=True)
 class ConstDeclNode(ASTNode):
     const_name: str
     value: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class TypeDeclNode(ASTNode):
     type_name: str
     value: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class TypeNode(ASTNode):
     type_name: str
     def __repr__(self): return f"'{self.type_name}'"
     def __str__(self): return f"'{self.type_name}'"
 
-@dataclass
+@dataclass(slots=True)
 class ArrayTypeNode(ASTNode):
     lower: ASTNode
     upper: ASTNode
     element_type: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class RecordTypeNode(ASTNode):
     fields: List['VarDeclNode']
 
-@dataclass
+@dataclass(slots=True)
 class CompoundNode(ASTNode):
     children: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True)
 class AssignNode(ASTNode):
     target: ASTNode
     value: ASTNode    
@@ -197,28 +252,28 @@ class AssignNode(ASTNode):
         """Override untuk handle multi-line assignment"""
         return self._print_tree_multiline(prefix, is_last)
 
-@dataclass
+@dataclass(slots=True)
 class ProcedureCallNode(ASTNode):
     proc_name: str
     arguments: List[ASTNode]
 
-@dataclass
+@dataclass(slots=True)
 class IfNode(ASTNode):
     condition: ASTNode
     true_block: ASTNode
     else_block: Optional[ASTNode] = None
 
-@dataclass
+@dataclass(slots=True)
 class WhileNode(ASTNode):
     condition: ASTNode
     body: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class RepeatNode(ASTNode):
     body: List[ASTNode]
     condition: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class ForNode(ASTNode):
     variable: str
     start_expr: ASTNode
@@ -226,78 +281,78 @@ class ForNode(ASTNode):
     end_expr: ASTNode
     body: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class CaseElementNode(ASTNode):
     value: ASTNode
     statement: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class CaseNode(ASTNode):
     expr: ASTNode
     cases: List[CaseElementNode]
 
-@dataclass
+@dataclass(slots=True)
 class BinOpNode(ASTNode):
     op: str 
     left: ASTNode
     right: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOpNode(ASTNode):
     op: str
     expr: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class VarNode(ASTNode):
     name: str
     def __repr__(self): return f"Var('{self.name}')"
 
-@dataclass
+@dataclass(slots=True)
 class ArrayAccessNode(ASTNode):
     array: ASTNode
     index: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class FieldAccessNode(ASTNode):
     record: ASTNode
     field_name: str
 
-@dataclass
+@dataclass(slots=True)
 class NumNode(ASTNode):
     value: Union[int, float]
     def __repr__(self): return f"Num({self.value})"
 
-@dataclass
+@dataclass(slots=True)
 class StringNode(ASTNode):
     value: str
     def __repr__(self): return f"String({self.value})"
 
-@dataclass
+@dataclass(slots=True)
 class CharNode(ASTNode):
     value: str
 
-@dataclass
+@dataclass(slots=True)
 class BoolNode(ASTNode):
     value: bool
 
-@dataclass
+@dataclass(slots=True)
 class NoOpNode(ASTNode):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class ParameterNode(ASTNode):
     names: List[str]
     type_node: ASTNode
     is_ref: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class ProcedureDeclNode(ASTNode):
     name: str
     params: List[ParameterNode]
     local_vars: List[ASTNode]
     block: ASTNode
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDeclNode(ASTNode):
     name: str
     return_type: TypeNode
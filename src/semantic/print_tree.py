@@ -1,106 +1,132 @@
+from typing import Any, Callable
+
 from .ast_nodes import *
 
 class ASTPrinter:
+    def __init__(self):
+        # Kelas node -> method label/children, diisi sekali per kelas
+        self.labels = NodeDispatch(self, '_label_', self._label_default)
+        self.children = NodeDispatch(self, '_children_', self._children_default)
+
     def print(self, node):
         """Entry point untuk mencetak AST"""
-        return self._print_node(node, "", True)
-
-    def _print_node(self, node, prefix, is_last):
-        # 1. Dapatkan Label Node (Text Header)
-        label = self._get_label(node)
-        annot = self._get_annotation(node)
-        
-        connector = "\\-- " if is_last else "+-- "
-        if prefix == "": result = f"{label}{annot}\n"
-        else: result = f"{prefix}{connector}{label}{annot}\n"
-
-        # 2. Dapatkan Children (Virtual atau Real)
-        children_map = self._get_children(node)
-        
-        # 3. Print Children
-        child_prefix = prefix + ("    " if is_last else "|   ")
-        count = len(children_map)
-        
-        for i, (tag, child) in enumerate(children_map):
-            is_last_child = (i == count - 1)
+        lines = []
+        self.write(node, lines.append)
+        return "".join(lines)
+
+    def write(self, node, write: Callable[[str], Any]) -> None:
+        """Menulis AST baris per baris ke `write` (misal sys.stdout.write)."""
+        self._print_node(node, "", True, write)
+
+    def _print_node(self, node, prefix, is_last, write):
+        """
+        Traversal dengan stack eksplisit. Stack berisi (node, prefix, is_last), atau string
+        untuk baris tag virtual (Declarations / Block / ...); anak di-push terbalik.
+        """
+        stack = [(node, prefix, is_last)]
+        while stack:
+            entry = stack.pop()
+            if isinstance(entry, str):
+                write(entry)
+                continue
+            node, prefix, is_last = entry
+
+            # 1. Dapatkan Label Node (Text Header)
+            label = self._get_label(node)
+            annot = self._get_annotation(node)
             
-            if tag: # Virtual Node (Declarations / Block)
-                tag_conn = "\\-- " if is_last_child else "+-- "
-                result += f"{child_prefix}{tag_conn}{tag}\n"
-                virtual_prefix = child_prefix + ("    " if is_last_child else "|   ")
-                
-                # Logic Unwrap untuk Block -> CompoundNode
-                items = []
-                if (tag in ["Block", "Body"]) and isinstance(child, CompoundNode):
-                    items = child.children
-                elif isinstance(child, list):
-                    items = child
-                elif isinstance(child, ASTNode):
-                    items = [child]
-
-                for k, item in enumerate(items):
-                    is_last_item = (k == len(items) - 1)
-                    # Rekursi
-                    result += self._print_node(item, virtual_prefix, is_last_item)
-            else:
-                # Direct Child
-                result += self._print_node(child, child_prefix, is_last_child)
+            connector = "\\-- " if is_last else "+-- "
+            if prefix == "": write(f"{label}{annot}\n")
+            else: write(f"{prefix}{connector}{label}{annot}\n")
+
+            # 2. Dapatkan Children (Virtual atau Real)
+            children_map = self._get_children(node)
+            
+            # 3. Push Children (terbalik)
+            child_prefix = prefix + ("    " if is_last else "|   ")
+            count = len(children_map)
+            
+            for i in range(count - 1, -1, -1):
+                tag, child = children_map[i]
+                is_last_child = (i == count - 1)
                 
-        return result
+                if tag: # Virtual Node (Declarations / Block)
+                    virtual_prefix = child_prefix + ("    " if is_last_child else "|   ")
+                    
+                    # Logic Unwrap untuk Block -> CompoundNode
+                    items = []
+                    if (tag in ["Block", "Body"]) and isinstance(child, CompoundNode):
+                        items = child.children
+                    elif isinstance(child, list):
+                        items = child
+                    elif isinstance(child, ASTNode):
+                        items = [child]
+
+                    for k in range(len(items) - 1, -1, -1):
+                        stack.append((items[k], virtual_prefix, k == len(items) - 1))
+                    tag_conn = "\\-- " if is_last_child else "+-- "
+                    stack.append(f"{child_prefix}{tag_conn}{tag}\n")
+                else:
+                    # Direct Child
+                    stack.append((child, child_prefix, is_last_child))
 
     # --- HELPERS ---
 
     def _get_annotation(self, node) -> str:
         parts = []
         # Cek keberadaan atribut sebelum akses
-        if hasattr(node, 'symbol_entry') and node.symbol_entry and 'tab_index' in node.symbol_entry:
-            parts.append(f"idx:{node.symbol_entry['tab_index']}")
+        symbol_entry = getattr(node, 'symbol_entry', None)
+        if symbol_entry is not None and symbol_entry.tab_index is not None:
+            parts.append(f"idx:{symbol_entry.tab_index}")
         if hasattr(node, 'type') and node.type:
             parts.append(f"type:{node.type.lower()}")
         return " \t→ " + ", ".join(parts) if parts else ""
 
     def _get_label(self, node) -> str:
-        """Menentukan teks yang muncul di node"""
-        if isinstance(node, ProgramNode): return f"Program('{node.name}')"
-        
-        if isinstance(node, VarDeclNode):
-            t_name = getattr(node.type_node, 'type_name', 'unknown')
-            return f"VarDecl(name: '{node.var_name}', type: '{t_name}')"
-        
-        if isinstance(node, ConstDeclNode): return f"ConstDecl('{node.const_name}')"
-        if isinstance(node, TypeDeclNode): return f"TypeDecl('{node.type_name}')"
-        if isinstance(node, TypeNode): return f"Type('{node.type_name}')"
-        
-        if isinstance(node, ProcedureCallNode):
-            args = [self._compact(a) for a in node.arguments]
-            return f"ProcedureCall(name: '{node.proc_name}', args: [{', '.join(filter(None, args))}])"
-        
-        if isinstance(node, AssignNode):
-            target_str = self._compact(node.target) or "Target"
-            value_str = self._compact(node.value)
-            # Jika value kompleks (None), jangan tampilkan di label
-            if value_str:
-                return f"Assign(target: {target_str}, value: {value_str})"
-            else:
-                return f"Assign(target: {target_str}, value:"
-
-        if isinstance(node, BinOpNode): return f"BinOp('{node.op}')"
-        if isinstance(node, UnaryOpNode): return f"UnaryOp('{node.op}')"
-        if isinstance(node, VarNode): return f"Var('{node.name}')"
-        if isinstance(node, NumNode): return f"Num({node.value})"
-        if isinstance(node, StringNode): return f"String('{node.value}')"
-        
-        if isinstance(node, ParameterNode):
-            prefix = "VAR " if node.is_ref else ""
-            t = getattr(node.type_node, 'type_name', '?')
-            return f"Param({prefix}{','.join(node.names)}: {t})"
-        
-        if isinstance(node, ProcedureDeclNode): return f"ProcedureDecl('{node.name}')"
-        if isinstance(node, FunctionDeclNode): return f"FunctionDecl('{node.name}')"
-        if isinstance(node, ForNode): return f"For('{node.variable}')"
+        """Menentukan teks yang muncul di node (lihat method _label_NamaNode)"""
+        return self.labels[node.__class__](node)
 
+    def _label_default(self, node) -> str:
         return node.__class__.__name__.replace("Node", "")
 
+    def _label_ProgramNode(self, node) -> str: return f"Program('{node.name}')"
+
+    def _label_VarDeclNode(self, node) -> str:
+        t_name = getattr(node.type_node, 'type_name', 'unknown')
+        return f"VarDecl(name: '{node.var_name}', type: '{t_name}')"
+
+    def _label_ConstDeclNode(self, node) -> str: return f"ConstDecl('{node.const_name}')"
+    def _label_TypeDeclNode(self, node) -> str: return f"TypeDecl('{node.type_name}')"
+    def _label_TypeNode(self, node) -> str: return f"Type('{node.type_name}')"
+
+    def _label_ProcedureCallNode(self, node) -> str:
+        args = [self._compact(a) for a in node.arguments]
+        return f"ProcedureCall(name: '{node.proc_name}', args: [{', '.join(filter(None, args))}])"
+
+    def _label_AssignNode(self, node) -> str:
+        target_str = self._compact(node.target) or "Target"
+        value_str = self._compact(node.value)
+        # Jika value kompleks (None), jangan tampilkan di label
+        if value_str:
+            return f"Assign(target: {target_str}, value: {value_str})"
+        else:
+            return f"Assign(target: {target_str}, value:"
+
+    def _label_BinOpNode(self, node) -> str: return f"BinOp('{node.op}')"
+    def _label_UnaryOpNode(self, node) -> str: return f"UnaryOp('{node.op}')"
+    def _label_VarNode(self, node) -> str: return f"Var('{node.name}')"
+    def _label_NumNode(self, node) -> str: return f"Num({node.value})"
+    def _label_StringNode(self, node) -> str: return f"String('{node.value}')"
+
+    def _label_ParameterNode(self, node) -> str:
+        prefix = "VAR " if node.is_ref else ""
+        t = getattr(node.type_node, 'type_name', '?')
+        return f"Param({prefix}{','.join(node.names)}: {t})"
+
+    def _label_ProcedureDeclNode(self, node) -> str: return f"ProcedureDecl('{node.name}')"
+    def _label_FunctionDeclNode(self, node) -> str: return f"FunctionDecl('{node.name}')"
+    def _label_ForNode(self, node) -> str: return f"For('{node.variable}')"
+
     def _compact(self, node):
         """Return compact string untuk simple nodes, None untuk complex nodes"""
         if node is None: return None
@@ -113,76 +139,65 @@ class ASTPrinter:
         return None
 
     def _get_children(self, node):
-        """Menentukan anak mana yang akan dicetak dan grouping-nya"""
+        """Menentukan anak mana yang akan dicetak dan grouping-nya (lihat method _children_NamaNode)"""
+        return self.children[node.__class__](node)
+
+    def _children_default(self, node):
+        return []
+
+    def _children_ProgramNode(self, node):
         children = []
-        
-        if isinstance(node, ProgramNode):
-            if node.declarations: children.append(("Declarations", node.declarations))
-            children.append(("Block", node.block))
-            return children
-
-        if isinstance(node, (ProcedureDeclNode, FunctionDeclNode)):
-            params = getattr(node, 'params', [])
-            decls = getattr(node, 'declarations', [])
-            body = getattr(node, 'body', None) or getattr(node, 'block', None)
-
-            if params: children.append(("Params", params))
-            if decls: children.append(("Declarations", decls))
-            if body: children.append(("Body", body))
-            return children
-
-        if isinstance(node, AssignNode):
-            # Jika value sudah di-compact di header, jangan tampilkan children
-            if self._compact(node.value):
-                return []
-            # Jika value kompleks, tampilkan hanya value (target sudah di header)
-            children.append((None, node.value))
-            return children
-        
-        elif isinstance(node, BinOpNode):
-            children.append((None, node.left))
-            children.append((None, node.right))
-            return children
-            
-        elif isinstance(node, UnaryOpNode):
-            children.append((None, node.expr))
-            return children
-            
-        elif isinstance(node, IfNode):
-            children.append((None, node.condition))
-            children.append((None, node.true_block))
-            if node.else_block: children.append((None, node.else_block))
-            return children
-            
-        elif isinstance(node, WhileNode):
-            children.append((None, node.condition))
-            children.append((None, node.body))
-            return children
-            
-        elif isinstance(node, ForNode):
-            children.append((None, node.start_expr))
-            children.append((None, node.end_expr))
-            children.append((None, node.body))
-            return children
-
-        elif isinstance(node, CompoundNode):
-            for c in node.children:
-                children.append((None, c))
-            return children
-
-        elif isinstance(node, ArrayAccessNode):
-            children.append((None, node.array))
-            children.append((None, node.index))
-            return children
-
-        elif isinstance(node, ProcedureCallNode):
-            # Jika semua args sudah di-compact di header, jangan tampilkan children
-            all_compact = all(self._compact(arg) for arg in node.arguments)
-            if all_compact:
-                return []
-            # Jika ada arg kompleks, tampilkan semuanya
-            for arg in node.arguments:
-                children.append((None, arg))
-            return children
-
-        return children
\ No newline at end of file
+        if node.declarations: children.append(("Declarations", node.declarations))
+        children.append(("Block", node.block))
+        return children
+
+    def _children_ProcedureDeclNode(self, node):
+        children = []
+        params = getattr(node, 'params', [])
+        decls = getattr(node, 'declarations', [])
+        body = getattr(node, 'body', None) or getattr(node, 'block', None)
+
+        if params: children.append(("Params", params))
+        if decls: children.append(("Declarations", decls))
+        if body: children.append(("Body", body))
+        return children
+
+    _children_FunctionDeclNode = _children_ProcedureDeclNode
+
+    def _children_AssignNode(self, node):
+        # Jika value sudah di-compact di header, jangan tampilkan children
+        if self._compact(node.value):
+            return []
+        # Jika value kompleks, tampilkan hanya value (target sudah di header)
+        return [(None, node.value)]
+
+    def _children_BinOpNode(self, node):
+        return [(None, node.left), (None, node.right)]
+
+    def _children_UnaryOpNode(self, node):
+        return [(None, node.expr)]
+
+    def _children_IfNode(self, node):
+        children = [(None, node.condition), (None, node.true_block)]
+        if node.else_block: children.append((None, node.else_block))
+        return children
+
+    def _children_WhileNode(self, node):
+        return [(None, node.condition), (None, node.body)]
+
+    def _children_ForNode(self, node):
+        return [(None, node.start_expr), (None, node.end_expr), (None, node.body)]
+
+    def _children_CompoundNode(self, node):
+        return [(None, c) for c in node.children]
+
+    def _children_ArrayAccessNode(self, node):
+        return [(None, node.array), (None, node.index)]
+
+    def _children_ProcedureCallNode(self, node):
+        # Jika semua args sudah di-compact di header, jangan tampilkan children
+        all_compact = all(self._compact(arg) for arg in node.arguments)
+        if all_compact:
+            return []
+        # Jika ada arg kompleks, tampilkan semuanya
+        return [(None, arg) for arg in node.arguments]
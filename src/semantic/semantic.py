@@ -5,6 +5,7 @@ from .ast_decorator import ASTDecorator
 from .print_tree import ASTPrinter
 from syntax.parsetree import Node
 
+import sys
 from typing import Tuple
 
 class SemanticError(Exception):
@@ -26,15 +27,23 @@ class SemanticAnalyzer:
         self.converter = ASTConverter()
         self.analyzer = ASTDecorator()
     
-    def analyze(self, parse_tree:Node, debug:bool=False) -> Tuple[ASTNode, SymbolTable, ASTNode]:
+    def analyze(self, parse_tree:Node|ASTNode, debug:bool=False) -> Tuple[ASTNode, SymbolTable, ASTNode]:
+        """
+        `parse_tree` boleh berupa parse tree dari SyntaxAnalyzer, atau AST yang sudah
+        dibangun saat parsing (SyntaxAnalyzer(build_ast=True)) sehingga konversi dilewati.
+        """
         try:
-            # Jalankan AST Converter
-            converter = ASTConverter()
-            ast = converter.convert(parse_tree)
+            # Jalankan AST Converter (kecuali AST sudah dibangun oleh parser)
+            if isinstance(parse_tree, ASTNode):
+                ast = parse_tree
+            else:
+                converter = ASTConverter()
+                ast = converter.convert(parse_tree)
             if debug :
                 print("\n[DEBUG] Abstract Syntax Tree (AST)")
                 ast_printer = ASTPrinter()
-                print(ast_printer.print(ast))
+                ast_printer.write(ast, sys.stdout.write)
+                print()
         
             # Jalankan Analyzer
             analyzer = ASTDecorator()
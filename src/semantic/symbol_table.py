@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum
 
 class ObjectKind(Enum):
@@ -21,6 +21,86 @@ class TypeKind(Enum):
     REAL = 4
     ARRAY = 5
     STRING = 6
+    RECORD = 7
+
+@dataclass(frozen=True, slots=True, eq=False)
+class PascalType:
+    """
+    Tipe struktural hasil intern TypeTable: setiap tipe yang strukturnya berbeda hanya ada
+    satu objek, jadi kesamaan tipe cukup dicek dengan `is`. Tipe dasar hanya punya `kind`;
+    tipe array menyimpan tipe indeks, batas, dan tipe elemennya. ARRAY tanpa elemen berarti
+    struktur array-nya tidak diketahui. Tipe record menyimpan (nama, tipe) setiap field
+    secara berurutan.
+    """
+    kind: TypeKind
+    index: Optional["PascalType"] = None
+    low: int = 0
+    high: int = 0
+    element: Optional["PascalType"] = None
+    fields: Tuple[Tuple[str, "PascalType"], ...] = ()
+
+    @property
+    def name(self) -> str:
+        return self.kind.name
+
+    def field(self, name: str) -> Optional["PascalType"]:
+        """Tipe field `name` dari tipe record, None jika tidak ada."""
+        for field_name, typ in self.fields:
+            if field_name == name:
+                return typ
+        return None
+
+    def __repr__(self):
+        if self.kind is TypeKind.RECORD:
+            return "RECORD(" + "; ".join(f"{name}: {typ!r}" for name, typ in self.fields) + ")"
+        if self.element is None:
+            return self.kind.name
+        return f"ARRAY[{self.low}..{self.high}] OF {self.element!r}"
+
+# Tipe dasar (satu objek per TypeKind, dipakai bersama semua TypeTable)
+BASIC_TYPES: Dict[TypeKind, PascalType] = {kind: PascalType(kind) for kind in TypeKind}
+NO_TYPE = BASIC_TYPES[TypeKind.NOTYPE]
+INTEGER_TYPE = BASIC_TYPES[TypeKind.INTEGER]
+BOOLEAN_TYPE = BASIC_TYPES[TypeKind.BOOLEAN]
+CHAR_TYPE = BASIC_TYPES[TypeKind.CHAR]
+REAL_TYPE = BASIC_TYPES[TypeKind.REAL]
+STRING_TYPE = BASIC_TYPES[TypeKind.STRING]
+
+class TypeTable:
+    """Tabel intern PascalType: key struktural -> satu-satunya objek tipe dengan struktur itu."""
+    def __init__(self):
+        self.types: Dict[Tuple, PascalType] = {(kind,): typ for kind, typ in BASIC_TYPES.items()}
+
+    @staticmethod
+    def basic(kind: TypeKind) -> Optional[PascalType]:
+        return BASIC_TYPES.get(kind)
+
+    def array(self, index: PascalType, low: int, high: int, element: PascalType) -> PascalType:
+        # index/element sudah di-intern, jadi identitasnya cukup sebagai bagian key
+        key = (TypeKind.ARRAY, index, low, high, element)
+        typ = self.types.get(key)
+        if typ is None:
+            typ = self.types[key] = PascalType(TypeKind.ARRAY, index, low, high, element)
+        return typ
+
+    def record(self, fields: Tuple[Tuple[str, PascalType], ...]) -> PascalType:
+        # Tipe field sudah di-intern, jadi (nama, tipe) berurutan cukup sebagai key
+        key = (TypeKind.RECORD, fields)
+        typ = self.types.get(key)
+        if typ is None:
+            typ = self.types[key] = PascalType(TypeKind.RECORD, fields=fields)
+        return typ
+
+    @staticmethod
+    def size_of(typ: Optional[PascalType]) -> int:
+        """Ukuran tipe dalam unit stack (tipe dasar 1, array/record dari elemen/field-nya)."""
+        if typ is None or typ.kind is TypeKind.NOTYPE:
+            return 0
+        if typ.kind is TypeKind.RECORD:
+            return sum(TypeTable.size_of(field) for _, field in typ.fields)
+        if typ.kind is TypeKind.ARRAY:
+            return (typ.high - typ.low + 1) * TypeTable.size_of(typ.element) if typ.element is not None else 0
+        return 1
 
 @dataclass
 class TabEntry:
@@ -99,7 +179,15 @@ class SymbolTable:
     def __init__(self):
         self.tab: List[TabEntry] = [TabEntry(identifier="__DUMMY__")]  # index 0 dummy
         self.atab: List[ATabEntry] = [ATabEntry()]  # index 0 dummy
+        # Tipe struktural setiap entry atab (paralel dengan atab), lihat type_of
+        self.types = TypeTable()
+        self.array_types: List[Optional[PascalType]] = [None]
+        # Tipe record yang dirujuk ref entry bertipe RECORD (index 0 dummy), lihat add_record_type
+        self.record_types: List[Optional[PascalType]] = [None]
+        self.record_refs: Dict[PascalType, int] = {}
         self.btab: List[BTabEntry] = [BTabEntry()]  # index 0 dummy
+        # Index per block (paralel dengan btab): nama -> index tab terakhir di rantai link block itu
+        self.scope_index: List[Dict[str, int]] = [{}]
 
         self.display: List[int] = [0] * 20 # Display untuk lexical levels
         self.current_level: int = 0  # Level lexical saat ini
@@ -230,6 +318,7 @@ class SymbolTable:
             
             # Update last pointer
             self.btab[btab_idx].last = current_idx
+            self.scope_index[btab_idx][name] = current_idx
         return current_idx
 
     def add_array_type(self, xtyp: TypeKind, etyp: TypeKind, eref: int, low: int, high: int) -> int:
@@ -248,6 +337,8 @@ class SymbolTable:
             # eref is 1-based index to atab
             if eref > 0 and eref < len(self.atab):
                 elsz = self.atab[eref].size
+        elif etyp == TypeKind.RECORD:
+            elsz = TypeTable.size_of(self.structural_type(etyp, eref))
         
         # 2. Hitung Total Size
         # Size = jumlah elemen * ukuran per elemen
@@ -266,8 +357,24 @@ class SymbolTable:
             size=total_size
         )
         self.atab.append(new_entry)
+
+        element = self.structural_type(etyp, eref)
+        self.array_types.append(self.types.array(self.types.basic(xtyp), low, high, element))
         
         return self.ax
+
+    def add_record_type(self, fields: List[Tuple[str, PascalType]]) -> int:
+        """
+        Mendaftarkan tipe record (field berurutan, tipe sudah di-intern).
+        Returns: ref untuk entry bertipe RECORD (tipe dengan struktur sama mendapat ref yang sama)
+        """
+        record = self.types.record(tuple(fields))
+        ref = self.record_refs.get(record)
+        if ref is None:
+            ref = self.record_refs[record] = len(self.record_types)
+            self.record_types.append(record)
+        return ref
+
     def add_variable(self, name:str, type_kind: TypeKind, ref: int = 0):
         """
         Menambah variabel ke scope saat ini.
@@ -294,6 +401,8 @@ class SymbolTable:
                 size = self.atab[ref].size
             else:
                 size = 0
+        elif type_kind == TypeKind.RECORD:
+            size = TypeTable.size_of(self.structural_type(type_kind, ref))
 
         current_adr = self.btab[current_btab_idx].vsze
         idx = self.enter(
@@ -339,6 +448,7 @@ class SymbolTable:
         # Buat entry block baru
         self.bx += 1
         self.btab.append(BTabEntry(last=0, lpar=0, psze=0, vsze=0))
+        self.scope_index.append({})
 
         # Update display
         if self.current_level >= len(self.display):
@@ -349,9 +459,11 @@ class SymbolTable:
     def exit_scope(self):
         """
         Keluar dari scope saat ini.
-        Cuma menurunkan level lexical dan reset display
+        Cuma menurunkan level lexical dan reset display. Block yang ditutup tidak bisa
+        dicari lagi, jadi index namanya dibuang (tab/btab-nya tetap untuk code generation).
         """
         if self.current_level > 0:
+            self.scope_index[self.display[self.current_level]].clear()
             self.display[self.current_level] = 0 # Reset
             self.current_level -= 1
 
@@ -360,18 +472,15 @@ class SymbolTable:
         Implementasi dari aturan Static Scoping dan Shadowing.
         Mencari identifier mulai dari scope terdalam ke global.
         Mengembalikan index di tab, atau 0 jika tidak ditemukan.
+        Hasilnya sama dengan menelusuri rantai link setiap block (entry terbaru dengan
+        nama itu), tapi lewat scope_index sehingga O(kedalaman scope).
         args:
             name (str): Nama identifier yang dicari
         """
         for lev in range(self.current_level, -1, -1):
-            btab_idx = self.display[lev]
-            curr = self.btab[btab_idx].last # mulai dari identifier terakhir di block ini
-            # Transverse linked list (field 'link')
-            while curr > 0: # 0 dianggap null/sentinel
-                entry = self.tab[curr]
-                if entry.identifier == name:
-                    return curr # Ditemukan
-                curr = entry.link
+            idx = self.scope_index[self.display[lev]].get(name)
+            if idx:
+                return idx # Ditemukan
 
         return 0  # Tidak ditemukan
 
@@ -384,15 +493,21 @@ class SymbolTable:
         if btab_idx >= len(self.btab):
             return 0
     
-        curr = self.btab[btab_idx].last
-        while curr > 0 and curr < len(self.tab):
-            entry = self.tab[curr]
-            # IMPORTANT: Case-sensitive comparison
-            if entry.identifier == name:  # Jangan pakai .upper()
-                return curr
-            curr = entry.link
-        return 0
+        # IMPORTANT: Case-sensitive (key dict), jangan pakai .upper()
+        return self.scope_index[btab_idx].get(name, 0)
     
+    def type_of(self, entry: TabEntry) -> Optional[PascalType]:
+        """Tipe struktural (ter-intern) dari entry tab."""
+        return self.structural_type(entry.type, entry.ref)
+
+    def structural_type(self, type_kind: TypeKind, ref: int) -> Optional[PascalType]:
+        """Tipe struktural dari pasangan (type, ref): array lewat atab, record lewat record_types, selain itu tipe dasar."""
+        if type_kind == TypeKind.ARRAY and 0 < ref < len(self.array_types):
+            return self.array_types[ref]
+        if type_kind == TypeKind.RECORD and 0 < ref < len(self.record_types):
+            return self.record_types[ref]
+        return self.types.basic(type_kind)
+
     def get_entry(self, idx: int) -> Optional[TabEntry]:
         """
         Safety Wrapper biar ga crash kalo indexnya invalid (ada boundary check)
@@ -1,31 +1,109 @@
-from typing import Any, List, Dict, Callable
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, List, Dict, Callable, Tuple
 
-from lexical.token import Token, TokenType, Lexeme
-from syntax.parsetree import NonTerminal, Node
+from lexical.token import Token, TokenType, Lexeme, TokenBuffer, TokenEdit, TokenStream
+from syntax.parsetree import NonTerminal, Node, CompactNode
 
 # ===== Class for CFG =====
 
 class Epsilon:
     pass
 
-class CFG:
-    production_rules: Dict[NonTerminal, Callable[[], Node|None]] # Diubah
-    tokens: List[Token]
-    currentTokenID = 0
+# Slot penanda commit di alternatif terkompilasi (lihat CFG.addRules)
+COMMIT = -2
+
+@dataclass(frozen=True)
+class Grammar:
+    """
+    Grammar terkompilasi milik CFG. Tidak pernah diubah setelah dibuat: addRules, setActions,
+    setGenerated, dan buildPredictTable memasang Grammar baru (dataclasses.replace), jadi
+    parse yang sedang berjalan di thread lain tetap melihat grammar yang konsisten.
+    """
+    # Aturan mentah dan alternatifnya yang terkompilasi: setiap simbol dipasangkan dengan
+    # slot terminalnya (-1 untuk non-terminal/epsilon, COMMIT untuk non-terminal pertama dari
+    # sisa alternatif yang tidak mungkin gagal, lihat CFG.addRules)
+    rules: Dict[NonTerminal, List[List[NonTerminal|Token|TokenType|Epsilon]]] = field(default_factory=dict)
+    compiled_rules: Dict[NonTerminal, List[List[Tuple[Any, int]]]] = field(default_factory=dict)
+    # Semua terminal (Token/TokenType) di grammar, index-nya adalah 'slot' terminal
+    terminals: Tuple[Token|TokenType, ...] = ()
+    terminal_slots: Dict[Token|TokenType, int] = field(default_factory=dict)
+    # PREDIKTIF: kelas lookahead dan baris tabel prediksi per non-terminal (None = belum dibangun)
+    lookahead_keys: List[Token|TokenType|None]|None = None
+    predict_rows: Dict[NonTerminal, List[Tuple[List[Any], Tuple[Token|TokenType, ...]]]]|None = None
+    # AKSI SEMANTIK: non-terminal -> fungsi(list nilai anak) -> nilai, None = bangun parse tree
+    actions: Dict[NonTerminal, Callable[[List[Any]], Any]]|None = None
+    # GENERATED: modul parser hasil syntax.codegen (None = interpretasi aturan oleh CFG)
+    generated: Any = None
+
+class ParseState:
+    """
+    State satu parse: token, posisi, error terjauh, memo packrat, dan id terminal/kelas
+    lookahead pada buffer yang sedang di-parse. Setiap parse memakai ParseState sendiri
+    (lihat CFG.parseToken), jadi satu CFG bisa menjalankan beberapa parse bersamaan.
+    """
+    tokens: TokenBuffer
+    currentTokenID: int
     # UNTUK ERROR REPORTING
     max_error_info: Dict[str, Any]
+    # False selama parse cepat (two_phase): kegagalan terminal tidak dicatat
+    track_errors: bool
+    # PACKRAT: (non-terminal, token index) -> (node | None jika gagal, token index setelahnya)
+    memo: "OrderedDict[Tuple[NonTerminal, int], Tuple[Node|None, int]]"
+    # Id kind/lexeme tiap slot terminal di buffer ini (-1 = tidak ada, None = bebas)
+    terminal_kinds: List[int]
+    terminal_lexemes: List[int|None]
+    # PREDIKTIF: kelas lookahead per token (lookahead_keys None jika lookahead tidak dipakai)
+    lookahead_keys: List[Token|TokenType|None]|None
+    lookahead: array
+    # Edit yang menghasilkan tokens dari buffer parse sebelumnya (CFG.reparseToken), None jika parse baru
+    edit: TokenEdit|None
+    # INCREMENTAL: per posisi token, non-terminal -> (node | None, panjang, jangkauan) relatif
+    # terhadap posisi itu; jangkauan = jumlah token yang dibaca (termasuk lookahead yang gagal)
+    columns: List[Dict[NonTerminal, Tuple[Node|None, int, int]]]
+    reach: array
+    # Posisi kolom yang jangkauannya > CFG.LONG_REACH, agar pencarian hasil yang terdampak edit
+    # tidak perlu memeriksa semua kolom di depan edit
+    long_reach: set
+    # True selama parse diagnostik mode incremental (parseIncremental memakai parseMemo)
+    diagnostic: bool
+    # Data per parse milik native rule dan profiler, di-key oleh pemiliknya
+    natives: Dict[Any, Any]
+    # STREAM: posisi awal non-terminal yang masih punya alternatif untuk dicoba (urut dari yang
+    # terluar), dicatat engine agar token sebelumnya bisa dibuang (None = tidak dicatat)
+    backtrack: List[int]|None = None
+    # Index absolut dari tokens.kinds[0] dan lookahead[0] (lihat StreamState)
+    base: int = 0
 
-    def __init__(self):
-        self.production_rules = {}
+    def __init__(self, tokens: TokenBuffer):
+        self.tokens = tokens
+        self.track_errors = True
+        self.memo = OrderedDict()
+        self.terminal_kinds = []
+        self.terminal_lexemes = []
+        self.lookahead_keys = None
+        self.lookahead = array('i')
+        self.edit = None
+        self.columns = []
+        self.reach = array('i')
+        self.long_reach = set()
+        self.diagnostic = False
+        self.natives = {}
+        self.resetState()
+
+    def resetState(self) -> None:
+        """Reset posisi token dan pelacak error sebelum parse baru."""
         self.currentTokenID = 0
-        
+
         # Inisialisasi pelacak error
         self.max_error_info = {
             'max_id': -1,      # Token ID terjauh yang gagal
             'expected': set(), # Apa yang diharapkan di posisi itu (bisa banyak)
             'found': None      # Token apa yang ditemukan di posisi itu
         }
-    
+
     # GET TOKEN
     def nextToken(self) -> None:
         self.currentTokenID += 1
@@ -33,117 +111,782 @@ class CFG:
         self.currentTokenID -= 1
     def currentToken(self) -> Token:
         # Tambahkan penjaga agar tidak error di akhir token
-        if self.currentTokenID >= len(self.tokens):
+        if self.currentTokenID >= len(self.tokens) and not self.fillTokens(self.currentTokenID):
             return Token(TokenType("EOF"), Lexeme("EOF")) # Token Penjaga
         return self.tokens[self.currentTokenID]
 
+    # TERMINAL MATCHING
+    def bindTerminals(self, terminals: Tuple[Token|TokenType, ...]) -> None:
+        """Menerjemahkan setiap slot terminal ke id kind/lexeme pada buffer token ini."""
+        self.terminal_kinds = []
+        self.terminal_lexemes = []
+        for symbol in terminals:
+            if isinstance(symbol, Token):
+                self.terminal_kinds.append(self.tokens.kind_id(symbol.token_type))
+                self.terminal_lexemes.append(self.tokens.lexeme_id(symbol.lexeme))
+            else:
+                self.terminal_kinds.append(self.tokens.kind_id(symbol))
+                self.terminal_lexemes.append(None)
+
+    def matchTerminal(self, slot: int) -> bool:
+        """Cek token saat ini terhadap terminal di `slot` dengan membandingkan id integer."""
+        index = self.currentTokenID
+        if index >= len(self.tokens.kinds) and not self.fillTokens(index):
+            return False
+        if self.tokens.kinds[index] != self.terminal_kinds[slot]:
+            return False
+        lexeme = self.terminal_lexemes[slot]
+        return lexeme is None or self.tokens.lexemes[index] == lexeme
+
+    def fillTokens(self, index: int) -> bool:
+        """
+        Dipanggil saat parser membaca melewati token terakhir yang tersedia. Untuk TokenStream,
+        token di-lex sampai `index` dan lookahead prediktif diperluas ke token baru.
+        False jika input habis sebelum `index`.
+        """
+        old_len = len(self.tokens)
+        available = self.tokens.fill(index)
+        if self.lookahead_keys is not None and len(self.tokens) > old_len:
+            self.edit = TokenEdit(old_len, old_len, len(self.tokens))
+            try:
+                self.bindLookahead(self.lookahead_keys)
+            finally:
+                self.edit = None
+        return available
+
+    def bindLookahead(self, lookahead_keys: List[Token|TokenType|None]) -> None:
+        """
+        Menghitung kelas lookahead (index di lookahead_keys) untuk setiap token di buffer.
+        Setelah edit (self.edit) hanya token yang berubah yang dihitung ulang.
+        """
+        self.lookahead_keys = lookahead_keys
+        kind_class = {}
+        token_class = {}
+        for class_id, key in enumerate(lookahead_keys):
+            if isinstance(key, Token):
+                kind_id = self.tokens.kind_id(key.token_type)
+                lexeme_id = self.tokens.lexeme_id(key.lexeme)
+                if kind_id >= 0 and lexeme_id >= 0:
+                    token_class[(kind_id, lexeme_id)] = class_id
+            elif key is not None and self.tokens.kind_id(key) >= 0:
+                kind_class[self.tokens.kind_id(key)] = class_id
+        edit = self.edit
+        start, end = (0, len(self.tokens)) if edit is None else (edit.start, edit.new_end)
+        lookahead = array('i', (
+            token_class.get((kind, lexeme), kind_class.get(kind, 0))
+            for kind, lexeme in zip(self.tokens.kinds[start:end], self.tokens.lexemes[start:end])
+        ))
+        if edit is None:
+            self.lookahead = lookahead
+        else:
+            self.lookahead[edit.start:edit.old_end] = lookahead
+
     # ERROR REPORTING
-    def record_error(self, expected_symbol: Token|TokenType, found_token: Token):
+    def record_error(self, expected_symbol: Token|TokenType, found_token: Token|None = None):
         """Mencatat kegagalan jika ini adalah yang 'terjauh'."""
         current_fail_id = self.currentTokenID
-        
+
         # Menemukan error di posisi yang LEBIH JAUH.
         if current_fail_id > self.max_error_info['max_id']:
             self.max_error_info['max_id'] = current_fail_id
             self.max_error_info['expected'] = {expected_symbol}
-            self.max_error_info['found'] = found_token
-        
+            self.max_error_info['found'] = found_token if found_token is not None else self.currentToken()
+
         # Menemukan error di posisi terjauh yang SAMA.
         elif current_fail_id == self.max_error_info['max_id']:
             # Tambahkan 'symbol' ini sebagai ekspektasi alternatif (contoh: expect ID or NUMBER)
             self.max_error_info['expected'].add(expected_symbol)
 
+class StreamState(ParseState):
+    """
+    ParseState untuk TokenStream yang di-lex selama parse. Setiap kali token baru di-lex,
+    token sebelum low-water mark dibuang (TokenStream.trim): posisi awal non-terminal tertua
+    yang masih punya alternatif untuk dicoba (backtrack), atau posisi saat ini. Parser tidak
+    pernah kembali ke sebelum posisi itu, dan hasil memo packrat tidak menyimpan index token,
+    jadi jumlah token yang disimpan hanya sepanjang rentang backtrack yang masih hidup.
+    Array per token (kinds, lexemes, lookahead) di-index relatif terhadap base.
+    """
+    tokens: TokenStream
+
+    def __init__(self, tokens: TokenStream):
+        super().__init__(tokens)
+        self.backtrack = []
+        self.base = tokens.base
+
+    def lowWaterMark(self) -> int:
+        """Posisi token terawal yang masih mungkin dibaca parser."""
+        return self.backtrack[0] if self.backtrack else self.currentTokenID
+
+    def matchTerminal(self, slot: int) -> bool:
+        if self.currentTokenID - self.base >= len(self.tokens.kinds) and not self.fillTokens(self.currentTokenID):
+            return False
+        index = self.currentTokenID - self.base
+        if self.tokens.kinds[index] != self.terminal_kinds[slot]:
+            return False
+        lexeme = self.terminal_lexemes[slot]
+        return lexeme is None or self.tokens.lexemes[index] == lexeme
+
+    def fillTokens(self, index: int) -> bool:
+        count = self.tokens.trim(min(self.lowWaterMark(), index)) - self.base
+        if count > 0:
+            self.base += count
+            if self.lookahead_keys is not None:
+                del self.lookahead[:count]
+        old_len = len(self.tokens.kinds)
+        available = self.tokens.fill(index)
+        if self.lookahead_keys is not None and len(self.tokens.kinds) > old_len:
+            # Edit relatif terhadap base, sama seperti array kolomnya
+            self.edit = TokenEdit(old_len, old_len, len(self.tokens.kinds))
+            try:
+                self.bindLookahead(self.lookahead_keys)
+            finally:
+                self.edit = None
+        return available
+
+class CFG:
+    # Grammar terkompilasi (tidak berubah selama parse, dipakai bersama semua parse)
+    grammar: Grammar
+    # Aturan yang dijalankan engine: closure execute_rules, native rule, atau versi berinstrumen
+    production_rules: Dict[NonTerminal, Callable[[ParseState], Node|None]]
+    # NATIVE: non-terminal yang di-parse oleh fungsi Python (misal syntax.expression), bukan oleh aturan
+    native_rules: Dict[NonTerminal, Callable[[ParseState], Node|None]]
+    native_binders: List[Callable[[ParseState], None]]
+    # COMPACT: tuple skipped/collapsed dan subtree kosong yang di-intern agar dipakai bersama
+    # antar CompactNode (hanya bertambah, aman dipakai parse bersamaan)
+    shapes: Dict[tuple, tuple]
+    empty_nodes: Dict[NonTerminal|Tuple[NonTerminal, tuple], CompactNode]
+    LONG_REACH = 64
+
+    def __init__(self, packrat:bool=False, memo_limit:int=200000, predictive:bool=False, iterative:bool=False,
+                 compact:bool=False, two_phase:bool=False, incremental:bool=False):
+        """
+        Args:
+            packrat (bool): Aktifkan memoisasi hasil parse per (non-terminal, posisi token)
+            memo_limit (int): Jumlah entry memo maksimum, entry terlama (LRU) dibuang
+            predictive (bool): Pilih alternatif lewat tabel prediksi LL(1) (lihat syntax.grammar)
+            iterative (bool): Gunakan parseIterative (stack eksplisit, tanpa rekursi Python)
+            compact (bool): Bangun parse tree compact (CompactNode): anak epsilon dibuang dan
+                rantai non-terminal dengan satu anak di-elide
+            two_phase (bool): Parse pertama tanpa pencatatan error; hanya jika gagal, parse
+                diulang dengan pencatatan error untuk membangun max_error_info
+            incremental (bool): Simpan hasil parse setiap (non-terminal, posisi) beserta token yang
+                dibacanya, sehingga reparseToken setelah edit hanya mem-parse ulang bagian yang
+                terdampak (lihat parseIncremental). Hanya untuk engine rekursif.
+        """
+        self.packrat = packrat
+        self.predictive = predictive
+        self.iterative = iterative
+        self.compact = compact
+        self.two_phase = two_phase
+        self.grammar = Grammar()
+        self.native_rules = {}
+        self.native_binders = []
+        self.shapes = {}
+        self.empty_nodes = {}
+        self.memo_limit = memo_limit
+        if packrat:
+            self.parse = self.parseMemo
+        self.incremental = incremental
+        if incremental:
+            self.parse = self.parseIncremental
+        self.production_rules = {}
+        self.lock = threading.Lock()
+
+    # GENERATED PARSER
+    def setGenerated(self, module: Any) -> None:
+        """
+        Pakai modul parser hasil syntax.codegen (harus di-generate dari aturan yang sama)
+        sebagai engine parse. packrat, two_phase, aksi semantik, dan compact tetap berlaku.
+        """
+        self.grammar = replace(self.grammar, generated=module)
+
+    # NATIVE RULES
+    def addNativeRule(self, lhs: NonTerminal, rule: Callable[[ParseState], Node|None],
+                      bind: Callable[[ParseState], None]|None = None) -> None:
+        """
+        Ganti parsing `lhs` dengan fungsi `rule(state)`, dipakai oleh semua engine (parse,
+        parseMemo, parseIterative, dan parser hasil generate). Seperti execute_rules, `rule`
+        mulai dari state.currentTokenID, mengembalikan Node (None jika gagal), meninggalkan
+        state.currentTokenID di posisi akhir (posisi awal jika gagal), dan mencatat error lewat
+        state.record_error jika state.track_errors. `bind(state)` dipanggil sebelum setiap
+        parse setelah tokens terpasang; data per parse disimpan di state.natives.
+        """
+        self.native_rules[lhs] = rule
+        self.production_rules[lhs] = rule
+        if bind is not None:
+            self.native_binders.append(bind)
+
+    # SEMANTIC ACTIONS
+    def setActions(self, actions: Dict[NonTerminal, Callable[[List[Any]], Any]]|None) -> None:
+        """
+        Pasang aksi semantik (None untuk kembali membangun parse tree). Jika terpasang,
+        setiap non-terminal yang berhasil menghasilkan Node(nilai) tanpa children, dengan
+        nilai = actions[lhs]([child.value ...]): Token untuk terminal, nilai aksi untuk
+        non-terminal. Non-terminal tanpa aksi bernilai None.
+        Aksi dipanggil juga untuk alternatif yang nantinya dibuang oleh backtracking,
+        jadi aksi harus bebas efek samping dan tidak boleh memodifikasi nilai anak.
+        """
+        self.grammar = replace(self.grammar, actions=actions)
+
+    def reduce(self, lhs: NonTerminal, childNodes: List[Node]) -> Node:
+        """Membuat node hasil untuk alternatif `lhs` yang cocok."""
+        actions = self.grammar.actions
+        if actions is not None:
+            action = actions.get(lhs)
+            return Node(action([child.value for child in childNodes]) if action else None)
+        if self.compact:
+            return self.reduceCompact(lhs, childNodes)
+        newNode = Node(lhs)
+        newNode.addChildren(childNodes)
+        return newNode
+
+    def reduceCompact(self, lhs: NonTerminal, childNodes: List[Node]) -> CompactNode:
+        """
+        Versi compact dari reduce. Anak yang kosong (CompactNode non-terminal tanpa anak)
+        dibuang dan dicatat posisinya. Jika hanya tersisa satu anak, `lhs` di-elide ke
+        dalam anak tersebut (dicatat di `collapsed`). Anak tidak dimodifikasi karena
+        bisa dipakai ulang dari memo packrat.
+        """
+        if not childNodes:
+            # Hasil epsilon dipakai bersama (tidak pernah dimodifikasi)
+            empty = self.empty_nodes.get(lhs)
+            if empty is None:
+                empty = self.empty_nodes.setdefault(lhs, CompactNode(lhs, [], ()))
+            return empty
+
+        kept = []
+        skipped = []
+        for index, child in enumerate(childNodes):
+            if child.__class__ is CompactNode and not child.nodes and isinstance(child.symbol, NonTerminal):
+                # Subtree kosong (mungkin berisi non-terminal kosong lain) disimpan utuh
+                skipped.append((index, child))
+            else:
+                kept.append(child)
+        if skipped:
+            skipped = tuple(skipped)
+            skipped = self.shapes.setdefault(skipped, skipped)
+        else:
+            skipped = ()
+
+        if not kept:
+            # Semua anak kosong: subtree-nya juga di-intern per (lhs, skipped)
+            empty = self.empty_nodes.get((lhs, skipped))
+            if empty is None:
+                empty = self.empty_nodes.setdefault((lhs, skipped), CompactNode(lhs, [], skipped))
+            return empty
+        if len(kept) != 1:
+            return CompactNode(lhs, kept, skipped)
+        child = kept[0]
+        if child.__class__ is CompactNode:
+            chain = ((lhs, skipped),) + child.collapsed
+            return CompactNode(child.symbol, child.nodes, child.skipped, self.shapes.setdefault(chain, chain))
+        chain = ((lhs, skipped),)
+        return CompactNode(child.value, [], (), self.shapes.setdefault(chain, chain))
+
+    # PREDICTIVE PARSING
+    def buildPredictTable(self) -> Grammar:
+        """
+        Membangun tabel prediksi dari seluruh aturan yang sudah didaftarkan dan mengembalikan
+        grammar yang memuatnya. Dibangun sekali di bawah lock, jadi parse bersamaan yang
+        pertama kali membutuhkannya tidak membangunnya berulang.
+        """
+        with self.lock:
+            grammar = self.grammar
+            if grammar.predict_rows is not None:
+                return grammar
+            from syntax.grammar import GrammarAnalysis
+            analysis = GrammarAnalysis(grammar.rules)
+            predict_rows = {}
+            for lhs, row in analysis.predictive_table().items():
+                compiled = grammar.compiled_rules[lhs]
+                predict_rows[lhs] = [
+                    ([compiled[index] for index in candidates], tuple(expected))
+                    for candidates, expected in row
+                ]
+            grammar = self.grammar = replace(grammar, lookahead_keys=analysis.lookahead_keys(),
+                                             predict_rows=predict_rows)
+            return grammar
+
+    def predictAlternatives(self, state: ParseState, lhs: NonTerminal) -> List[Any]:
+        """
+        Alternatif kandidat untuk `lhs` berdasarkan token saat ini. Alternatif yang pasti
+        gagal dilewati, tetapi ekspektasinya tetap dicatat agar pesan error tidak berubah.
+        """
+        index = state.currentTokenID
+        if index - state.base >= len(state.lookahead) and not state.fillTokens(index):
+            key = 0
+        else:
+            key = state.lookahead[index - state.base]
+        alternatives, expected = self.grammar.predict_rows[lhs][key]
+        if expected and state.track_errors and index >= state.max_error_info['max_id']:
+            for symbol in expected:
+                state.record_error(symbol)
+        return alternatives
+
     # PRODUCTION RULES
     def addRules(self, rules: Dict[NonTerminal, List[List[NonTerminal|Token|TokenType|Epsilon]]]) -> None:
-        for lhs, rhs in rules.items():
-            
-            # Rule yang didaftarkan
-            # 'Kunci' nilai 'lhs' dan 'rhs' saat ini menggunakan argumen default.
-            def execute_rules(current_lhs=lhs, current_rhs=rhs) -> Node|None:
-                newNode = Node(current_lhs)
-
-                # print(f"Endpoint execute_rules:\n\tcurrent_lhs={current_lhs}\n\tcurrent_rhs={current_rhs}\n\ttoken={self.currentToken()}")
-                
-                # Simpan posisi token untuk backtracking
-                initial_token_id = self.currentTokenID
-
-                # Coba setiap Alternatif
-                for alternative in current_rhs:
-                    isMatch = True
-                    childNodes:List[Node] = []
-                    
-                    # Reset token pointer untuk setiap alternatif baru
-                    self.currentTokenID = initial_token_id
-
-                    # Try Apply
-                    # print(f"Alternative Check: {alternative}")
-                    for symbol in alternative:
-                        # print(f"Matching: simbol={symbol} token={self.currentToken()}")
-                        
-                        # Inisialisasi childNode
-                        childNode: Node = None 
-
-                        if isinstance(symbol, NonTerminal):
-                            childNode = self.parse(symbol) # Panggil rekursif
-                            # Cek apakah parse rekursif GAGAL
-                            if childNode is None:
-                                isMatch = False
-                                # JANGAN RECORD ERROR DI SINI: biarkan dia cari alternatif
-                        
-                        elif isinstance(symbol, Token):
-                            if symbol == self.currentToken():
-                                isMatch = True
-                                childNode = Node(self.currentToken())
-                                # KONSUMSI TOKEN
-                                self.nextToken()
-                            else:
-                                isMatch = False
-                                # RECORD ERROR
-                                self.record_error(symbol, self.currentToken())
-                        
-                        elif isinstance(symbol, TokenType):
-                            if symbol == self.currentToken().token_type:
-                                isMatch = True
-                                childNode = Node(self.currentToken())
-                                # KONSUMSI TOKEN
-                                self.nextToken()
-                            else:
-                                isMatch = False
-                                # PANGGIL PELACAK ERROR
-                                self.record_error(symbol, self.currentToken())
-                        
-                        elif isinstance(symbol, Epsilon):
-                            isMatch = True 
-                            continue # Epsilon tidak menghasilkan node anak dan tidak konsumsi token
-                        
-                        if isMatch:
-                            if childNode: # Hanya tambahkan jika node berhasil dibuat
-                                childNodes.append(childNode)
+        grammar = self.grammar
+        terminals = list(grammar.terminals)
+        terminal_slots = dict(grammar.terminal_slots)
+        compiled_rules = {}
+        all_rules = {**grammar.rules, **rules}
+
+        # Non-terminal yang tidak mungkin gagal: punya alternatif yang hanya berisi epsilon dan
+        # non-terminal seperti itu (alternatif nullable selalu dicoba, juga di mode prediktif)
+        infallible = set()
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in all_rules.items():
+                if lhs not in infallible and any(
+                        all(isinstance(symbol, Epsilon) or symbol in infallible for symbol in alternative)
+                        for alternative in rhs):
+                    infallible.add(lhs)
+                    changed = True
+
+        def terminalSlot(symbol: Token|TokenType) -> int:
+            """Mendaftarkan terminal grammar dan mengembalikan slot-nya."""
+            slot = terminal_slots.get(symbol)
+            if slot is None:
+                slot = terminal_slots[symbol] = len(terminals)
+                terminals.append(symbol)
+            return slot
+
+        for lhs, rhs in all_rules.items():
+            compiled = []
+            for alternative in rhs:
+                # Pasangkan setiap simbol dengan slot terminalnya (-1 untuk non-terminal/epsilon)
+                pairs = [(symbol, terminalSlot(symbol) if isinstance(symbol, (Token, TokenType)) else -1)
+                         for symbol in alternative]
+                # Setelah COMMIT alternatif pasti berhasil, jadi tidak ada backtrack ke awal lhs
+                commit = len(pairs)
+                while commit > 0 and (isinstance(pairs[commit - 1][0], Epsilon) or pairs[commit - 1][0] in infallible):
+                    commit -= 1
+                while commit < len(pairs) and isinstance(pairs[commit][0], Epsilon):
+                    commit += 1
+                if commit < len(pairs):
+                    pairs[commit] = (pairs[commit][0], COMMIT)
+                compiled.append(pairs)
+            compiled_rules[lhs] = compiled
+
+            # Daftarkan Rule (native rule yang sudah terpasang tetap dipakai)
+            self.production_rules[lhs] = self.native_rules.get(lhs) or self.makeRule(lhs, compiled)
+        self.grammar = replace(grammar, rules=all_rules, compiled_rules=compiled_rules,
+                               terminals=tuple(terminals), terminal_slots=terminal_slots,
+                               lookahead_keys=None, predict_rows=None)
+
+    def makeRule(self, lhs: NonTerminal, rhs: List[List[Tuple[Any, int]]],
+                 observe: Callable[[ParseState, Any, int], Callable[[bool], None]]|None = None) -> Callable[[ParseState], Node|None]:
+        """
+        Closure execute_rules untuk alternatif terkompilasi `rhs` (lihat addRules) dari `lhs`.
+        Jika `observe` diberikan (misal syntax.profile), `observe(state, alternative, posisi awal)`
+        dipanggil sebelum setiap alternatif dicoba dan mengembalikan `finish(cocok)` yang dipanggil
+        setelah alternatif itu selesai, sebelum token direset untuk alternatif berikutnya.
+        """
+        # Rule yang didaftarkan
+        # 'Kunci' nilai 'lhs' dan 'rhs' saat ini menggunakan argumen default.
+        def execute_rules(state: ParseState, current_lhs=lhs, current_rhs=rhs) -> Node|None:
+            # print(f"Endpoint execute_rules:\n\tcurrent_lhs={current_lhs}\n\tcurrent_rhs={current_rhs}\n\ttoken={state.currentToken()}")
+
+            # Simpan posisi token untuk backtracking
+            initial_token_id = state.currentTokenID
+
+            # Coba setiap Alternatif (mode prediktif: hanya kandidat dari tabel)
+            alternatives = self.predictAlternatives(state, current_lhs) if self.predictive else current_rhs
+            # Selama masih ada alternatif lain, token mulai initial_token_id bisa dibaca ulang
+            backtrack = state.backtrack
+            pinned = backtrack is not None and len(alternatives) > 1
+            if pinned:
+                backtrack.append(initial_token_id)
+            for alternative in alternatives:
+                isMatch = True
+                childNodes:List[Node] = []
+
+                # Reset token pointer untuk setiap alternatif baru
+                state.currentTokenID = initial_token_id
+                if observe is not None:
+                    finish = observe(state, alternative, initial_token_id)
+
+                # Try Apply
+                # print(f"Alternative Check: {alternative}")
+                for symbol, slot in alternative:
+                    # print(f"Matching: simbol={symbol} token={state.currentToken()}")
+
+                    # Inisialisasi childNode
+                    childNode: Node = None
+
+                    if isinstance(symbol, NonTerminal):
+                        if slot == COMMIT and pinned:
+                            # Sisa alternatif pasti berhasil: tidak ada backtrack lagi ke initial_token_id
+                            backtrack.pop()
+                            pinned = False
+                        childNode = self.parse(state, symbol) # Panggil rekursif
+                        # Cek apakah parse rekursif GAGAL
+                        if childNode is None:
+                            isMatch = False
+                            # JANGAN RECORD ERROR DI SINI: biarkan dia cari alternatif
+
+                    elif isinstance(symbol, (Token, TokenType)):
+                        # Token dibandingkan lewat kind+lexeme, TokenType hanya lewat kind
+                        if state.matchTerminal(slot):
+                            isMatch = True
+                            childNode = Node(state.currentToken())
+                            # KONSUMSI TOKEN
+                            state.nextToken()
                         else:
-                            # Gagal di tengah alternatif, hentikan loop 'symbol' ini
-                            break
-                    
-                    # Alternatif Cocok (seluruh 'alternative' berhasil di-match)
+                            isMatch = False
+                            # RECORD ERROR (dilewati pada parse cepat two_phase)
+                            if state.track_errors:
+                                state.record_error(symbol)
+
+                    elif isinstance(symbol, Epsilon):
+                        isMatch = True
+                        continue # Epsilon tidak menghasilkan node anak dan tidak konsumsi token
+
                     if isMatch:
-                        newNode.addChildren(childNodes)
-                        # Berhasil! Kembalikan node yang sudah diisi
-                        return newNode
+                        if childNode: # Hanya tambahkan jika node berhasil dibuat
+                            childNodes.append(childNode)
+                    else:
+                        # Gagal di tengah alternatif, hentikan loop 'symbol' ini
+                        break
+
+                if observe is not None:
+                    finish(isMatch)
 
-                # Jika semua alternatif sudah dicoba dan TIDAK ADA yang cocok
-                # Reset token ke posisi awal (sebelum 'execute_rules' ini dipanggil)
-                self.currentTokenID = initial_token_id
-                # Kembalikan None untuk menandakan kegagalan
-                return None
+                # Alternatif Cocok (seluruh 'alternative' berhasil di-match)
+                if isMatch:
+                    if pinned:
+                        backtrack.pop()
+                    if self.compact or self.grammar.actions is not None:
+                        return self.reduce(current_lhs, childNodes)
+                    newNode = Node(current_lhs)
+                    newNode.setChildren(childNodes)
+                    # Berhasil! Kembalikan node yang sudah diisi
+                    return newNode
 
-            # Daftarkan Rule
-            self.production_rules[lhs] = execute_rules
+            # Jika semua alternatif sudah dicoba dan TIDAK ADA yang cocok
+            # Reset token ke posisi awal (sebelum 'execute_rules' ini dipanggil)
+            state.currentTokenID = initial_token_id
+            if pinned:
+                backtrack.pop()
+            # Kembalikan None untuk menandakan kegagalan
+            return None
+        return execute_rules
 
-    def parse(self, lhs:NonTerminal=NonTerminal("<Program>")) -> Node|None: # Mengembalikan None jika gagal
+    def parse(self, state: ParseState, lhs:NonTerminal=NonTerminal("<Program>")) -> Node|None: # Mengembalikan None jika gagal
         # print(f"Mencoba parsing aturan: {lhs}")
         if lhs not in self.production_rules:
             raise Exception(f"Aturan produksi untuk {lhs} tidak ditemukan.")
-        return self.production_rules[lhs]()
-    
-    def parseToken(self, tokens:List[Token]) -> Node|None:
-        self.tokens = tokens
-        return self.parse()
\ No newline at end of file
+        return self.production_rules[lhs](state)
+
+    def parseMemo(self, state: ParseState, lhs:NonTerminal=NonTerminal("<Program>")) -> Node|None:
+        """
+        Versi packrat dari parse: hasil setiap (lhs, posisi token) disimpan di state.memo
+        sehingga non-terminal yang sama di posisi yang sama tidak di-parse ulang saat
+        backtracking. Error yang dicatat saat parse pertama sudah ada di max_error_info,
+        jadi hasil dari memo tidak mengubah pesan error.
+        """
+        memo = state.memo
+        key = (lhs, state.currentTokenID)
+        entry = memo.get(key)
+        if entry is not None:
+            memo.move_to_end(key)
+            node, end_id = entry
+            state.currentTokenID = end_id
+            return node
+
+        if lhs not in self.production_rules:
+            raise Exception(f"Aturan produksi untuk {lhs} tidak ditemukan.")
+        node = self.production_rules[lhs](state)
+
+        memo[key] = (node, state.currentTokenID)
+        if len(memo) > self.memo_limit:
+            memo.popitem(last=False)
+        return node
+
+    def parseIterative(self, state: ParseState, lhs:NonTerminal=NonTerminal("<Program>")) -> Node|None:
+        """
+        Engine parsing dengan stack eksplisit. Semantiknya sama dengan execute_rules
+        (alternatif dicoba berurutan, backtrack ke posisi awal jika gagal, packrat dan
+        mode prediktif tetap berlaku), tetapi setiap non-terminal menjadi frame di list,
+        bukan frame Python. Daftar statement yang panjang dan nesting yang dalam tidak
+        lagi dibatasi oleh recursion limit.
+
+        Frame: [lhs, alternatives, index alternatif, index simbol, token awal, child nodes,
+                token awal tercatat di state.backtrack]
+        """
+        stack = []
+        result: Node|None = None
+        returning = False
+        native_rules = self.native_rules
+        compiled_rules = self.grammar.compiled_rules
+        memo = state.memo
+        backtrack = state.backtrack
+
+        def enter(symbol: NonTerminal) -> bool:
+            """Push frame untuk `symbol`, atau langsung pakai hasil memo (return False)."""
+            nonlocal result
+            if symbol not in compiled_rules:
+                raise Exception(f"Aturan produksi untuk {symbol} tidak ditemukan.")
+            if self.packrat:
+                entry = memo.get((symbol, state.currentTokenID))
+                if entry is not None:
+                    memo.move_to_end((symbol, state.currentTokenID))
+                    result, state.currentTokenID = entry
+                    return False
+            native = native_rules.get(symbol)
+            if native is not None:
+                # Native rule dijalankan langsung (rekursinya hanya sedalam nesting di dalamnya)
+                start = state.currentTokenID
+                result = native(state)
+                if self.packrat:
+                    memo[(symbol, start)] = (result, state.currentTokenID)
+                    if len(memo) > self.memo_limit:
+                        memo.popitem(last=False)
+                return False
+            alternatives = self.predictAlternatives(state, symbol) if self.predictive else compiled_rules[symbol]
+            pinned = backtrack is not None and len(alternatives) > 1
+            if pinned:
+                backtrack.append(state.currentTokenID)
+            stack.append([symbol, alternatives, 0, 0, state.currentTokenID, [], pinned])
+            return True
+
+        def leave(node: Node|None) -> None:
+            """Pop frame teratas dengan hasil `node` (None jika gagal)."""
+            nonlocal result, returning
+            frame = stack.pop()
+            if frame[6]:
+                backtrack.pop()
+            if node is None:
+                state.currentTokenID = frame[4]
+            if self.packrat:
+                memo[(frame[0], frame[4])] = (node, state.currentTokenID)
+                if len(memo) > self.memo_limit:
+                    memo.popitem(last=False)
+            result = node
+            returning = True
+
+        if not enter(lhs):
+            return result
+
+        while stack:
+            frame = stack[-1]
+            current_lhs, alternatives, alt_index, sym_index, initial_token_id, childNodes, pinned = frame
+
+            if returning:
+                # Lanjutkan alternatif setelah non-terminal anak selesai
+                returning = False
+                if result is None:
+                    alt_index += 1
+                    sym_index = 0
+                    childNodes = []
+                else:
+                    childNodes.append(result)
+                    sym_index += 1
+            if sym_index == 0:
+                # Reset token pointer untuk setiap alternatif baru
+                state.currentTokenID = initial_token_id
+
+            pushed = False
+            while alt_index < len(alternatives):
+                alternative = alternatives[alt_index]
+                isMatch = True
+                while sym_index < len(alternative):
+                    symbol, slot = alternative[sym_index]
+                    if isinstance(symbol, NonTerminal):
+                        if slot == COMMIT and pinned:
+                            backtrack.pop()
+                            pinned = frame[6] = False
+                        frame[2], frame[3], frame[5] = alt_index, sym_index, childNodes
+                        if enter(symbol):
+                            pushed = True
+                            break
+                        # Hasil memo: langsung proses seperti child yang baru kembali
+                        if result is None:
+                            isMatch = False
+                            break
+                        childNodes.append(result)
+                    elif isinstance(symbol, (Token, TokenType)):
+                        if state.matchTerminal(slot):
+                            childNodes.append(Node(state.currentToken()))
+                            state.nextToken()
+                        else:
+                            if state.track_errors:
+                                state.record_error(symbol)
+                            isMatch = False
+                            break
+                    sym_index += 1
+
+                if pushed or isMatch:
+                    break
+                # Alternatif gagal, coba alternatif berikutnya dari posisi awal
+                alt_index += 1
+                sym_index = 0
+                childNodes = []
+                state.currentTokenID = initial_token_id
+
+            if pushed:
+                continue
+            if alt_index < len(alternatives):
+                leave(self.reduce(current_lhs, childNodes))
+            else:
+                leave(None)
+
+        return result
+
+    def parseIncremental(self, state: ParseState, lhs:NonTerminal=NonTerminal("<Program>")) -> Node|None:
+        """
+        Versi incremental dari parseMemo (CFG(incremental=True)): hasil disimpan di
+        state.columns[posisi][lhs] dengan panjang dan jangkauan relatif, sehingga tetap
+        berlaku setelah token di depannya disisipkan/dihapus, dan jangkauannya menentukan
+        apakah hasil itu terdampak edit (lihat reparseToken).
+
+        Jangkauan dihitung dari kegagalan terjauh yang dicatat record_error selama lhs
+        di-parse (karena itu pencatatan error selalu aktif), lewat max_error_info['max_id']
+        yang di sini dipakai sebagai pelacak posisi terjauh. Isi max_error_info setelah parse
+        incremental tidak dipakai untuk pesan error (lihat parseBuffer).
+        """
+        if state.diagnostic:
+            return self.parseMemo(state, lhs)
+        start = state.currentTokenID
+        column = state.columns[start]
+        entry = column.get(lhs)
+        info = state.max_error_info
+        if entry is not None:
+            node, length, extent = entry
+            state.currentTokenID = start + length
+            if start + extent - 1 > info['max_id']:
+                info['max_id'] = start + extent - 1
+            return node
+
+        if lhs not in self.production_rules:
+            raise Exception(f"Aturan produksi untuk {lhs} tidak ditemukan.")
+        saved_max = info['max_id']
+        info['max_id'] = start - 1
+        node = self.production_rules[lhs](state)
+        end = state.currentTokenID
+        extent = max(end, info['max_id'] + 1) - start
+        if saved_max > info['max_id']:
+            info['max_id'] = saved_max
+
+        column[lhs] = (node, end - start, extent)
+        if extent > state.reach[start]:
+            state.reach[start] = extent
+            if extent > self.LONG_REACH:
+                state.long_reach.add(start)
+        return node
+
+    def parseToken(self, tokens:TokenBuffer|List[Token], start:NonTerminal=NonTerminal("<Program>")) -> Tuple[Node|None, ParseState]:
+        """
+        Parse `tokens` dari `start` dengan ParseState baru. Mengembalikan (hasil, state): state
+        menyimpan posisi akhir dan max_error_info untuk pesan error, dan pada mode incremental
+        menjadi dasar reparseToken.
+        """
+        streaming = False
+        if not isinstance(tokens, TokenBuffer):
+            tokens = TokenBuffer.from_tokens(tokens)
+        elif isinstance(tokens, TokenStream):
+            if self.incremental:
+                raise ValueError("Mode incremental butuh TokenBuffer dari Lexer.tokenize_buffer, bukan TokenStream")
+            if self.grammar.generated is not None or self.native_binders:
+                # Parser hasil generate dan native rule (misal pratt) memakai array per token
+                # yang dihitung sebelum parse, jadi semua token di-lex dulu
+                tokens.fill_all()
+            else:
+                # Token lama dibuang selama parse, kecuali two_phase yang bisa parse ulang dari awal
+                streaming = not self.two_phase
+        state = StreamState(tokens) if streaming else ParseState(tokens)
+        if self.incremental:
+            state.columns = [{} for _ in range(len(tokens) + 1)]
+            state.reach = array('i', [0]) * (len(tokens) + 1)
+        result = self.parseBuffer(state, start)
+        if isinstance(tokens, TokenStream):
+            # Sisa input tetap di-lex agar LexicalError setelah posisi error sintaks tetap
+            # dilempar, sama seperti jika semua token di-lex sebelum parse; token setelah
+            # posisi akhir parse tidak disimpan
+            tokens.drain(state.currentTokenID)
+        return result, state
+
+    def reparseToken(self, state:ParseState, tokens:TokenBuffer, edit:TokenEdit,
+                     start:NonTerminal=NonTerminal("<Program>")) -> Node|None:
+        """
+        Parse ulang setelah edit (CFG(incremental=True)): `state` adalah state parse sebelumnya
+        (dari parseToken atau reparseToken), `tokens` buffer hasil Lexer.relex dari buffer
+        parse itu, `edit` rentang token yang berubah. Hasil parse di depan edit yang tidak
+        membaca token yang berubah, dan semua hasil di setelah edit (posisinya relatif),
+        dipakai ulang tanpa di-parse.
+        """
+        if not self.incremental:
+            raise ValueError("reparseToken membutuhkan CFG(incremental=True)")
+        columns, reach = state.columns, state.reach
+        # Buang hasil di depan edit yang jangkauannya mencapai token yang berubah: kolom
+        # dekat edit diperiksa semua, kolom yang lebih jauh hanya yang ada di long_reach
+        candidates = set(range(max(0, edit.start - self.LONG_REACH), edit.start))
+        candidates.update(index for index in state.long_reach if index < edit.start)
+        for index in candidates:
+            limit = edit.start - index
+            if reach[index] <= limit:
+                continue
+            column = columns[index] = {lhs: entry for lhs, entry in columns[index].items() if entry[2] <= limit}
+            reach[index] = max((entry[2] for entry in column.values()), default=0)
+        changed = edit.new_end - edit.start
+        columns[edit.start:edit.old_end] = [{} for _ in range(changed)]
+        reach[edit.start:edit.old_end] = array('i', [0]) * changed
+        # Posisi kolom setelah edit bergeser
+        shift = edit.new_end - edit.old_end
+        if shift:
+            state.long_reach = {
+                index if index < edit.start else index + shift
+                for index in state.long_reach if index < edit.start or index >= edit.old_end
+            }
+        else:
+            state.long_reach.difference_update(range(edit.start, edit.old_end))
+        state.tokens = tokens
+        state.edit = edit
+        try:
+            return self.parseBuffer(state, start)
+        finally:
+            state.edit = None
+
+    def parseBuffer(self, state:ParseState, start:NonTerminal=NonTerminal("<Program>")) -> Node|None:
+        """Parse state.tokens dari `start` dengan engine dan opsi yang dipilih."""
+        grammar = self.grammar
+        if self.predictive and grammar.predict_rows is None:
+            grammar = self.buildPredictTable()
+        state.resetState()
+        state.bindTerminals(grammar.terminals)
+        for bind in self.native_binders:
+            bind(state)
+        if self.predictive:
+            state.bindLookahead(grammar.lookahead_keys)
+        state.memo.clear()
+        # Mode incremental butuh pencatatan error untuk menghitung jangkauan setiap hasil
+        state.track_errors = self.incremental or not self.two_phase
+        result = self.runParse(state, start)
+        if result is None and self.incremental:
+            # Parse diagnostik: max_error_info dari parse incremental hanya pelacak jangkauan,
+            # jadi pesan error dibangun dari parse packrat biasa
+            state.resetState()
+            state.diagnostic = True
+            try:
+                result = self.runParse(state, start)
+            finally:
+                state.diagnostic = False
+                state.memo.clear()
+        elif result is None and not state.track_errors:
+            # Parse diagnostik: ulangi dari awal dengan pencatatan error. Memo dari parse
+            # cepat tidak dipakai karena kegagalan di dalamnya tidak tercatat.
+            state.resetState()
+            state.memo.clear()
+            state.track_errors = True
+            result = self.runParse(state, start)
+        return result
+
+    def runParse(self, state:ParseState, start:NonTerminal=NonTerminal("<Program>")) -> Node|None:
+        """Menjalankan engine parse yang dipilih dari non-terminal `start`."""
+        generated = self.grammar.generated
+        if generated is not None:
+            return generated.parse(self, state, start)
+        if self.iterative:
+            return self.parseIterative(state, start)
+        return self.parse(state, start)
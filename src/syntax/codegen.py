@@ -0,0 +1,272 @@
+import hashlib
+import importlib.util
+import os
+import re
+from types import ModuleType
+from typing import Dict, List
+
+from lexical.token import Token, TokenType
+from syntax.parsetree import NonTerminal
+from syntax.cfg import Epsilon
+
+# ===== Parser Generator =====
+#
+# Menghasilkan modul Python dari aturan produksi dengan satu fungsi per non-terminal:
+# pengecekan terminal di-inline sebagai perbandingan id kind/lexeme, dan pemilihan
+# alternatif memakai tabel prediksi (syntax.grammar) yang sudah dihitung saat generate.
+# Modul disimpan di __generated__/ dengan nama berdasarkan hash rules.py (dan source
+# generator), sehingga dibuat ulang otomatis jika rules.py berubah.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # src/syntax/
+CACHE_DIR = os.path.join(BASE_DIR, '__generated__')
+# File yang isinya menentukan hasil generate
+SOURCE_FILES = [os.path.join(BASE_DIR, name) for name in ('rules.py', 'grammar.py', 'codegen.py')]
+
+_loaded: Dict[str, ModuleType] = {}
+
+def _symbol_literal(symbol: Token|TokenType) -> str:
+    if isinstance(symbol, Token):
+        return f"Token({str(symbol.token_type)!r}, {str(symbol.lexeme)!r})"
+    return f"TokenType({str(symbol)!r})"
+
+def _function_name(lhs: NonTerminal) -> str:
+    return "p_" + re.sub(r'\W', '_', lhs.strip('<>'))
+
+class _Writer:
+    def __init__(self):
+        self.lines: List[str] = []
+    def line(self, indent: int, text: str = "") -> None:
+        self.lines.append("    " * indent + text if text else "")
+
+def generateParserSource(rules: Dict[NonTerminal, List[List[object]]], start: NonTerminal = NonTerminal("<Program>")) -> str:
+    """Menghasilkan source modul parser untuk `rules` (lihat parse() di modul hasil)."""
+    from syntax.grammar import GrammarAnalysis
+    analysis = GrammarAnalysis(rules, start)
+    keys = analysis.lookahead_keys()
+    predictive = analysis.predictive_table()
+
+    terminal_ids = {symbol: i for i, symbol in enumerate(analysis.terminals)}
+    lhs_ids = {lhs: i for i, lhs in enumerate(rules)}
+    names = {lhs: _function_name(lhs) for lhs in rules}
+
+    w = _Writer()
+    w.line(0, '"""')
+    w.line(0, "Parser hasil generate syntax.codegen dari syntax/rules.py. JANGAN DIEDIT: file ini")
+    w.line(0, "dibuat ulang otomatis jika aturan produksi berubah.")
+    w.line(0, '"""')
+    w.line(0, "from lexical.token import Token, TokenType")
+    w.line(0, "from syntax.parsetree import NonTerminal, Node")
+    w.line(0)
+    w.line(0, "# Terminal grammar")
+    w.line(0, f"TERMINALS = [")
+    for symbol in analysis.terminals:
+        w.line(1, f"{_symbol_literal(symbol)},")
+    w.line(0, "]")
+    for i in range(len(analysis.terminals)):
+        w.line(0, f"T{i} = TERMINALS[{i}]")
+    w.line(0)
+    w.line(0, "# Non-terminal")
+    for lhs, i in lhs_ids.items():
+        w.line(0, f"L{i} = NonTerminal({str(lhs)!r})")
+    w.line(0)
+    w.line(0, "# Kelas lookahead (urutan sama dengan GrammarAnalysis.lookahead_keys)")
+    w.line(0, "LOOKAHEAD_KEYS = [None] + [" + ", ".join(
+        f"T{terminal_ids[key]}" for key in keys[1:]) + "]")
+    w.line(0)
+    w.line(0, "# Per non-terminal dengan >1 alternatif: bitmask alternatif kandidat dan terminal")
+    w.line(0, "# 'expected' dari alternatif yang dilewati, di-index oleh kelas lookahead")
+    for lhs, production in rules.items():
+        if len(production) < 2:
+            continue
+        i = lhs_ids[lhs]
+        masks = [sum(1 << index for index in candidates) for candidates, _ in predictive[lhs]]
+        expects = []
+        for _, expected in predictive[lhs]:
+            ordered = sorted(expected, key=lambda symbol: terminal_ids[symbol])
+            expects.append("(" + "".join(f"T{terminal_ids[symbol]}, " for symbol in ordered) + ")")
+        w.line(0, f"MASK{i} = ({', '.join(map(str, masks))},)")
+        w.line(0, f"EXPECT{i} = ({', '.join(expects)},)")
+    w.line(0)
+
+    # --- parse(cfg, state) ---
+    w.line(0, f"def parse(cfg, state, start=L{lhs_ids[start]}):")
+    w.line(1, '"""')
+    w.line(1, "Parse state.tokens dari non-terminal `start` dengan semantik yang sama dengan CFG.parse (alternatif")
+    w.line(1, "berurutan dengan backtracking, error terjauh via state.record_error jika")
+    w.line(1, "state.track_errors, packrat jika cfg.packrat, aksi/compact lewat cfg.reduce).")
+    w.line(1, "Posisi akhir disimpan di state.currentTokenID.")
+    w.line(1, '"""')
+    w.line(1, "tokens = state.tokens")
+    w.line(1, "kinds = tokens.kinds")
+    w.line(1, "lexemes = tokens.lexemes")
+    w.line(1, "n = len(kinds)")
+    w.line(1, "track = state.track_errors")
+    w.line(1, "plain = cfg.grammar.actions is None and not cfg.compact")
+    w.line(1, "reduce = cfg.reduce")
+    w.line(1, "state.bindLookahead(LOOKAHEAD_KEYS)")
+    w.line(1, "la = state.lookahead")
+    w.line(1, "pos = 0")
+    w.line(0)
+    w.line(1, "# Id kind/lexeme setiap terminal pada buffer ini")
+    for symbol, i in terminal_ids.items():
+        if isinstance(symbol, Token):
+            w.line(1, f"k{i} = tokens.kind_id(T{i}.token_type); x{i} = tokens.lexeme_id(T{i}.lexeme)")
+        else:
+            w.line(1, f"k{i} = tokens.kind_id(T{i})")
+    w.line(0)
+    w.line(1, "def fail(at, symbol):")
+    w.line(2, "state.currentTokenID = at")
+    w.line(2, "state.record_error(symbol)")
+    w.line(0)
+
+    for lhs, production in rules.items():
+        i = lhs_ids[lhs]
+        w.line(1, f"def {names[lhs]}():")
+        w.line(2, f"# {lhs}")
+        w.line(2, "nonlocal pos")
+        w.line(2, "start = pos")
+        multiple = len(production) > 1
+        if multiple:
+            w.line(2, "key = la[pos] if pos < n else 0")
+            w.line(2, f"mask = MASK{i}[key]")
+            w.line(2, f"if track and EXPECT{i}[key] and pos >= state.max_error_info['max_id']:")
+            w.line(3, f"for symbol in EXPECT{i}[key]:")
+            w.line(4, "fail(pos, symbol)")
+        for index, alternative in enumerate(production):
+            indent = 2
+            if multiple:
+                w.line(2, f"if mask & {1 << index}:")
+                indent = 3
+            symbols = [symbol for symbol in alternative if not isinstance(symbol, Epsilon)]
+            children = [f"c{j}" for j in range(len(symbols))]
+            w.line(indent, "while True:")
+            body = indent + 1
+            for j, symbol in enumerate(symbols):
+                if isinstance(symbol, NonTerminal):
+                    w.line(body, f"c{j} = {names[symbol]}()")
+                    w.line(body, f"if c{j} is None: break")
+                else:
+                    t = terminal_ids[symbol]
+                    check = f"pos < n and kinds[pos] == k{t}"
+                    if isinstance(symbol, Token):
+                        check += f" and lexemes[pos] == x{t}"
+                    w.line(body, f"if not ({check}):")
+                    w.line(body + 1, f"if track: fail(pos, T{t})")
+                    w.line(body + 1, "break")
+                    w.line(body, f"c{j} = Node(tokens[pos]); pos += 1")
+            w.line(body, "if plain:")
+            w.line(body + 1, f"node = Node(L{i}); node.setChildren([{', '.join(children)}])")
+            w.line(body + 1, "return node")
+            w.line(body, f"return reduce(L{i}, [{', '.join(children)}])")
+            w.line(indent, "pos = start")
+        w.line(2, "return None")
+        w.line(0)
+
+    w.line(1, "if cfg.native_rules:")
+    w.line(2, "# Non-terminal dengan native rule (CFG.addNativeRule) di-parse oleh fungsi tersebut")
+    w.line(2, "def native(rule):")
+    w.line(3, "def parse_native():")
+    w.line(4, "nonlocal pos")
+    w.line(4, "state.currentTokenID = pos")
+    w.line(4, "node = rule(state)")
+    w.line(4, "pos = state.currentTokenID")
+    w.line(4, "return node")
+    w.line(3, "return parse_native")
+    w.line(0)
+    for lhs, i in lhs_ids.items():
+        w.line(2, f"if L{i} in cfg.native_rules: {names[lhs]} = native(cfg.native_rules[L{i}])")
+    w.line(0)
+    w.line(1, "if cfg.packrat:")
+    w.line(2, "memo = state.memo")
+    w.line(2, "memo_limit = cfg.memo_limit")
+    w.line(0)
+    w.line(2, "def memoized(lhs, rule):")
+    w.line(3, "def parse_memo():")
+    w.line(4, "nonlocal pos")
+    w.line(4, "key = (lhs, pos)")
+    w.line(4, "entry = memo.get(key)")
+    w.line(4, "if entry is not None:")
+    w.line(5, "memo.move_to_end(key)")
+    w.line(5, "node, pos = entry")
+    w.line(5, "return node")
+    w.line(4, "node = rule()")
+    w.line(4, "memo[key] = (node, pos)")
+    w.line(4, "if len(memo) > memo_limit:")
+    w.line(5, "memo.popitem(last=False)")
+    w.line(4, "return node")
+    w.line(3, "return parse_memo")
+    w.line(0)
+    for lhs, i in lhs_ids.items():
+        w.line(2, f"{names[lhs]} = memoized(L{i}, {names[lhs]})")
+    w.line(0)
+    w.line(1, "rules = {" + ", ".join(f"L{i}: {names[lhs]}" for lhs, i in lhs_ids.items()) + "}")
+    w.line(1, "result = rules[start]()")
+    w.line(1, "state.currentTokenID = pos")
+    w.line(1, "return result")
+    return "\n".join(w.lines) + "\n"
+
+def sourceHash() -> str:
+    """Hash dari file yang menentukan hasil generate (rules.py, grammar.py, codegen.py)."""
+    digest = hashlib.sha1()
+    for path in SOURCE_FILES:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def generatedPath(cache_dir: str = CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"parser_{sourceHash()}.py")
+
+def writeGeneratedParser(cache_dir: str = CACHE_DIR) -> str:
+    """
+    Generate ulang modul parser ke cache_dir dan kembalikan path-nya. Modul untuk hash lain
+    dihapus; file yang sudah dihapus proses lain diabaikan.
+    """
+    from syntax.rules import getAllProductionRules
+    path = generatedPath(cache_dir)
+    source = generateParserSource(getAllProductionRules())
+    os.makedirs(cache_dir, exist_ok=True)
+    # Tulis ke file sementara lalu rename agar proses lain tidak membaca file setengah jadi
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(source)
+    os.replace(tmp_path, path)
+    current = os.path.basename(path)
+    for name in os.listdir(cache_dir):
+        if name.startswith("parser_") and name.endswith(".py") and name != current:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except FileNotFoundError:
+                pass
+    return path
+
+def loadGeneratedParser(cache_dir: str = CACHE_DIR) -> ModuleType:
+    """
+    Memuat modul parser hasil generate untuk rules.py saat ini, generate dulu jika belum
+    ada di cache. Jika cache_dir tidak bisa ditulis atau file cache tidak bisa dimuat
+    (rusak, atau dihapus proses lain), modul di-generate di memori saja.
+    """
+    path = generatedPath(cache_dir)
+    module = _loaded.get(path)
+    if module is not None:
+        return module
+
+    name = f"syntax.__generated__.{os.path.splitext(os.path.basename(path))[0]}"
+    try:
+        if not os.path.exists(path):
+            writeGeneratedParser(cache_dir)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        from syntax.rules import getAllProductionRules
+        module = ModuleType(name)
+        exec(compile(generateParserSource(getAllProductionRules()), path, 'exec'), module.__dict__)
+    _loaded[path] = module
+    return module
+
+def main():
+    """Generate (ulang) parser dari rules.py dan cetak path modulnya."""
+    print(writeGeneratedParser())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+from array import array
+from typing import Dict, List, Tuple
+
+from lexical.token import Token, TokenType
+from syntax.parsetree import NonTerminal, Node
+from syntax.cfg import CFG, Epsilon, ParseState
+
+# ===== Operator-Precedence Parser untuk <Expression> =====
+
+EXPRESSION = NonTerminal("<Expression>")
+EXPRESSION_PRIME = NonTerminal("<ExpressionPrime>")
+SIMPLE_EXPRESSION = NonTerminal("<SimpleExpression>")
+SIMPLE_EXPRESSION_PRIME = NonTerminal("<SimpleExpressionPrime>")
+SIGNED_TERM = NonTerminal("<SignedTerm>")
+SIGN_OPT = NonTerminal("<SignOpt>")
+SIGN = NonTerminal("<Sign>")
+TERM = NonTerminal("<Term>")
+TERM_PRIME = NonTerminal("<TermPrime>")
+FACTOR = NonTerminal("<Factor>")
+FACTOR_TAIL = NonTerminal("<FactorTail>")
+VARIABLE_TAIL = NonTerminal("<VariableTail>")
+PARAMETER_LIST = NonTerminal("<ParameterList>")
+EXPRESSION_LIST = NonTerminal("<ExpressionList>")
+EXPRESSION_LIST_PRIME = NonTerminal("<ExpressionListPrime>")
+CONSTANT = NonTerminal("<Constant>")
+UNSIGNED_CONSTANT = NonTerminal("<UnsignedConstant>")
+RELATIONAL_OPERATOR = NonTerminal("<RelationalOperator>")
+ADDITIVE_OPERATOR = NonTerminal("<AdditiveOperator>")
+MULTIPLICATIVE_OPERATOR = NonTerminal("<MultiplicativeOperator>")
+
+IDENTIFIER = TokenType("IDENTIFIER")
+NUMBER = TokenType("NUMBER")
+STRING_LITERAL = TokenType("STRING_LITERAL")
+CHAR_LITERAL = TokenType("CHAR_LITERAL")
+TRUE = Token("KEYWORD", "true")
+FALSE = Token("KEYWORD", "false")
+LPARENTHESIS = Token("LPARENTHESIS", "(")
+RPARENTHESIS = Token("RPARENTHESIS", ")")
+LBRACKET = Token("LBRACKET", "[")
+RBRACKET = Token("RBRACKET", "]")
+DOT = Token("DOT", ".")
+COMMA = Token("COMMA", ",")
+NOT = Token("LOGICAL_OPERATOR", "tidak")
+
+# Bentuk aturan yang diasumsikan oleh ExpressionParser (dicek saat install)
+EXPECTED_RULES = {
+    EXPRESSION: [[SIMPLE_EXPRESSION, EXPRESSION_PRIME]],
+    EXPRESSION_PRIME: [[RELATIONAL_OPERATOR, SIMPLE_EXPRESSION], [Epsilon]],
+    SIMPLE_EXPRESSION: [[SIGNED_TERM, SIMPLE_EXPRESSION_PRIME]],
+    SIGNED_TERM: [[SIGN_OPT, TERM]],
+    SIMPLE_EXPRESSION_PRIME: [[ADDITIVE_OPERATOR, TERM, SIMPLE_EXPRESSION_PRIME], [Epsilon]],
+    TERM: [[FACTOR, TERM_PRIME]],
+    TERM_PRIME: [[MULTIPLICATIVE_OPERATOR, FACTOR, TERM_PRIME], [Epsilon]],
+    FACTOR: [[IDENTIFIER, FACTOR_TAIL], [CONSTANT], [LPARENTHESIS, EXPRESSION, RPARENTHESIS], [NOT, FACTOR]],
+    FACTOR_TAIL: [[PARAMETER_LIST], [VARIABLE_TAIL]],
+    VARIABLE_TAIL: [[LBRACKET, EXPRESSION, RBRACKET, VARIABLE_TAIL], [DOT, IDENTIFIER, VARIABLE_TAIL], [Epsilon]],
+    PARAMETER_LIST: [[LPARENTHESIS, EXPRESSION_LIST, RPARENTHESIS]],
+    EXPRESSION_LIST: [[EXPRESSION, EXPRESSION_LIST_PRIME]],
+    EXPRESSION_LIST_PRIME: [[COMMA, EXPRESSION, EXPRESSION_LIST_PRIME], [Epsilon]],
+    CONSTANT: [[SIGN_OPT, UNSIGNED_CONSTANT], [STRING_LITERAL], [CHAR_LITERAL], [TRUE], [FALSE]],
+    UNSIGNED_CONSTANT: [[NUMBER], [IDENTIFIER]],
+    SIGN_OPT: [[SIGN], [Epsilon]],
+}
+# Non-terminal operator: setiap alternatif berupa satu terminal, himpunannya diambil dari rules
+OPERATOR_RULES = [SIGN, RELATIONAL_OPERATOR, ADDITIVE_OPERATOR, MULTIPLICATIVE_OPERATOR]
+
+# Flag kategori token (token '+'/'-' bisa sekaligus SIGN dan ADD)
+F_IDENTIFIER, F_NUMBER, F_STRING, F_CHAR, F_TRUE, F_FALSE = 1, 2, 4, 8, 16, 32
+F_LPAREN, F_RPAREN, F_LBRACKET, F_RBRACKET, F_DOT, F_COMMA, F_NOT = 64, 128, 256, 512, 1024, 2048, 4096
+F_SIGN, F_REL, F_ADD, F_MUL = 8192, 16384, 32768, 65536
+
+FIXED_FLAGS = [
+    (IDENTIFIER, F_IDENTIFIER), (NUMBER, F_NUMBER), (STRING_LITERAL, F_STRING), (CHAR_LITERAL, F_CHAR),
+    (TRUE, F_TRUE), (FALSE, F_FALSE), (LPARENTHESIS, F_LPAREN), (RPARENTHESIS, F_RPAREN),
+    (LBRACKET, F_LBRACKET), (RBRACKET, F_RBRACKET), (DOT, F_DOT), (COMMA, F_COMMA), (NOT, F_NOT),
+]
+
+def _shape(alternatives: List[List[object]]) -> List[List[object]]:
+    return [[Epsilon if isinstance(symbol, Epsilon) else symbol for symbol in alternative] for alternative in alternatives]
+
+class ExpressionParser:
+    """
+    Parser operator-precedence (precedence climbing) untuk <Expression>, dipasang ke CFG
+    sebagai native rule. Tiga level operator biner diambil dari rules:
+    <RelationalOperator> (paling lemah, non-asosiatif, maksimal satu), <AdditiveOperator>
+    (termasuk 'atau'), dan <MultiplicativeOperator> (termasuk 'dan', 'bagi', 'mod');
+    prefix <Sign> di awal <SimpleExpression> dan 'tidak' di <Factor>.
+
+    Setiap token diklasifikasikan sekali (flag per token), lalu setiap level cukup
+    mengecek flag token berikutnya alih-alih mencoba alternatif satu per satu. Hasilnya
+    tetap parse tree yang sama persis dengan grammar (termasuk node epsilon, lewat
+    CFG.reduce untuk aksi semantik/compact), dan terminal 'expected' yang dicatat di
+    setiap posisi berhenti sama dengan yang dicatat CFG, sehingga pesan error tidak berubah.
+
+    Objek ini hanya menyimpan data grammar; flag token dan posisi milik setiap parse ada di
+    ExpressionRun (state.natives[self]), jadi parse bersamaan tidak saling mengganggu.
+    """
+    cfg: CFG
+    operators: Dict[NonTerminal, List[Token|TokenType]]
+
+    def __init__(self, cfg: CFG):
+        self.cfg = cfg
+        self.operators = {}
+
+    def install(self) -> None:
+        """Cek bentuk aturan ekspresi di cfg dan pasang parser ini sebagai native rule <Expression>."""
+        rules = self.cfg.grammar.rules
+        for lhs, expected in EXPECTED_RULES.items():
+            if _shape(rules.get(lhs, [])) != expected:
+                raise ValueError(f"Aturan {lhs} tidak sesuai dengan bentuk yang didukung ExpressionParser")
+        for lhs in OPERATOR_RULES:
+            alternatives = rules.get(lhs, [])
+            if not alternatives or any(len(alt) != 1 or not isinstance(alt[0], (Token, TokenType)) for alt in alternatives):
+                raise ValueError(f"Aturan {lhs} harus berupa daftar terminal tunggal")
+            self.operators[lhs] = [alt[0] for alt in alternatives]
+        self.cfg.addNativeRule(EXPRESSION, self.parseExpression, self.bind)
+
+    def bind(self, state: ParseState) -> None:
+        """
+        Klasifikasi setiap token di state.tokens (dipanggil CFG sebelum setiap parse). Setelah
+        edit (state.edit, lihat CFG.reparseToken) hanya token yang berubah yang diklasifikasi
+        ulang, karena id kind/lexeme buffer hasil Lexer.relex sama dengan buffer sebelumnya.
+        """
+        tokens = state.tokens
+        symbol_flags = list(FIXED_FLAGS)
+        for lhs, flag in ((SIGN, F_SIGN), (RELATIONAL_OPERATOR, F_REL),
+                          (ADDITIVE_OPERATOR, F_ADD), (MULTIPLICATIVE_OPERATOR, F_MUL)):
+            symbol_flags += [(symbol, flag) for symbol in self.operators[lhs]]
+
+        kind_flags: Dict[int, int] = {}
+        token_flags: Dict[Tuple[int, int], int] = {}
+        for symbol, flag in symbol_flags:
+            if isinstance(symbol, Token):
+                key = (tokens.kind_id(symbol.token_type), tokens.lexeme_id(symbol.lexeme))
+                if key[0] >= 0 and key[1] >= 0:
+                    token_flags[key] = token_flags.get(key, 0) | flag
+            else:
+                kind = tokens.kind_id(symbol)
+                if kind >= 0:
+                    kind_flags[kind] = kind_flags.get(kind, 0) | flag
+
+        run = state.natives.get(self)
+        edit = state.edit if run is not None else None
+        start, end = (0, len(tokens)) if edit is None else (edit.start, edit.new_end)
+        flags = array('i', (
+            token_flags.get((kind, lexeme), 0) | kind_flags.get(kind, 0)
+            for kind, lexeme in zip(tokens.kinds[start:end], tokens.lexemes[start:end])
+        ))
+        if edit is None:
+            flags.append(0)  # penjaga untuk posisi EOF
+            state.natives[self] = ExpressionRun(self, state, flags)
+        else:
+            run.flags[edit.start:edit.old_end] = flags
+
+    def parseExpression(self, state: ParseState) -> Node|None:
+        """Native rule <Expression>: parse mulai dari state.currentTokenID."""
+        return state.natives[self].parseExpression()
+
+class ExpressionRun:
+    """Parse <Expression> untuk satu ParseState: flag token dan posisi parse saat ini."""
+    cfg: CFG
+    state: ParseState
+    flags: array
+    operators: Dict[NonTerminal, List[Token|TokenType]]
+
+    def __init__(self, parser: ExpressionParser, state: ParseState, flags: array):
+        self.cfg = parser.cfg
+        self.state = state
+        self.flags = flags
+        self.operators = parser.operators
+        self.pos = 0
+        self.track = True
+        self.plain = True
+
+    # --- HELPERS ---
+    def expect(self, pos: int, symbols: List[Token|TokenType]) -> None:
+        """
+        Catat `symbols` sebagai ekspektasi di `pos`, seperti kegagalan terminal di CFG
+        (pemanggil mengecek self.track terlebih dulu).
+        """
+        state = self.state
+        if pos >= state.max_error_info['max_id']:
+            state.currentTokenID = pos
+            for symbol in symbols:
+                state.record_error(symbol)
+
+    def make(self, lhs: NonTerminal, children: List[Node]) -> Node:
+        if self.plain:
+            node = Node(lhs)
+            node.setChildren(children)
+            return node
+        return self.cfg.reduce(lhs, children)
+
+    def terminal(self) -> Node:
+        """Konsumsi token saat ini sebagai node terminal."""
+        node = Node(self.state.tokens[self.pos])
+        self.pos += 1
+        return node
+
+    # --- ENTRY POINT ---
+    def parseExpression(self) -> Node|None:
+        """Parse <Expression> mulai dari state.currentTokenID."""
+        state = self.state
+        self.pos = state.currentTokenID
+        self.track = state.track_errors
+        self.plain = self.cfg.grammar.actions is None and not self.cfg.compact
+        node = self.expression()
+        state.currentTokenID = self.pos
+        return node
+
+    # --- LEVEL OPERATOR ---
+    def expression(self) -> Node|None:
+        # <Expression> ::= <SimpleExpression> [<RelationalOperator> <SimpleExpression>]
+        left = self.simpleExpression()
+        if left is None:
+            return None
+        start = self.pos
+        if self.flags[start] & F_REL:
+            operator = self.make(RELATIONAL_OPERATOR, [self.terminal()])
+            right = self.simpleExpression()
+            if right is not None:
+                return self.make(EXPRESSION, [left, self.make(EXPRESSION_PRIME, [operator, right])])
+            self.pos = start
+        else:
+            if self.track: self.expect(start, self.operators[RELATIONAL_OPERATOR])
+        return self.make(EXPRESSION, [left, self.make(EXPRESSION_PRIME, [])])
+
+    def simpleExpression(self) -> Node|None:
+        # <SimpleExpression> ::= <SignOpt> <Term> {<AdditiveOperator> <Term>}
+        start = self.pos
+        if self.flags[start] & F_SIGN:
+            sign = self.make(SIGN_OPT, [self.make(SIGN, [self.terminal()])])
+        else:
+            if self.track: self.expect(start, self.operators[SIGN])
+            sign = self.make(SIGN_OPT, [])
+        term = self.term()
+        if term is None:
+            self.pos = start
+            return None
+        signed = self.make(SIGNED_TERM, [sign, term])
+        prime = self.climb(F_ADD, ADDITIVE_OPERATOR, SIMPLE_EXPRESSION_PRIME, self.term)
+        return self.make(SIMPLE_EXPRESSION, [signed, prime])
+
+    def term(self) -> Node|None:
+        # <Term> ::= <Factor> {<MultiplicativeOperator> <Factor>}
+        factor = self.factor()
+        if factor is None:
+            return None
+        prime = self.climb(F_MUL, MULTIPLICATIVE_OPERATOR, TERM_PRIME, self.factor)
+        return self.make(TERM, [factor, prime])
+
+    def climb(self, flag: int, operator_lhs: NonTerminal, prime_lhs: NonTerminal, operand) -> Node:
+        """
+        Operator kiri-asosiatif satu level: kumpulkan (operator, operand) selama token
+        berikutnya adalah operator level ini, lalu bangun rantai <...Prime> dari belakang.
+        Operator yang operand-nya gagal tidak dikonsumsi (Prime menjadi epsilon di situ).
+        """
+        pairs = []
+        flags = self.flags
+        while True:
+            start = self.pos
+            if not flags[start] & flag:
+                if self.track: self.expect(start, self.operators[operator_lhs])
+                break
+            operator = self.make(operator_lhs, [self.terminal()])
+            right = operand()
+            if right is None:
+                self.pos = start
+                break
+            pairs.append((operator, right))
+        prime = self.make(prime_lhs, [])
+        for operator, right in reversed(pairs):
+            prime = self.make(prime_lhs, [operator, right, prime])
+        return prime
+
+    # --- FACTOR ---
+    def factor(self) -> Node|None:
+        # <Factor> ::= IDENTIFIER <FactorTail> | <Constant> | ( <Expression> ) | tidak <Factor>
+        start = self.pos
+        flag = self.flags[start]
+        if flag & F_IDENTIFIER:
+            identifier = self.terminal()
+            return self.make(FACTOR, [identifier, self.factorTail()])
+        if self.track: self.expect(start, [IDENTIFIER])
+
+        constant = self.constant()
+        if constant is not None:
+            return self.make(FACTOR, [constant])
+
+        if flag & F_LPAREN:
+            lparen = self.terminal()
+            inner = self.expression()
+            if inner is not None:
+                if self.flags[self.pos] & F_RPAREN:
+                    return self.make(FACTOR, [lparen, inner, self.terminal()])
+                if self.track: self.expect(self.pos, [RPARENTHESIS])
+            self.pos = start
+        else:
+            if self.track: self.expect(start, [LPARENTHESIS])
+
+        if flag & F_NOT:
+            operator = self.terminal()
+            inner = self.factor()
+            if inner is not None:
+                return self.make(FACTOR, [operator, inner])
+            self.pos = start
+        else:
+            if self.track: self.expect(start, [NOT])
+        return None
+
+    def constant(self) -> Node|None:
+        # <Constant> ::= <SignOpt> <UnsignedConstant> | STRING_LITERAL | CHAR_LITERAL | true | false
+        start = self.pos
+        flags = self.flags
+        if flags[start] & F_SIGN:
+            sign = self.make(SIGN_OPT, [self.make(SIGN, [self.terminal()])])
+        else:
+            if self.track: self.expect(start, self.operators[SIGN])
+            sign = self.make(SIGN_OPT, [])
+        if flags[self.pos] & (F_NUMBER | F_IDENTIFIER):
+            return self.make(CONSTANT, [sign, self.make(UNSIGNED_CONSTANT, [self.terminal()])])
+        if self.track: self.expect(self.pos, [NUMBER, IDENTIFIER])
+        self.pos = start
+
+        flag = flags[start]
+        for symbol, symbol_flag in ((STRING_LITERAL, F_STRING), (CHAR_LITERAL, F_CHAR), (TRUE, F_TRUE), (FALSE, F_FALSE)):
+            if flag & symbol_flag:
+                return self.make(CONSTANT, [self.terminal()])
+            if self.track: self.expect(start, [symbol])
+        return None
+
+    def factorTail(self) -> Node:
+        # <FactorTail> ::= <ParameterList> | <VariableTail>
+        if self.flags[self.pos] & F_LPAREN:
+            parameters = self.parameterList()
+            if parameters is not None:
+                return self.make(FACTOR_TAIL, [parameters])
+        else:
+            if self.track: self.expect(self.pos, [LPARENTHESIS])
+        return self.make(FACTOR_TAIL, [self.variableTail()])
+
+    def variableTail(self) -> Node:
+        # <VariableTail> ::= { [ <Expression> ] | . IDENTIFIER }
+        accessors = []
+        flags = self.flags
+        while True:
+            start = self.pos
+            flag = flags[start]
+            if flag & F_LBRACKET:
+                lbracket = self.terminal()
+                index = self.expression()
+                if index is not None:
+                    if flags[self.pos] & F_RBRACKET:
+                        accessors.append([lbracket, index, self.terminal()])
+                        continue
+                    if self.track: self.expect(self.pos, [RBRACKET])
+                self.pos = start
+                break
+            if flag & F_DOT:
+                dot = self.terminal()
+                if flags[self.pos] & F_IDENTIFIER:
+                    accessors.append([dot, self.terminal()])
+                    continue
+                if self.track: self.expect(self.pos, [IDENTIFIER])
+                self.pos = start
+                break
+            if self.track: self.expect(start, [LBRACKET, DOT])
+            break
+        tail = self.make(VARIABLE_TAIL, [])
+        for children in reversed(accessors):
+            tail = self.make(VARIABLE_TAIL, children + [tail])
+        return tail
+
+    def parameterList(self) -> Node|None:
+        # <ParameterList> ::= ( <Expression> {, <Expression>} )
+        start = self.pos
+        lparen = self.terminal()
+        first = self.expression()
+        if first is None:
+            self.pos = start
+            return None
+        rest = []
+        while True:
+            comma_pos = self.pos
+            if not self.flags[comma_pos] & F_COMMA:
+                if self.track: self.expect(comma_pos, [COMMA])
+                break
+            comma = self.terminal()
+            expression = self.expression()
+            if expression is None:
+                self.pos = comma_pos
+                break
+            rest.append((comma, expression))
+        prime = self.make(EXPRESSION_LIST_PRIME, [])
+        for comma, expression in reversed(rest):
+            prime = self.make(EXPRESSION_LIST_PRIME, [comma, expression, prime])
+        expressions = self.make(EXPRESSION_LIST, [first, prime])
+        if self.flags[self.pos] & F_RPAREN:
+            return self.make(PARAMETER_LIST, [lparen, expressions, self.terminal()])
+        if self.track: self.expect(self.pos, [RPARENTHESIS])
+        self.pos = start
+        return None
@@ -0,0 +1,422 @@
+import json
+import sys
+from typing import Any, Dict, List, Set, Tuple, Union
+
+from lexical.token import Token, TokenType
+from syntax.parsetree import NonTerminal
+from syntax.cfg import Epsilon
+
+# ===== Grammar Analysis (FIRST / FOLLOW / LL(1) Table) =====
+
+Terminal = Union[Token, TokenType]
+# Penanda akhir input di FOLLOW (sama dengan token penjaga CFG.currentToken)
+END_MARKER = TokenType("EOF")
+
+class GrammarAnalysis:
+    """
+    Analisis grammar dari getAllProductionRules():
+    - nullable, FIRST, dan FOLLOW untuk setiap non-terminal
+    - tabel LL(1) klasik (non-terminal, terminal) -> daftar index alternatif, beserta konfliknya
+    - tabel prediksi untuk mode parser CFG(predictive=True)
+    - diagnostik untuk parser backtracking CFG: rekursi kiri, FIRST yang overlap antar
+      alternatif, aturan yang tidak tercapai, dan estimasi biaya backtracking (diagnostics)
+
+    Terminal di grammar berupa Token(kind, lexeme) atau TokenType(kind). Token input
+    dengan kind k dan lexeme l cocok dengan Token(k, l) dan TokenType(k).
+    """
+    rules: Dict[NonTerminal, List[List[object]]]
+    nullable: Set[NonTerminal]
+    first: Dict[NonTerminal, Set[Terminal]]
+    follow: Dict[NonTerminal, Set[Terminal]]
+    table: Dict[NonTerminal, Dict[Terminal, List[int]]]
+    conflicts: List[Tuple[NonTerminal, Terminal, List[int]]]
+
+    def __init__(self, rules: Dict[NonTerminal, List[List[object]]], start: NonTerminal = NonTerminal("<Program>")):
+        self.rules = rules
+        self.start = start
+        self.terminals: List[Terminal] = []
+        for production in rules.values():
+            for alternative in production:
+                for symbol in alternative:
+                    if isinstance(symbol, (Token, TokenType)) and symbol not in self.terminals:
+                        self.terminals.append(symbol)
+
+        self._compute_nullable_first()
+        self._compute_follow()
+        self._compute_table()
+
+    # --- FIRST / NULLABLE ---
+    def _compute_nullable_first(self) -> None:
+        self.nullable = set()
+        self.first = {lhs: set() for lhs in self.rules}
+        changed = True
+        while changed:
+            changed = False
+            for lhs, production in self.rules.items():
+                for alternative in production:
+                    first, nullable = self.first_of_sequence(alternative)
+                    if not first <= self.first[lhs]:
+                        self.first[lhs] |= first
+                        changed = True
+                    if nullable and lhs not in self.nullable:
+                        self.nullable.add(lhs)
+                        changed = True
+
+    def first_of_sequence(self, symbols: List[object]) -> Tuple[Set[Terminal], bool]:
+        """FIRST dari sebuah urutan simbol dan apakah urutan tersebut nullable."""
+        first: Set[Terminal] = set()
+        for symbol in symbols:
+            if isinstance(symbol, Epsilon):
+                continue
+            if isinstance(symbol, NonTerminal):
+                first |= self.first.get(symbol, set())
+                if symbol not in self.nullable:
+                    return first, False
+            else:
+                first.add(symbol)
+                return first, False
+        return first, True
+
+    # --- FOLLOW ---
+    def _compute_follow(self) -> None:
+        self.follow = {lhs: set() for lhs in self.rules}
+        if self.start in self.follow:
+            self.follow[self.start].add(END_MARKER)
+        changed = True
+        while changed:
+            changed = False
+            for lhs, production in self.rules.items():
+                for alternative in production:
+                    for i, symbol in enumerate(alternative):
+                        if not isinstance(symbol, NonTerminal) or symbol not in self.follow:
+                            continue
+                        first, nullable = self.first_of_sequence(alternative[i + 1:])
+                        new = first | (self.follow[lhs] if nullable else set())
+                        if not new <= self.follow[symbol]:
+                            self.follow[symbol] |= new
+                            changed = True
+
+    # --- LL(1) TABLE ---
+    def _compute_table(self) -> None:
+        self.table = {}
+        self.conflicts = []
+        for lhs, production in self.rules.items():
+            row: Dict[Terminal, List[int]] = {}
+            for index, alternative in enumerate(production):
+                first, nullable = self.first_of_sequence(alternative)
+                predict = first | (self.follow[lhs] if nullable else set())
+                for terminal in predict:
+                    row.setdefault(terminal, []).append(index)
+            self.table[lhs] = row
+            for terminal, alternatives in row.items():
+                if len(alternatives) > 1:
+                    self.conflicts.append((lhs, terminal, alternatives))
+
+    # --- TABEL PREDIKSI UNTUK PARSER ---
+    def lookahead_keys(self) -> List[Union[Terminal, None]]:
+        """
+        Kelas lookahead untuk parser prediktif. Index 0 (None) untuk token yang tidak
+        cocok dengan terminal apapun (termasuk EOF), lalu satu kelas per TokenType(kind)
+        dan satu kelas per Token(kind, lexeme) di grammar.
+        """
+        keys: List[Union[Terminal, None]] = [None]
+        keys += [t for t in self.terminals if not isinstance(t, Token)]
+        keys += [t for t in self.terminals if isinstance(t, Token)]
+        return keys
+
+    def matched_terminals(self, key: Union[Terminal, None]) -> Set[Terminal]:
+        """Terminal grammar yang cocok dengan token dari kelas lookahead `key`."""
+        if key is None:
+            return set()
+        if isinstance(key, Token):
+            matched = {key}
+            if TokenType(key.token_type) in self.terminals:
+                matched.add(TokenType(key.token_type))
+            return matched
+        return {key}
+
+    def expected_on_failure(self, symbols: List[object]) -> Tuple[Set[Terminal], bool]:
+        """
+        Terminal yang akan dicatat oleh CFG.record_error jika `symbols` dicoba pada token
+        yang tidak cocok dengan terminal apapun di FIRST-nya, dan apakah urutan tersebut
+        tetap berhasil (tanpa konsumsi token) di situasi itu.
+        Mengikuti urutan alternatif seperti CFG (alternatif pertama yang berhasil dipakai).
+        """
+        expected: Set[Terminal] = set()
+        for symbol in symbols:
+            if isinstance(symbol, Epsilon):
+                continue
+            if isinstance(symbol, NonTerminal):
+                nested, succeeded = set(), False
+                for alternative in self.rules[symbol]:
+                    alt_expected, alt_succeeded = self.expected_on_failure(alternative)
+                    nested |= alt_expected
+                    if alt_succeeded:
+                        succeeded = True
+                        break
+                expected |= nested
+                if not succeeded:
+                    return expected, False
+            else:
+                expected.add(symbol)
+                return expected, False
+        return expected, True
+
+    def predictive_table(self) -> Dict[NonTerminal, List[Tuple[List[int], Set[Terminal]]]]:
+        """
+        Untuk setiap non-terminal, list yang di-index oleh kelas lookahead (lookahead_keys):
+        (index alternatif kandidat sesuai urutan grammar, terminal 'expected' dari
+        alternatif yang dilewati).
+
+        Alternatif dilewati hanya jika pasti gagal: tidak nullable dan token lookahead
+        tidak ada di FIRST-nya. Alternatif nullable selalu menjadi kandidat karena CFG
+        menerimanya tanpa melihat FOLLOW. Dengan begitu hasil parse (dan error yang
+        tercatat) sama persis dengan parser backtracking.
+        """
+        keys = self.lookahead_keys()
+        predictive: Dict[NonTerminal, List[Tuple[List[int], Set[Terminal]]]] = {}
+        for lhs, production in self.rules.items():
+            sequences = [self.first_of_sequence(alternative) for alternative in production]
+            row = []
+            for key in keys:
+                matched = self.matched_terminals(key)
+                candidates: List[int] = []
+                skipped_expected: Set[Terminal] = set()
+                for index, (first, nullable) in enumerate(sequences):
+                    if nullable or first & matched:
+                        candidates.append(index)
+                    else:
+                        skipped_expected |= self.expected_on_failure(production[index])[0]
+                row.append((candidates, skipped_expected))
+            predictive[lhs] = row
+        return predictive
+
+    # --- DIAGNOSTIK BACKTRACKING ---
+    def leading_symbols(self, alternative: List[object]) -> List[NonTerminal]:
+        """Non-terminal yang bisa di-parse di posisi awal alternatif (didahului simbol nullable)."""
+        leading = []
+        for symbol in alternative:
+            if isinstance(symbol, Epsilon):
+                continue
+            if not isinstance(symbol, NonTerminal):
+                break
+            leading.append(symbol)
+            if symbol not in self.nullable:
+                break
+        return leading
+
+    def left_recursion(self) -> Dict[NonTerminal, List[NonTerminal]]:
+        """
+        Non-terminal yang rekursif kiri (A =>+ A ...), beserta satu siklus terpendek
+        [A, B, ..., A]. Parser CFG tidak pernah berhenti pada aturan seperti ini.
+        """
+        edges = {
+            lhs: [symbol for alternative in production for symbol in self.leading_symbols(alternative)
+                  if symbol in self.rules]
+            for lhs, production in self.rules.items()
+        }
+        cycles: Dict[NonTerminal, List[NonTerminal]] = {}
+        for lhs in self.rules:
+            parents: Dict[NonTerminal, NonTerminal] = {}
+            queue = [lhs]
+            for current in queue:
+                for target in edges[current]:
+                    if target == lhs:
+                        path = [current]
+                        while path[-1] != lhs:
+                            path.append(parents[path[-1]])
+                        cycles[lhs] = path[::-1] + [lhs]
+                        break
+                    if target not in parents:
+                        parents[target] = current
+                        queue.append(target)
+                if lhs in cycles:
+                    break
+        return cycles
+
+    def first_overlaps(self) -> List[Tuple[NonTerminal, int, int, Set[Terminal]]]:
+        """
+        Pasangan alternatif (lhs, i, j, terminal) yang FIRST-nya overlap. Token dengan kind
+        k dan lexeme l cocok dengan Token(k, l) dan TokenType(k), jadi keduanya dianggap
+        overlap. Parser CFG mencoba alternatif i dulu dan mem-parse ulang dari awal
+        dengan alternatif j jika i gagal.
+        """
+        overlaps = []
+        for lhs, production in self.rules.items():
+            firsts = [self.first_of_sequence(alternative)[0] for alternative in production]
+            for i in range(len(production)):
+                for j in range(i + 1, len(production)):
+                    shared = {
+                        terminal for terminal in firsts[i]
+                        if any(self.same_token(terminal, other) for other in firsts[j])
+                    }
+                    if shared:
+                        overlaps.append((lhs, i, j, shared))
+        return overlaps
+
+    @staticmethod
+    def same_token(a: Terminal, b: Terminal) -> bool:
+        """Apakah ada token input yang cocok dengan terminal `a` dan `b` sekaligus."""
+        kind_a = a.token_type if isinstance(a, Token) else a
+        kind_b = b.token_type if isinstance(b, Token) else b
+        if kind_a != kind_b:
+            return False
+        return not (isinstance(a, Token) and isinstance(b, Token)) or a.lexeme == b.lexeme
+
+    def unreachable(self) -> List[NonTerminal]:
+        """Non-terminal yang tidak bisa dicapai dari start symbol."""
+        reached = {self.start}
+        queue = [self.start]
+        for lhs in queue:
+            for alternative in self.rules.get(lhs, []):
+                for symbol in alternative:
+                    if isinstance(symbol, NonTerminal) and symbol not in reached:
+                        reached.add(symbol)
+                        queue.append(symbol)
+        return [lhs for lhs in self.rules if lhs not in reached]
+
+    def backtracking(self) -> Dict[NonTerminal, Tuple[float, int, Union[Terminal, None]]]:
+        """
+        Estimasi biaya backtracking parser CFG (tanpa packrat) per non-terminal:
+        (faktor, kedalaman, lookahead terburuk).
+
+        Faktor untuk lookahead t adalah berapa kali token t di posisi awal `lhs` cocok
+        dengan terminal grammar sebelum `lhs` selesai: setiap alternatif kandidat di-parse
+        dari awal, jadi faktornya dijumlahkan antar alternatif dan dikalikan lewat
+        non-terminal yang bersarang di posisi yang sama. Faktor > 1 berarti token yang
+        sama di-parse ulang; karena setiap tingkat nesting (misal kurung di ekspresi)
+        mengalikan faktornya lagi, faktor per tingkat yang naik adalah tanda backtracking
+        eksponensial. Kedalaman adalah jumlah titik pilihan ambigu (lebih dari satu
+        alternatif mengkonsumsi t) yang bersarang di posisi itu.
+        Non-terminal rekursif kiri bernilai inf.
+        """
+        keys = [key for key in self.lookahead_keys() if key is not None]
+        cache: Dict[Tuple[NonTerminal, Terminal], Tuple[float, int]] = {}
+        active: Set[Tuple[NonTerminal, Terminal]] = set()
+
+        def rule_cost(lhs: NonTerminal, key: Terminal, matched: Set[Terminal]) -> Tuple[float, int]:
+            entry = cache.get((lhs, key))
+            if entry is not None:
+                return entry
+            if (lhs, key) in active:
+                return float("inf"), 0
+            active.add((lhs, key))
+            factor, depth, branches = 0, 0, 0
+            for alternative in self.rules[lhs]:
+                alternative_factor, alternative_depth = sequence_cost(alternative, key, matched)
+                if alternative_factor:
+                    branches += 1
+                    factor += alternative_factor
+                    depth = max(depth, alternative_depth)
+            active.discard((lhs, key))
+            cache[(lhs, key)] = entry = (factor, depth + (branches > 1))
+            return entry
+
+        def sequence_cost(symbols: List[object], key: Terminal, matched: Set[Terminal]) -> Tuple[float, int]:
+            factor, depth = 0, 0
+            for symbol in symbols:
+                if isinstance(symbol, Epsilon):
+                    continue
+                if not isinstance(symbol, NonTerminal):
+                    return factor + (symbol in matched), depth
+                if self.first.get(symbol, set()) & matched:
+                    symbol_factor, symbol_depth = rule_cost(symbol, key, matched)
+                    factor += symbol_factor
+                    depth = max(depth, symbol_depth)
+                if symbol not in self.nullable:
+                    break
+            return factor, depth
+
+        costs: Dict[NonTerminal, Tuple[float, int, Union[Terminal, None]]] = {}
+        for lhs in self.rules:
+            worst: Tuple[float, int, Union[Terminal, None]] = (0, 0, None)
+            for key in keys:
+                factor, depth = rule_cost(lhs, key, self.matched_terminals(key))
+                if (factor, depth) > worst[:2]:
+                    worst = (factor, depth, key)
+            costs[lhs] = worst
+        return costs
+
+    def diagnostics(self) -> Dict[str, Any]:
+        """Semua diagnostik grammar dalam bentuk dict yang bisa di-serialize ke JSON."""
+        costs = self.backtracking()
+        worst = max(costs.items(), key=lambda item: item[1][:2]) if costs else None
+
+        def number(value: float) -> Union[int, None]:
+            return None if value == float("inf") else int(value)
+
+        return {
+            "start": str(self.start),
+            "left_recursion": {str(lhs): [str(symbol) for symbol in cycle]
+                               for lhs, cycle in self.left_recursion().items()},
+            "first_overlaps": [
+                {"nonterminal": str(lhs), "alternatives": [i, j], "terminals": sorted(map(str, shared))}
+                for lhs, i, j, shared in self.first_overlaps()
+            ],
+            "nullable": [str(lhs) for lhs in self.rules if lhs in self.nullable],
+            "unreachable": [str(lhs) for lhs in self.unreachable()],
+            "ll1_conflicts": [
+                {"nonterminal": str(lhs), "terminal": str(terminal), "alternatives": alternatives}
+                for lhs, terminal, alternatives in self.conflicts
+            ],
+            "backtracking": {
+                "max_factor": number(worst[1][0]) if worst else 0,
+                "max_depth": worst[1][1] if worst else 0,
+                "worst_nonterminal": str(worst[0]) if worst else None,
+                "nonterminals": {
+                    str(lhs): {"factor": number(factor), "depth": depth,
+                               "lookahead": None if key is None else str(key)}
+                    for lhs, (factor, depth, key) in costs.items()
+                },
+            },
+        }
+
+    def report(self) -> str:
+        """Ringkasan FIRST/FOLLOW dan konflik LL(1) dalam bentuk teks."""
+        lines = []
+        for lhs in self.rules:
+            nullable = " (nullable)" if lhs in self.nullable else ""
+            lines.append(f"{lhs}{nullable}")
+            lines.append(f"    FIRST : {', '.join(sorted(map(str, self.first[lhs])))}")
+            lines.append(f"    FOLLOW: {', '.join(sorted(map(str, self.follow[lhs])))}")
+        lines.append("")
+        lines.append(f"LL(1) conflicts: {len(self.conflicts)}")
+        for lhs, terminal, alternatives in self.conflicts:
+            lines.append(f"    {lhs} on {terminal}: alternatives {alternatives}")
+        return "\n".join(lines)
+
+def main():
+    """
+    Mencetak FIRST/FOLLOW dan konflik LL(1) dari grammar Pascal-S.
+    Opsi:
+        --json              cetak diagnostics() sebagai JSON
+        --max-factor N      exit code 1 jika ada rekursi kiri atau faktor backtracking > N
+    """
+    from syntax.rules import getAllProductionRules
+    args = sys.argv[1:]
+    max_factor = None
+    if "--max-factor" in args:
+        index = args.index("--max-factor")
+        try:
+            max_factor = int(args[index + 1])
+        except (IndexError, ValueError):
+            print("Usage: python -m syntax.grammar [--json] [--max-factor N]", file=sys.stderr)
+            sys.exit(2)
+        del args[index:index + 2]
+
+    analysis = GrammarAnalysis(getAllProductionRules())
+    diagnostics = analysis.diagnostics()
+    if "--json" in args:
+        print(json.dumps(diagnostics, indent=2))
+    else:
+        print(analysis.report())
+
+    if max_factor is not None:
+        factor = diagnostics["backtracking"]["max_factor"]
+        if diagnostics["left_recursion"] or factor is None or factor > max_factor:
+            print(f"Grammar check failed: left recursion {list(diagnostics['left_recursion'])}, "
+                  f"max backtracking factor {factor} (limit {max_factor})", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
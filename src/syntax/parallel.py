@@ -0,0 +1,147 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from lexical.token import TokenBuffer
+from syntax.parsetree import NonTerminal, Node
+from syntax.cfg import CFG, ParseState
+
+# ===== Parsing Paralel Deklarasi Subprogram =====
+
+SUBPROGRAM_DECLARATION = NonTerminal("<SubprogramDeclaration>")
+SUBPROGRAM_KEYWORDS = ("prosedur", "fungsi")
+# Keyword pembuka blok yang ditutup oleh 'selesai'
+BLOCK_OPENERS = ("mulai", "kasus", "rekaman")
+
+def scanSubprograms(tokens: TokenBuffer) -> List[Tuple[int, int]]:
+    """
+    Mencari span token [awal, akhir) setiap deklarasi prosedur/fungsi top-level (tanpa ';'
+    penutupnya) dengan menghitung nesting mulai/kasus/rekaman ... selesai. Subprogram
+    bersarang ikut masuk ke span subprogram luarnya. Scan berhenti di 'mulai' program utama,
+    atau di 'selesai' yang tidak punya pasangan (span setelahnya di-parse biasa).
+    """
+    keyword = tokens.kind_id("KEYWORD")
+    ids = {tokens.lexeme_id(name): name for name in SUBPROGRAM_KEYWORDS + BLOCK_OPENERS + ("selesai",)}
+    ids.pop(-1, None)
+    spans = []
+    if keyword < 0 or not ids:
+        return spans
+
+    blocks: List[str] = []  # pembuka blok yang belum ditutup
+    pending = 0             # subprogram (termasuk yang bersarang) yang body-nya belum selesai
+    start = 0
+    kinds, lexemes = tokens.kinds, tokens.lexemes
+    for index in range(len(kinds)):
+        if kinds[index] != keyword:
+            continue
+        name = ids.get(lexemes[index])
+        if name is None:
+            continue
+        if name in SUBPROGRAM_KEYWORDS:
+            if not blocks:
+                if not pending:
+                    start = index
+                pending += 1
+        elif name in BLOCK_OPENERS:
+            if not blocks and not pending and name == "mulai":
+                break  # body program utama
+            blocks.append(name)
+        else:
+            if not blocks:
+                break
+            opener = blocks.pop()
+            # 'mulai' di luar blok apa pun adalah body dari subprogram terdalam yang terbuka
+            if opener == "mulai" and not blocks and pending:
+                pending -= 1
+                if not pending:
+                    spans.append((start, index + 1))
+    return spans
+
+# --- WORKER ---
+_worker_cfg: CFG|None = None
+
+def _initWorker(options: Dict[str, Any]) -> None:
+    """Initializer proses worker: bangun parser sekali per proses dengan opsi yang sama."""
+    global _worker_cfg
+    from syntax.syntax import SyntaxAnalyzer
+    _worker_cfg = SyntaxAnalyzer(**options).cfg
+
+def _parseSpan(tokens: TokenBuffer) -> Node|None:
+    """Parse satu span sebagai <SubprogramDeclaration>, None jika gagal atau tidak habis."""
+    node, state = _worker_cfg.parseToken(tokens, SUBPROGRAM_DECLARATION)
+    if node is None or state.currentTokenID != len(tokens):
+        return None
+    return node
+
+class ParallelSubprograms:
+    """
+    Mode parallel SyntaxAnalyzer: sebelum parse, deklarasi prosedur/fungsi top-level
+    (lihat scanSubprograms) di-parse di ProcessPoolExecutor, lalu hasilnya dipasang ke
+    parse <Program> lewat native rule <SubprogramDeclaration>: di posisi awal span yang
+    berhasil, subtree dari worker langsung dipakai dan token dilompati sampai akhir span.
+
+    Parse <SubprogramDeclaration> hanya bergantung pada token mulai dari posisinya, dan
+    span berakhir di 'selesai' body-nya, jadi hasilnya sama dengan parse sekuensial. Span
+    yang gagal di worker di-parse ulang oleh aturan biasa di proses utama, sehingga pesan
+    error tetap sama. Error di dalam span yang berhasil tidak perlu dicatat karena semua
+    tokennya terkonsumsi (error terjauh selalu berada di luar span).
+
+    Hasil worker untuk setiap parse disimpan di state.natives[self] (posisi awal span ->
+    (node, posisi akhir)), jadi beberapa parse bisa berjalan bersamaan dengan pool yang sama.
+    """
+    cfg: CFG
+
+    def __init__(self, cfg: CFG, options: Dict[str, Any], workers: int|None = None, min_spans: int = 2):
+        """
+        Args:
+            options (Dict[str, Any]): Argumen SyntaxAnalyzer untuk parser di setiap worker
+            workers (int|None): Jumlah proses worker (default: os.cpu_count())
+            min_spans (int): Jumlah span minimum agar worker dipakai (dengan kurang dari
+                2 worker, semua span di-parse biasa di proses utama)
+        """
+        self.cfg = cfg
+        self.options = options
+        self.workers = workers or os.cpu_count() or 1
+        self.min_spans = min_spans
+        self.executor = None
+        self.fallback = None
+        self.lock = threading.Lock()
+
+    def install(self) -> None:
+        """Pasang native rule <SubprogramDeclaration> (aturan biasa dipakai sebagai fallback)."""
+        self.fallback = self.cfg.production_rules[SUBPROGRAM_DECLARATION]
+        self.cfg.addNativeRule(SUBPROGRAM_DECLARATION, self.parseSubprogram, self.prepare)
+
+    def prepare(self, state: ParseState) -> None:
+        """Parse semua span subprogram top-level di state.tokens secara paralel."""
+        results: Dict[int, Tuple[Node, int]] = {}
+        state.natives[self] = results
+        tokens = state.tokens
+        spans = scanSubprograms(tokens)
+        if self.workers < 2 or len(spans) < self.min_spans:
+            return
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_initWorker,
+                                                    initargs=(self.options,))
+            executor = self.executor
+        buffers = [tokens.slice(start, end) for start, end in spans]
+        chunksize = max(1, len(buffers) // (self.workers * 4))
+        for (start, end), node in zip(spans, executor.map(_parseSpan, buffers, chunksize=chunksize)):
+            if node is not None:
+                results[start] = (node, end)
+
+    def parseSubprogram(self, state: ParseState) -> Node|None:
+        entry = state.natives[self].get(state.currentTokenID)
+        if entry is None:
+            return self.fallback(state)
+        node, state.currentTokenID = entry
+        return node
+
+    def close(self) -> None:
+        """Hentikan proses worker."""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
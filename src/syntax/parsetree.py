@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Callable, List, Tuple
 
 from lexical.token import Token
 
@@ -10,37 +10,142 @@ class NonTerminal(str):
 class Node:
     value: NonTerminal|Token
     children: List["Node"] = []
+    # Token pertama dan terakhir di subtree (None jika subtree kosong), dicatat saat parsing.
+    # Token dari TokenBuffer adalah TokenView, jadi posisinya di buffer ada di first.index/last.index
+    # (token dari TokenStream adalah Token biasa)
+    first: Token|None = None
+    last: Token|None = None
     
     def __init__(self, value: NonTerminal|Token):
         self.value = value
         self.children: List["Node"] = []
+        if isinstance(value, Token):
+            self.first = self.last = value
 
     def addChild(self, node:"Node") -> None:
-        self.children.append(node)
+        self.addChildren([node])
     
     def addChildren(self, nodes:List["Node"]) -> None:
         self.children.extend(nodes)
+        self.setSpan(self.children)
 
-    def __str__(self, level=0, prefix="", is_last=True):
-        
-        # 1. Tentukan string untuk node ini
-        if level == 0:
-            # Node root tidak memiliki konektor
-            tree_str = f"{self.value}\n"
-            child_prefix = "" # Anak dari root tidak punya awalan
+    def setChildren(self, nodes:List["Node"]) -> None:
+        """Pasang `nodes` sebagai children (list dipakai langsung) dan catat token pertama/terakhir."""
+        self.children = nodes
+        self.setSpan(nodes)
+
+    def setSpan(self, nodes:List["Node"]) -> None:
+        """Token pertama/terakhir node non-terminal dari anak-anaknya."""
+        for node in nodes:
+            if node.first is not None:
+                self.first = node.first
+                break
+        for node in reversed(nodes):
+            if node.last is not None:
+                self.last = node.last
+                break
+
+    def label(self) -> str:
+        """Teks node ini saat dicetak."""
+        return str(self.value)
+
+    def treeChildren(self) -> List["Node"]:
+        """Anak yang dicetak di bawah node ini."""
+        return self.children
+
+    def __str__(self) -> str:
+        lines: List[str] = []
+        self.writeTree(lines.append)
+        return "".join(lines)
+
+    def writeTree(self, write: Callable[[str], Any]) -> None:
+        """
+        Tulis tree baris per baris ke `write` (misal sys.stdout.write). Traversal memakai
+        stack eksplisit (node, prefix, is_last), jadi kedalaman tree tidak dibatasi recursion limit.
+        """
+        # Node root tidak memiliki konektor, dan anak dari root tidak punya awalan
+        write(f"{self.label()}\n")
+        stack = [(self, "", True, True)]
+        while stack:
+            node, prefix, is_last, is_root = stack.pop()
+            if not is_root:
+                # Node anak memiliki konektor
+                connector = "└── " if is_last else "├── "
+                write(f"{prefix}{connector}{node.label()}\n")
+                # Tentukan awalan untuk anak-anak dari node INI
+                prefix += "    " if is_last else "│   "
+
+            # Anak di-push terbalik agar keluar berurutan
+            children = node.treeChildren()
+            for i in range(len(children) - 1, -1, -1):
+                stack.append((children[i], prefix, i == len(children) - 1, False))
+
+# (index anak, subtree) untuk setiap anak kosong (hanya epsilon) yang dibuang
+Skipped = Tuple[Tuple[int, "CompactNode"], ...]
+
+class CompactNode(Node):
+    """
+    Node parse tree mode compact (CFG(compact=True)):
+    - anak non-terminal yang kosong (hanya epsilon) tidak disimpan di `nodes`, posisinya dan
+      subtree kosongnya (di-intern, dipakai bersama) dicatat di `skipped`
+    - non-terminal dengan tepat satu anak tersisa (rantai pass-through, misal
+      <Expression> -> ... -> <UnsignedConstant> -> NUMBER) di-elide menjadi satu node;
+      non-terminal yang di-elide dicatat di `collapsed` (luar -> dalam) beserta `skipped`-nya
+
+    `value` dan `children` tetap memberikan bentuk parse tree lengkap (dihitung saat
+    diakses), sehingga kode yang membaca Node biasa (ASTConverter) tetap bisa dipakai.
+    Data yang tersimpan ada di `symbol`, `nodes`, `skipped`, dan `collapsed`.
+    """
+    symbol: NonTerminal|Token
+    nodes: List[Node]
+    skipped: Skipped
+    collapsed: Tuple[Tuple[NonTerminal, Skipped], ...]
+
+    def __init__(self, symbol: NonTerminal|Token, nodes: List[Node], skipped: Skipped = (),
+                 collapsed: Tuple[Tuple[NonTerminal, Skipped], ...] = ()):
+        self.symbol = symbol
+        self.nodes = nodes
+        self.skipped = skipped
+        self.collapsed = collapsed
+        if isinstance(symbol, Token):
+            self.first = self.last = symbol
+        else:
+            self.setSpan(nodes)
+
+    @property
+    def value(self) -> NonTerminal|Token:
+        return self.collapsed[0][0] if self.collapsed else self.symbol
+
+    @property
+    def children(self) -> List[Node]:
+        if self.collapsed:
+            skipped = self.collapsed[0][1]
+            children = [self.inner(1)]
         else:
-            # Node anak memiliki konektor
-            connector = "└── " if is_last else "├── "
-            tree_str = f"{prefix}{connector}{self.value}\n"
-            
-            # Tentukan awalan untuk anak-anak dari node INI
-            child_prefix = prefix + ("    " if is_last else "│   ")
-
-        # 2. Rekursif panggil untuk semua anak
-        for i, child in enumerate(self.children):
-            # Cek apakah anak tersebut adalah anak terakhir
-            is_child_last = (i == len(self.children) - 1)
-            # Tambahkan representasi string anak ke string tree utama
-            tree_str += child.__str__(level + 1, prefix=child_prefix, is_last=is_child_last)
-        
-        return tree_str
\ No newline at end of file
+            skipped = self.skipped
+            children = self.nodes
+        if not skipped:
+            return children
+        children = list(children)
+        for index, empty in skipped:
+            children.insert(index, empty)
+        return children
+
+    def expand(self) -> Node:
+        """Node biasa satu level (value dan children bentuk lengkap), anak-anaknya tetap compact."""
+        node = Node(self.value)
+        node.children = self.children
+        node.first, node.last = self.first, self.last
+        return node
+
+    def inner(self, depth: int) -> Node:
+        """Node ini tanpa `depth` non-terminal terluar dari rantai `collapsed`."""
+        if depth >= len(self.collapsed) and not isinstance(self.symbol, NonTerminal):
+            return Node(self.symbol)
+        return CompactNode(self.symbol, self.nodes, self.skipped, self.collapsed[depth:])
+
+    def label(self) -> str:
+        return " > ".join([str(lhs) for lhs, _ in self.collapsed] + [str(self.symbol)])
+
+    def treeChildren(self) -> List[Node]:
+        return self.nodes
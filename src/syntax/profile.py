@@ -0,0 +1,213 @@
+import json
+import threading
+from dataclasses import dataclass, field, asdict
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+from syntax.parsetree import NonTerminal, Node
+from syntax.cfg import CFG, Epsilon, ParseState
+
+# ===== Profiler Parse per Non-Terminal =====
+
+@dataclass
+class AlternativeStats:
+    """Statistik satu alternatif: dicoba, berhasil, gagal, token terbuang, waktu (detik)."""
+    rhs: str
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    wasted: int = 0
+    time: float = 0.0
+
+@dataclass
+class RuleStats:
+    """
+    Statistik satu non-terminal. `wasted` adalah jumlah token yang sudah dikonsumsi
+    alternatif sebelum alternatif itu gagal (kerja yang dibuang oleh backtracking).
+    `time` termasuk waktu non-terminal anak, `self_time` tidak.
+    """
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    wasted: int = 0
+    time: float = 0.0
+    self_time: float = 0.0
+    alternatives: List[AlternativeStats] = field(default_factory=list)
+
+    def empty(self) -> "RuleStats":
+        """RuleStats kosong dengan alternatif yang sama."""
+        return RuleStats(alternatives=[AlternativeStats(alternative.rhs) for alternative in self.alternatives])
+
+    def add(self, other: "RuleStats") -> None:
+        """Tambahkan statistik `other` (RuleStats non-terminal yang sama)."""
+        for target, source in [(self, other)] + list(zip(self.alternatives, other.alternatives)):
+            target.calls += source.calls
+            target.successes += source.successes
+            target.failures += source.failures
+            target.wasted += source.wasted
+            target.time += source.time
+        self.self_time += other.self_time
+
+@dataclass
+class ProfileRun:
+    """Statistik satu pass parse dan kedalaman/waktu anak aturan yang sedang berjalan."""
+    key: Tuple[bool, bool]
+    stats: Dict[NonTerminal, RuleStats] = field(default_factory=dict)
+    active: Dict[NonTerminal, int] = field(default_factory=dict)
+    child_times: List[float] = field(default_factory=list)
+
+class ParseProfiler:
+    """
+    Mode profil SyntaxAnalyzer(profile=True): setiap aturan di cfg.production_rules diganti
+    versi berinstrumen yang mencatat RuleStats per non-terminal dan AlternativeStats per
+    alternatif. Aturan biasa dibuat ulang lewat CFG.makeRule dengan hook `observe` per
+    alternatif, native rule (misal syntax.expression) hanya dicatat per non-terminal.
+
+    Closure execute_rules di CFG tanpa hook tidak berubah, jadi tanpa profiler tidak ada
+    overhead. Hanya untuk engine rekursif (parse, parseMemo, parseIncremental); hasil dari
+    memo packrat tidak dihitung sebagai pemanggilan. Waktu non-terminal yang rekursif hanya
+    dihitung di pemanggilan terluarnya.
+
+    Statistik dicatat per parse di state.natives[self] (ProfileRun) dan dijumlahkan ke
+    `stats` oleh collect(state) setelah parse selesai (lihat SyntaxAnalyzer.parse). Jika
+    parse diulang (parse diagnostik setelah parse cepat two_phase atau parse incremental
+    yang gagal), hanya pass terakhir yang dihitung.
+    """
+    cfg: CFG
+    stats: Dict[NonTerminal, RuleStats]
+
+    def __init__(self, cfg: CFG):
+        self.cfg = cfg
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def install(self) -> None:
+        """Pasang aturan berinstrumen (harus dipanggil setelah semua native rule terpasang)."""
+        for lhs, rule in list(self.cfg.production_rules.items()):
+            stats = self.stats[lhs] = RuleStats()
+            if lhs in self.cfg.native_rules:
+                self.cfg.production_rules[lhs] = self.timed(lhs, rule)
+            else:
+                compiled = self.cfg.grammar.compiled_rules[lhs]
+                stats.alternatives = [
+                    AlternativeStats(" ".join("ε" if isinstance(symbol, Epsilon) else str(symbol)
+                                              for symbol, _ in alternative))
+                    for alternative in compiled
+                ]
+                self.cfg.production_rules[lhs] = self.timed(lhs, self.cfg.makeRule(lhs, compiled, self.observer(lhs)))
+
+    def reset(self) -> None:
+        """Kosongkan semua statistik (aturan berinstrumen tetap terpasang)."""
+        with self.lock:
+            for lhs, stats in self.stats.items():
+                self.stats[lhs] = stats.empty()
+
+    def collect(self, state: ParseState) -> None:
+        """Jumlahkan statistik parse `state` ke `stats`."""
+        run = state.natives.pop(self, None)
+        if run is None:
+            return
+        with self.lock:
+            for lhs, stats in run.stats.items():
+                self.stats[lhs].add(stats)
+
+    # --- INSTRUMENTASI ---
+    def run(self, state: ParseState) -> "ProfileRun":
+        """Catatan pass parse yang sedang berjalan pada `state` (baru jika pass berganti)."""
+        key = (state.track_errors, state.diagnostic)
+        run = state.natives.get(self)
+        if run is None or run.key != key:
+            # Pass baru dimulai dari awal token: statistik pass sebelumnya dibuang
+            run = state.natives[self] = ProfileRun(key)
+        return run
+
+    def ruleStats(self, run: "ProfileRun", lhs: NonTerminal) -> RuleStats:
+        stats = run.stats.get(lhs)
+        if stats is None:
+            stats = run.stats[lhs] = self.stats[lhs].empty()
+        return stats
+
+    def timed(self, lhs: NonTerminal, rule: Callable[[ParseState], Node|None]) -> Callable[[ParseState], Node|None]:
+        """Bungkus `rule` dengan pencatatan pemanggilan, hasil, dan waktu."""
+        def profiled(state: ParseState) -> Node|None:
+            run = self.run(state)
+            stats = self.ruleStats(run, lhs)
+            active, child_times = run.active, run.child_times
+            stats.calls += 1
+            depth = active.get(lhs, 0)
+            active[lhs] = depth + 1
+            child_times.append(0.0)
+            started = perf_counter()
+            try:
+                node = rule(state)
+            finally:
+                elapsed = perf_counter() - started
+                active[lhs] = depth
+                children = child_times.pop()
+                stats.self_time += elapsed - children
+                if not depth:
+                    stats.time += elapsed
+                if child_times:
+                    child_times[-1] += elapsed
+            if node is None:
+                stats.failures += 1
+            else:
+                stats.successes += 1
+            return node
+        return profiled
+
+    def observer(self, lhs: NonTerminal) -> Callable[[ParseState, Any, int], Callable[[bool], None]]:
+        """Hook `observe` untuk CFG.makeRule: mencatat setiap alternatif `lhs` yang dicoba."""
+        indices = {id(alternative): index for index, alternative in enumerate(self.cfg.grammar.compiled_rules[lhs])}
+
+        def observe(state: ParseState, alternative: Any, initial_token_id: int) -> Callable[[bool], None]:
+            run = state.natives[self]
+            stats = run.stats[lhs]
+            alternative_stats = stats.alternatives[indices[id(alternative)]]
+            alternative_stats.calls += 1
+            outermost = run.active[lhs] == 1
+            started = perf_counter()
+
+            def finish(matched: bool) -> None:
+                if outermost:
+                    alternative_stats.time += perf_counter() - started
+                if matched:
+                    alternative_stats.successes += 1
+                else:
+                    wasted = state.currentTokenID - initial_token_id
+                    alternative_stats.failures += 1
+                    alternative_stats.wasted += wasted
+                    stats.wasted += wasted
+            return finish
+        return observe
+
+    # --- LAPORAN ---
+    def toDict(self) -> Dict[str, Any]:
+        """Statistik dalam bentuk dict (non-terminal -> RuleStats sebagai dict), urut waktu terbesar."""
+        ordered = sorted(self.stats.items(), key=lambda item: (-item[1].time, item[0]))
+        return {str(lhs): asdict(stats) for lhs, stats in ordered if stats.calls}
+
+    def toJSON(self) -> str:
+        return json.dumps(self.toDict(), indent=2)
+
+    def formatTable(self, limit: int|None = None) -> str:
+        """
+        Tabel teks: satu baris per non-terminal yang pernah dipanggil (urut waktu terbesar),
+        diikuti alternatif yang pernah dicoba. Waktu dalam milidetik.
+        """
+        header = f"{'Rule':<40} {'calls':>9} {'ok':>9} {'fail':>9} {'wasted':>9} {'time ms':>10} {'self ms':>10}"
+        lines = [header, "-" * len(header)]
+        rows = [(lhs, stats) for lhs, stats in self.stats.items() if stats.calls]
+        rows.sort(key=lambda item: (-item[1].time, item[0]))
+        for lhs, stats in rows[:limit]:
+            lines.append(f"{str(lhs):<40} {stats.calls:>9} {stats.successes:>9} {stats.failures:>9} "
+                         f"{stats.wasted:>9} {stats.time * 1000:>10.2f} {stats.self_time * 1000:>10.2f}")
+            for index, alternative in enumerate(stats.alternatives):
+                if not alternative.calls:
+                    continue
+                label = f"  #{index} {alternative.rhs}"
+                if len(label) > 40:
+                    label = label[:37] + "..."
+                lines.append(f"{label:<40} {alternative.calls:>9} {alternative.successes:>9} "
+                             f"{alternative.failures:>9} {alternative.wasted:>9} {alternative.time * 1000:>10.2f}")
+        return "\n".join(lines)
@@ -5,9 +5,9 @@ from typing import List
 from lexical.lexer import Lexer, LexicalError
 from syntax.rules import getAllProductionRules
 
-from syntax.cfg import CFG
+from syntax.cfg import CFG, ParseState
 from syntax.parsetree import Node
-from lexical.token import Token
+from lexical.token import Token, TokenBuffer, TokenEdit, TokenStream
 
 class SyntaxError(Exception):
     """Custom exception untuk error sintaks."""
@@ -21,30 +21,131 @@ class SyntaxError(Exception):
         self.column = column
 
 class SyntaxAnalyzer():
-    """Kelas untuk SyntaxAnalyzer"""
+    """
+    Kelas untuk SyntaxAnalyzer. Grammar terkompilasi (self.cfg) dipakai bersama, sedangkan
+    setiap parse memakai ParseState sendiri, jadi satu SyntaxAnalyzer bisa dipakai oleh
+    beberapa thread sekaligus. Hanya reparse mode incremental yang bergantung pada parse
+    sebelumnya (self.state).
+    """
     cfg: CFG
+    state: ParseState|None
 
-    def __init__(self):
-        self.cfg = CFG()
+    def __init__(self, packrat:bool=False, memo_limit:int=200000, predictive:bool=False, iterative:bool=False,
+                 build_ast:bool=False, compact:bool=False, two_phase:bool=False, generated:bool=False,
+                 pratt:bool=False, parallel:bool=False, workers:int|None=None, incremental:bool=False,
+                 profile:bool=False):
+        """
+        Args:
+            compact (bool): parse() mengembalikan parse tree compact (lihat syntax.parsetree.CompactNode)
+            two_phase (bool): Parse cepat tanpa pencatatan error, parse ulang hanya jika gagal
+                (pesan SyntaxError tetap sama)
+            generated (bool): Gunakan parser hasil generate dari rules.py (syntax.codegen, di-cache
+                di syntax/__generated__/), bukan interpretasi aturan oleh CFG
+            build_ast (bool): parse() langsung mengembalikan AST (ProgramNode) yang dibangun oleh
+                aksi semantik semantic.ast_builder selama parsing, tanpa parse tree perantara
+            pratt (bool): Parse <Expression> dengan parser operator-precedence (syntax.expression),
+                parse tree dan pesan error tetap sama
+            parallel (bool): Parse deklarasi prosedur/fungsi top-level secara paralel di proses
+                worker (syntax.parallel) sebelum parse <Program>; hasil dan pesan error tetap sama
+            workers (int|None): Jumlah proses worker untuk parallel (default: jumlah CPU)
+            incremental (bool): Simpan hasil parse agar reparse() setelah edit (lihat Lexer.relex)
+                hanya mem-parse ulang bagian yang terdampak. Tidak bisa digabung dengan iterative,
+                generated, atau parallel
+            profile (bool): Catat statistik parse per non-terminal dan alternatif di self.profiler
+                (syntax.profile.ParseProfiler). Tidak bisa digabung dengan iterative atau generated
+        """
+        self.cfg = CFG(packrat=packrat, memo_limit=memo_limit, predictive=predictive, iterative=iterative,
+                       compact=compact, two_phase=two_phase, incremental=incremental)
+        self.build_ast = build_ast
+        if generated and iterative:
+            raise ValueError("Parser hasil generate bersifat rekursif, tidak bisa digabung dengan iterative")
+        if incremental and (iterative or generated or parallel):
+            raise ValueError("Mode incremental hanya didukung engine rekursif CFG (tanpa iterative, generated, parallel)")
+        if profile and (iterative or generated):
+            raise ValueError("Mode profile hanya didukung engine rekursif CFG (tanpa iterative, generated)")
+        self.generated = generated
+        self.pratt = pratt
+        self.options = dict(packrat=packrat, memo_limit=memo_limit, predictive=predictive, iterative=iterative,
+                            build_ast=build_ast, compact=compact, two_phase=two_phase, generated=generated,
+                            pratt=pratt)
+        self.profiler = None
+        if profile:
+            from syntax.profile import ParseProfiler
+            self.profiler = ParseProfiler(self.cfg)
+        self.subprograms = None
+        if parallel:
+            from syntax.parallel import ParallelSubprograms
+            self.subprograms = ParallelSubprograms(self.cfg, self.options, workers)
+        self.state = None
         self.setupProductionRules()
 
     def setupProductionRules(self):
         self.cfg.addRules(getAllProductionRules())
+        if self.build_ast:
+            from semantic.ast_builder import ASTBuilder
+            self.cfg.setActions(ASTBuilder().actions())
+        if self.generated:
+            from syntax.codegen import loadGeneratedParser
+            self.cfg.setGenerated(loadGeneratedParser())
+        self.installNativeRules()
+
+    def installNativeRules(self):
+        """Pasang native rule dan profiler (harus terakhir, agar native rule ikut diinstrumentasi)."""
+        if self.pratt:
+            from syntax.expression import ExpressionParser
+            ExpressionParser(self.cfg).install()
+        if self.subprograms is not None:
+            self.subprograms.install()
+        if self.profiler is not None:
+            self.profiler.install()
 
-    def parse(self, tokens:List[Token]) -> Node|SyntaxError:
-        parse_tree = self.cfg.parseToken(tokens)
+    def parse(self, tokens:TokenBuffer|List[Token]) -> Node|SyntaxError:
+        """
+        Parse `tokens`. Dengan TokenStream (Lexer.tokenize_lazy), lexing berjalan bersamaan
+        dengan parsing dan LexicalError bisa dilempar dari sini. Token yang tidak mungkin
+        dibaca lagi dibuang selama parse (lihat CFG StreamState), kecuali pada mode
+        two_phase, generated, pratt, dan parallel yang membutuhkan seluruh token.
+        """
+        if self.subprograms is not None:
+            # scanSubprograms dan worker butuh seluruh token beserta source-nya
+            if not isinstance(tokens, TokenBuffer) or isinstance(tokens, TokenStream):
+                tokens = TokenBuffer.from_tokens(tokens)
+        result, state = self.cfg.parseToken(tokens)
+        if self.profiler is not None:
+            self.profiler.collect(state)
+        if self.cfg.incremental:
+            self.state = state
+        return self.checkResult(result, state)
 
+    def reparse(self, tokens:TokenBuffer, edit:TokenEdit) -> Node|SyntaxError:
+        """
+        Parse ulang setelah edit teks (SyntaxAnalyzer(incremental=True)): `tokens` dan `edit`
+        adalah hasil Lexer.relex dari buffer yang terakhir di-parse/di-reparse. Subtree yang
+        token (dan lookahead)-nya tidak berubah dipakai ulang. Hasil dan SyntaxError sama
+        dengan parse(tokens).
+        """
+        if self.state is None:
+            raise ValueError("reparse membutuhkan parse() sebelumnya")
+        result = self.cfg.reparseToken(self.state, tokens, edit)
+        if self.profiler is not None:
+            self.profiler.collect(self.state)
+        return self.checkResult(result, self.state)
+
+    def checkResult(self, parse_tree:Node|None, state:ParseState) -> Node|SyntaxError:
+        """Kembalikan hasil parse jika semua token terpakai, selain itu lempar SyntaxError."""
         if parse_tree is not None:
             # Parsing berhasil, TAPI kita harus cek apakah semua token terpakai.
-            final_token = self.cfg.currentToken()
+            final_token = state.currentToken()
             if final_token.token_type == "EOF":
+                if self.build_ast:
+                    return parse_tree.value # success, AST dari aksi semantik
                 return parse_tree # success
             else:
                 # Parsing selesai tapi masih ada sisa token
                 raise SyntaxError(message=f"\n\tUnexpected token {final_token}", line=final_token.line, column=final_token.column)
         else:
             # Parsing Gagal (parser mengembalikan None)
-            error_info = self.cfg.max_error_info
+            error_info = state.max_error_info
             
             if error_info['max_id'] != -1 and error_info['found']:
                 found = error_info['found']
@@ -62,6 +163,11 @@ class SyntaxAnalyzer():
                 # Fallback jika tidak ada info error (alasan lain)
                 raise SyntaxError(message="Something went wrong")
 
+    def close(self) -> None:
+        """Hentikan proses worker mode parallel (jika ada)."""
+        if self.subprograms is not None:
+            self.subprograms.close()
+
 def main():
     """
     Driver utama untuk parser.
@@ -94,7 +200,7 @@ def main():
     lexer = Lexer(DFA_FILE_PATH)
     tokens = []
     try:
-        tokens = lexer.tokenize(source_code)
+        tokens = lexer.tokenize_buffer(source_code)
     except LexicalError as e:
         print(str(e), file=sys.stderr)
         sys.exit(1) # Keluar jika ada error leksikal
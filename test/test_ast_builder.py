@@ -0,0 +1,78 @@
+import glob
+import os
+
+import pytest
+
+from lexical.lexer import Lexer, LexicalError
+from semantic.ast_converter import ASTConverter
+from semantic.ast_nodes import ProgramNode
+from syntax.syntax import SyntaxAnalyzer, SyntaxError
+
+# AST yang dibangun aksi semantik selama parsing (build_ast) harus sama dengan hasil
+# ASTConverter pada parse tree dari parser default.
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DFA_FILE_PATH = os.path.join(os.path.dirname(TEST_DIR), 'src', 'lexical', 'dfa.json')
+
+# Akses array/record dan pemanggilan fungsi di ruas kanan ekspresi
+EXPRESSIONS = """program e;
+mulai
+  x := -a[i + 1].b + f(c, d[2], g(1)) * h.i.j mod (k bagi 2);
+  y[1].z := tidak (p.q < r) dan s(t)
+selesai.
+"""
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+@pytest.fixture(scope="module")
+def programs(lexer):
+    """(nama, token, AST dari ASTConverter) untuk setiap file milestone yang lolos parser."""
+    programs = []
+    reference = SyntaxAnalyzer()
+    sources = {"expressions": EXPRESSIONS}
+    for path in sorted(glob.glob(os.path.join(TEST_DIR, 'milestone-*', '*.pas'))):
+        with open(path) as f:
+            sources[os.path.relpath(path, TEST_DIR)] = f.read()
+    for name, source in sources.items():
+        try:
+            tokens = lexer.tokenize_buffer(source)
+            tree = reference.parse(tokens)
+        except (LexicalError, SyntaxError):
+            continue
+        programs.append((name, tokens, ASTConverter().convert(tree)))
+    assert programs[0][0] == "expressions" and len(programs) > 8
+    return programs
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"packrat": True, "predictive": True},
+    {"iterative": True},
+    {"two_phase": True},
+    {"pratt": True},
+    {"generated": True},
+])
+def test_build_ast_matches_converter(programs, options):
+    parser = SyntaxAnalyzer(build_ast=True, **options)
+    for name, tokens, expected in programs:
+        ast = parser.parse(tokens)
+        assert isinstance(ast, ProgramNode)
+        assert ast == expected, name
+
+def test_converter_on_compact_tree(programs):
+    # ASTConverter menerima parse tree compact dengan hasil yang sama
+    parser = SyntaxAnalyzer(compact=True)
+    for name, tokens, expected in programs:
+        assert ASTConverter().convert(parser.parse(tokens)) == expected, name
+
+def test_expression_accessors(programs):
+    ast = next(ast for name, _, ast in programs if name == "expressions")
+    first, second = ast.block.children
+    assert repr(first.value.left) == (
+        "UnaryOpNode(op='-', expr=FieldAccessNode(record=ArrayAccessNode(array=Var('a'), "
+        "index=BinOpNode(op='+', left=Var('i'), right=Num(1))), field_name='b'))"
+    )
+    call = first.value.right.left.left
+    assert (call.proc_name, [type(arg).__name__ for arg in call.arguments]) == ("f", ["VarNode", "ArrayAccessNode", "ProcedureCallNode"])
+    assert repr(second.target) == "FieldAccessNode(record=ArrayAccessNode(array=Var('y'), index=Num(1)), field_name='z')"
@@ -0,0 +1,91 @@
+import inspect
+
+import pytest
+
+from semantic import ast_nodes
+from semantic.ast_decorator import ASTDecorator
+from semantic.ast_nodes import *
+from semantic.print_tree import ASTPrinter
+
+NODE_CLASSES = [cls for cls in vars(ast_nodes).values() if inspect.isclass(cls) and issubclass(cls, ASTNode)]
+
+def test_node_classes_are_slotted():
+    assert len(NODE_CLASSES) > 25
+    for cls in NODE_CLASSES:
+        # Semua kelas di hierarki memakai slots, jadi instance tidak punya __dict__
+        assert '__slots__' in cls.__dict__ and '__dict__' not in dir(cls), cls
+    node = BinOpNode('+', VarNode('a'), NumNode(1))
+    assert not hasattr(node, '__dict__')
+    with pytest.raises(AttributeError):
+        node.extra = 1
+
+def test_annotation_fields():
+    node = VarNode('a')
+    assert (node.type, node.symbol_entry) == (None, None)
+    # Anotasi tidak ditampilkan di repr, tapi ikut dibandingkan
+    assert repr(node) == "Var('a')"
+    assert node == VarNode('a')
+    node.type = "integer"
+    assert node != VarNode('a')
+    assert repr(BinOpNode('+', node, NumNode(1))) == "BinOpNode(op='+', left=Var('a'), right=Num(1))"
+
+def test_symbol_annotation():
+    annotation = SymbolAnnotation(tab_index=3, lev=1, adr=0)
+    assert (annotation.ref, annotation.block_index) == (None, None)
+    assert not hasattr(annotation, '__dict__')
+    with pytest.raises(AttributeError):
+        annotation.extra = 1
+    node = VarNode('a')
+    node.type, node.symbol_entry = "integer", annotation
+    # Field None tidak ditampilkan, ref hanya jika > 0
+    assert node._get_annotations() == "type:integer, t_idx:3, lev:1, adr:0"
+    node.symbol_entry = SymbolAnnotation(tab_index=5, ref=2, lev=0, adr=4)
+    assert node._get_annotations() == "type:integer, t_idx:5, a_idx:2, lev:0, adr:4"
+    block = CompoundNode([])
+    block.type, block.symbol_entry = "BLOCK", SymbolAnnotation(block_index=1, lev=0, ref=0)
+    assert block._get_annotations() == "type:BLOCK, b_idx:1, lev:0"
+
+def test_field_tables():
+    assert node_fields(VarDeclNode) == ('var_name', 'type_node')
+    assert node_fields(ForNode) == ('variable', 'start_expr', 'direction', 'end_expr', 'body')
+    assert inline_fields(ForNode) == ('variable',)
+    assert inline_fields(ParameterNode) == ('names',)
+    assert inline_fields(BinOpNode) == ('op',)
+    # Tipe deklarasi sudah terlihat di anotasi, jadi bukan anak
+    assert child_fields(VarDeclNode) == ('var_name',)
+    assert child_fields(TypeDeclNode) == ('type_name', 'value')
+    # Dihitung sekali per kelas
+    assert node_fields(ForNode) is node_fields(ForNode) and child_fields(VarDeclNode) is child_fields(VarDeclNode)
+
+class Visitor:
+    def visit_VarNode(self, node):
+        return "var"
+
+    def fallback(self, node):
+        return "default"
+
+class ChildVisitor(Visitor):
+    def visit_VarNode(self, node):
+        return "child var"
+
+def test_node_dispatch():
+    visitor = Visitor()
+    dispatch = NodeDispatch(visitor, 'visit_', visitor.fallback)
+    assert dispatch[VarNode](VarNode('a')) == "var"
+    assert dispatch[NumNode](NumNode(1)) == "default"
+    assert set(dispatch) == {VarNode, NumNode}
+    # Handler di-cache per kelas: atribut yang ditambahkan kemudian tidak dipakai
+    visitor.visit_NumNode = lambda node: "num"
+    assert dispatch[NumNode](NumNode(1)) == "default"
+    assert NodeDispatch(visitor, 'visit_', visitor.fallback)[NumNode](NumNode(1)) == "num"
+    # Override di subclass dipakai
+    child = ChildVisitor()
+    assert NodeDispatch(child, 'visit_', child.fallback)[VarNode](VarNode('a')) == "child var"
+
+def test_walker_dispatch_tables():
+    decorator = ASTDecorator()
+    assert decorator.dispatch[BinOpNode].__func__ is ASTDecorator.visit_BinOpNode
+    assert decorator.dispatch[TypeNode] == decorator.generic_visit
+    printer = ASTPrinter()
+    assert printer.labels[BinOpNode](BinOpNode('+', VarNode('a'), NumNode(1))) == "BinOp('+')"
+    assert printer.labels[NoOpNode] == printer._label_default
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from lexical.lexer import Lexer
+from semantic.ast_decorator import ASTDecorator, PatchedSymbolTable
+from semantic.ast_nodes import *
+from semantic.semantic import SemanticAnalyzer
+from syntax.syntax import SyntaxAnalyzer
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DFA_FILE_PATH = os.path.join(os.path.dirname(TEST_DIR), 'src', 'lexical', 'dfa.json')
+
+SUBPROGRAM = """program Sub;
+variabel
+  i, n: integer;
+
+prosedur tambah(angka: integer; batas: integer);
+variabel
+  i: integer;
+mulai
+  i := angka;
+  selama i < batas lakukan
+    i := i + 1;
+  n := n + i
+selesai;
+
+mulai
+  n := 0;
+  tambah(n, 10);
+  untuk i := 1 ke 5 lakukan
+    tambah(i, n);
+  writeln(n)
+selesai.
+"""
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+def parse(lexer, source):
+    return SyntaxAnalyzer(build_ast=True).parse(lexer.tokenize_buffer(source))
+
+def walk(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        for name in node_fields(node.__class__):
+            value = getattr(node, name)
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, ASTNode))
+
+def test_each_name_is_looked_up_once(lexer, monkeypatch):
+    ast = parse(lexer, SUBPROGRAM)
+    lookups = []
+    original = PatchedSymbolTable.lookup
+    monkeypatch.setattr(PatchedSymbolTable, 'lookup', lambda self, name: lookups.append(name) or original(self, name))
+    ASTDecorator().generate_decorated_ast(ast)
+
+    nodes = list(walk(ast))
+    names = [node.name for node in nodes if isinstance(node, VarNode)]
+    names += [node.proc_name for node in nodes if isinstance(node, ProcedureCallNode) and node.proc_name != "writeln"]
+    names += [node.variable for node in nodes if isinstance(node, ForNode)]
+    assert sorted(lookups) == sorted(names)
+
+def test_annotations_point_to_resolved_entries(lexer):
+    decorated, symbol_table, _ = SemanticAnalyzer().analyze(parse(lexer, SUBPROGRAM))
+    annotated = 0
+    for node in walk(decorated):
+        name = getattr(node, 'name', None) or getattr(node, 'var_name', None) or getattr(node, 'proc_name', None)
+        if isinstance(node, ParameterNode):
+            name = node.names[0]
+        if not isinstance(node, (VarNode, VarDeclNode, ParameterNode, ProcedureCallNode)) or name == "writeln":
+            continue
+        entry = symbol_table.get_entry(node.symbol_entry.tab_index)
+        assert entry.identifier == name
+        assert node.symbol_entry.lev == entry.lev
+        if not isinstance(node, ProcedureCallNode):
+            assert (node.type, node.symbol_entry.adr, node.symbol_entry.ref) == (entry.type.name, entry.adr, entry.ref)
+        annotated += 1
+    assert annotated == 21
+
+    # i di dalam prosedur adalah variabel lokal level 1, bukan i global
+    procedure = decorated.declarations[2]
+    first_assign = procedure.block.children[0]
+    assert first_assign.target.symbol_entry.lev == 1
+    assert decorated.block.children[2].body.arguments[0].symbol_entry.lev == 0
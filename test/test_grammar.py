@@ -0,0 +1,117 @@
+import json
+import sys
+
+import pytest
+
+from lexical.token import Token, TokenType
+from syntax import grammar as grammar_module
+from syntax.cfg import Epsilon
+from syntax.grammar import GrammarAnalysis, END_MARKER
+from syntax.parsetree import NonTerminal
+from syntax.rules import getAllProductionRules
+
+S, A, B, U = NonTerminal("<S>"), NonTerminal("<A>"), NonTerminal("<B>"), NonTerminal("<U>")
+ID = TokenType("IDENTIFIER")
+BEGIN, END = Token("KEYWORD", "mulai"), Token("KEYWORD", "selesai")
+SEMICOLON = TokenType("SEMICOLON")
+
+# <S> ::= <A> ; | <B> selesai
+# <A> ::= <A> IDENTIFIER | mulai       (rekursif kiri)
+# <B> ::= KEYWORD | ε                   (KEYWORD overlap dengan mulai dari <A>)
+# <U> ::= selesai                       (tidak tercapai dari <S>)
+RULES = {
+    S: [[A, SEMICOLON], [B, END]],
+    A: [[A, ID], [BEGIN]],
+    B: [[TokenType("KEYWORD")], [Epsilon()]],
+    U: [[END]],
+}
+
+# <E> ::= <T> + <E> | <T>,  <T> ::= IDENTIFIER | ( <E> )
+E, T = NonTerminal("<E>"), NonTerminal("<T>")
+PLUS, LPAREN, RPAREN = Token("ARITHMETIC_OPERATOR", "+"), TokenType("LPARENTHESIS"), TokenType("RPARENTHESIS")
+EXPRESSION_RULES = {
+    E: [[T, PLUS, E], [T]],
+    T: [[ID], [LPAREN, E, RPAREN]],
+}
+
+@pytest.fixture
+def analysis():
+    return GrammarAnalysis(RULES, start=S)
+
+def test_first_follow(analysis):
+    assert analysis.nullable == {B}
+    assert analysis.first[S] == {BEGIN, TokenType("KEYWORD"), END}
+    assert analysis.first[A] == {BEGIN}
+    assert analysis.follow[A] == {SEMICOLON, ID}
+    assert analysis.follow[B] == {END}
+    assert analysis.follow[S] == {END_MARKER}
+
+def test_diagnostics(analysis):
+    diagnostics = analysis.diagnostics()
+    assert diagnostics["start"] == "<S>"
+    assert diagnostics["left_recursion"] == {"<A>": ["<A>", "<A>"]}
+    assert diagnostics["unreachable"] == ["<U>"]
+    assert diagnostics["nullable"] == ["<B>"]
+    # mulai cocok dengan KEYWORD, jadi alternatif <S> overlap walaupun tidak konflik di tabel LL(1)
+    assert diagnostics["first_overlaps"] == [
+        {"nonterminal": "<S>", "alternatives": [0, 1], "terminals": ["KEYWORD(mulai)"]},
+        {"nonterminal": "<A>", "alternatives": [0, 1], "terminals": ["KEYWORD(mulai)"]},
+    ]
+    assert diagnostics["ll1_conflicts"] == [{"nonterminal": "<A>", "terminal": "KEYWORD(mulai)", "alternatives": [0, 1]}]
+    # Rekursi kiri membuat faktor backtracking tak hingga
+    assert diagnostics["backtracking"]["max_factor"] is None
+    assert diagnostics["backtracking"]["nonterminals"]["<A>"]["factor"] is None
+    json.dumps(diagnostics)
+
+def test_indirect_left_recursion():
+    X, Y = NonTerminal("<X>"), NonTerminal("<Y>")
+    analysis = GrammarAnalysis({X: [[B, Y, ID]], Y: [[X], [SEMICOLON]], B: RULES[B]}, start=X)
+    # <B> nullable, jadi <Y> ada di posisi awal <X>
+    assert analysis.left_recursion() == {X: [X, Y, X], Y: [Y, X, Y]}
+
+def test_backtracking_factor():
+    diagnostics = GrammarAnalysis(EXPRESSION_RULES, start=E).diagnostics()
+    assert diagnostics["left_recursion"] == {} and diagnostics["unreachable"] == []
+    assert diagnostics["first_overlaps"] == [
+        {"nonterminal": "<E>", "alternatives": [0, 1], "terminals": ["IDENTIFIER", "LPARENTHESIS"]},
+    ]
+    # <T> di-parse dua kali untuk setiap lookahead: sekali per alternatif <E>
+    backtracking = diagnostics["backtracking"]
+    assert (backtracking["max_factor"], backtracking["max_depth"], backtracking["worst_nonterminal"]) == (2, 1, "<E>")
+    assert backtracking["nonterminals"]["<T>"] == {"factor": 1, "depth": 0, "lookahead": "IDENTIFIER"}
+
+def test_report(analysis):
+    lines = analysis.report().splitlines()
+    assert lines[:3] == ["<S>", "    FIRST : KEYWORD, KEYWORD(mulai), KEYWORD(selesai)", "    FOLLOW: EOF"]
+    assert "<B> (nullable)" in lines
+    conflicts = lines[lines.index("") + 1:]
+    assert conflicts == ["LL(1) conflicts: 1", "    <A> on KEYWORD(mulai): alternatives [0, 1]"]
+
+def test_pascal_grammar_is_clean():
+    diagnostics = GrammarAnalysis(getAllProductionRules()).diagnostics()
+    assert diagnostics["left_recursion"] == {} and diagnostics["unreachable"] == []
+
+def run_main(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['grammar.py', *args])
+    try:
+        grammar_module.main()
+        code = 0
+    except SystemExit as e:
+        code = e.code
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+def test_cli_max_factor(monkeypatch, capsys):
+    factor = GrammarAnalysis(getAllProductionRules()).diagnostics()["backtracking"]["max_factor"]
+    assert factor > 1
+    code, out, err = run_main(monkeypatch, capsys, "--max-factor", "1")
+    assert code == 1 and out.startswith("<Program>")
+    assert err == f"Grammar check failed: left recursion [], max backtracking factor {factor} (limit 1)\n"
+    code, out, err = run_main(monkeypatch, capsys, "--json", "--max-factor", str(factor))
+    assert code == 0 and err == ""
+    assert json.loads(out)["backtracking"]["max_factor"] == factor
+
+@pytest.mark.parametrize("args", [["--max-factor"], ["--max-factor", "x"]])
+def test_cli_max_factor_usage(monkeypatch, capsys, args):
+    code, _, err = run_main(monkeypatch, capsys, *args)
+    assert code == 2 and err.startswith("Usage:")
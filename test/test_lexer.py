@@ -0,0 +1,193 @@
+import errno
+import glob
+import io
+import os
+import pickle
+import sys
+
+import pytest
+
+from lexical import lexer as lexer_module
+from lexical.lexer import Lexer, LexicalError
+from lexical.token import Token, SourceToken, TokenBuffer, TokenView
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DFA_FILE_PATH = os.path.join(os.path.dirname(TEST_DIR), 'src', 'lexical', 'dfa.json')
+
+# Semua jenis token, operator multi-karakter, string/char, dan kedua bentuk komentar
+SAMPLE = """program Contoh1;
+{ komentar
+  blok } variabel a, b-c: larik [1..10] dari real;
+mulai
+  a := 3.14e-2 + 2E5 * 7 bagi 2 mod 3; (* komentar (* baris *)
+  jika (a <= b) dan (a <> c) atau tidak (a >= 1) maka s := 'halo dunia' selain-itu s := '';
+  c := 'x'; b := a[1].x; untuk i := 10 turun-ke 1 lakukan a < b; a > b; a = b / c
+selesai.
+"""
+
+def corpus():
+    """Source .pas di test/ yang lolos lexer."""
+    sources = []
+    for path in sorted(glob.glob(os.path.join(TEST_DIR, '*', '*.pas'))):
+        with open(path) as f:
+            sources.append(f.read())
+    return [SAMPLE] + sources
+
+def token_list(tokens):
+    return [(token.token_type, token.lexeme, token.line, token.column) for token in tokens]
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+def test_compiled_table_matches_dfa_rules(lexer):
+    # Setiap karakter yang disebut dfa.json dan beberapa karakter di luar tabel
+    chars = [chr(code) for code in range(len(lexer.char_class_ids))] + ["é", "λ", "あ", "😀"]
+    n_classes = lexer.n_classes
+    for state, name in enumerate(lexer.state_names):
+        for char in chars:
+            code = ord(char)
+            char_class = lexer.char_class_ids[code] if code < len(lexer.char_class_ids) else lexer.default_class_id
+            target = lexer.transition_table[state * n_classes + char_class]
+            expected = lexer._resolve_transition(name, char)
+            assert (lexer.state_names[target] if target >= 0 else None) == expected, (name, char)
+    assert [lexer.accept_types[lexer.state_ids[name]] for name in lexer.final_states] == list(lexer.final_states.values())
+
+def test_tokenize_sample(lexer):
+    tokens = [(token.token_type, token.lexeme) for token in lexer.tokenize(SAMPLE)]
+    assert tokens[:6] == [("KEYWORD", "program"), ("IDENTIFIER", "Contoh1"), ("SEMICOLON", ";"),
+                          ("KEYWORD", "variabel"), ("IDENTIFIER", "a"), ("COMMA", ",")]
+    for expected in [("IDENTIFIER", "b-c"), ("RANGE_OPERATOR", ".."), ("NUMBER", "3.14e-2"), ("NUMBER", "2E5"),
+                     ("ARITHMETIC_OPERATOR", "bagi"), ("ARITHMETIC_OPERATOR", "mod"), ("ASSIGN_OPERATOR", ":="),
+                     ("RELATIONAL_OPERATOR", "<="), ("RELATIONAL_OPERATOR", "<>"), ("RELATIONAL_OPERATOR", ">="),
+                     ("LOGICAL_OPERATOR", "dan"), ("LOGICAL_OPERATOR", "atau"), ("LOGICAL_OPERATOR", "tidak"),
+                     ("STRING_LITERAL", "'halo dunia'"), ("CHAR_LITERAL", "''"), ("CHAR_LITERAL", "'x'"),
+                     ("KEYWORD", "selain-itu"), ("KEYWORD", "turun-ke"), ("DOT", "."), ("ARITHMETIC_OPERATOR", "/")]:
+        assert expected in tokens
+    assert not any("komentar" in lexeme for _, lexeme in tokens)
+    assert tokens[-2:] == [("KEYWORD", "selesai"), ("DOT", ".")]
+
+@pytest.mark.parametrize("source, message, line, column", [
+    ("program p;\n  a := 'abc", "Unterminated string literal", 2, 8),
+    ("program p;\n  a := 1 $ 2", "Invalid character '$'", 2, 10),
+    ("x := 1;\n\n   @", "Invalid character '@'", 3, 4),
+])
+def test_lexical_errors(lexer, source, message, line, column):
+    with pytest.raises(LexicalError) as error:
+        lexer.tokenize(source)
+    assert (error.value.message, error.value.line, error.value.column) == (message, line, column)
+
+def test_source_token_offsets(lexer):
+    tokens = lexer.tokenize(SAMPLE)
+    for token in tokens:
+        assert isinstance(token, SourceToken)
+        assert token.source is SAMPLE and token.lexeme == SAMPLE[token.start:token.end]
+        assert not hasattr(token, '__dict__')
+    token = tokens[1]
+    assert token == Token("IDENTIFIER", "Contoh1") and hash(token) == hash(Token("IDENTIFIER", "Contoh1"))
+    assert (str(token), tuple(token), token.line, token.column) == ("IDENTIFIER(Contoh1)", ("IDENTIFIER", "Contoh1"), 1, 16)
+
+def test_source_token_pickle(lexer):
+    tokens = lexer.tokenize(SAMPLE)
+    copies = pickle.loads(pickle.dumps(tokens))
+    assert token_list(copies) == token_list(tokens)
+    assert all(isinstance(token, SourceToken) for token in copies)
+    # Source ikut di-pickle sekali untuk semua token
+    assert all(token.source is copies[0].source for token in copies)
+
+def test_token_buffer_matches_tokenize(lexer):
+    for source in corpus():
+        try:
+            expected = token_list(lexer.tokenize(source))
+        except LexicalError:
+            continue
+        buffer = lexer.tokenize_buffer(source)
+        assert token_list(buffer) == expected
+        assert [token_list([buffer[index]]) for index in range(-3, 0)] == [[token] for token in expected[-3:]]
+        assert token_list(TokenBuffer.from_tokens(lexer.tokenize(source))) == expected
+        middle = len(buffer) // 2
+        assert token_list(buffer.slice(middle, len(buffer))) == expected[middle:]
+
+def test_token_view(lexer):
+    buffer = lexer.tokenize_buffer(SAMPLE)
+    view = buffer[1]
+    assert isinstance(view, TokenView) and not hasattr(view, '__dict__')
+    assert view == Token("IDENTIFIER", "Contoh1") and hash(view) == hash(Token("IDENTIFIER", "Contoh1"))
+    assert buffer.kind_id("NOT_A_KIND") == -1 and buffer.lexeme_id("Contoh1") == buffer.lexemes[1]
+    with pytest.raises(IndexError):
+        buffer[len(buffer)]
+
+def test_token_view_pickle(lexer):
+    buffer = lexer.tokenize_buffer(SAMPLE)
+    views = pickle.loads(pickle.dumps(list(buffer)))
+    assert token_list(views) == token_list(buffer)
+    # Semua view tetap merujuk ke satu buffer hasil unpickle
+    assert all(isinstance(view, TokenView) and view.buffer is views[0].buffer for view in views)
+
+# Operator multi-karakter, real dengan eksponen, string, dan komentar rapat agar setiap
+# ukuran chunk memotong di tengah salah satunya
+BOUNDARY_SOURCE = "a:=b<=c<>d>=e..f:=3.25e+10;s:='abc def';{ komentar\n panjang }(* lain\n*)g:=h.i;x:=''"
+
+def stream_result(lexer, source, chunk_size):
+    try:
+        return token_list(lexer.tokenize_stream(io.StringIO(source), chunk_size))
+    except LexicalError as e:
+        return (e.message, e.line, e.column)
+
+def tokenize_result(lexer, source):
+    try:
+        return token_list(lexer.tokenize(source))
+    except LexicalError as e:
+        return (e.message, e.line, e.column)
+
+def test_stream_chunk_boundaries(lexer):
+    expected = tokenize_result(lexer, BOUNDARY_SOURCE)
+    assert len(expected) == 27
+    for chunk_size in range(1, len(BOUNDARY_SOURCE) + 2):
+        assert stream_result(lexer, BOUNDARY_SOURCE, chunk_size) == expected, chunk_size
+
+@pytest.mark.parametrize("source", [
+    "a := 'abc",               # string tidak ditutup di akhir input
+    "a := 1 { tidak ditutup",  # komentar tidak ditutup dibuang sampai EOF
+    "a := 1 (* tidak ditutup",
+    "a := 12 $ 3",
+    "{" + "x" * 300 + "} a := 1", # komentar lebih panjang dari chunk
+    "s := '" + "y" * 300 + "'",
+])
+def test_stream_edge_cases(lexer, source):
+    expected = tokenize_result(lexer, source)
+    for chunk_size in (1, 2, 3, 5, 8, 64):
+        assert stream_result(lexer, source, chunk_size) == expected, chunk_size
+
+def test_stream_corpus(lexer):
+    for source in corpus():
+        expected = tokenize_result(lexer, source)
+        for chunk_size in (7, 61, 4096):
+            assert stream_result(lexer, source, chunk_size) == expected
+
+def run_main(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['lexer.py', *args])
+    with pytest.raises(SystemExit) as exit_info:
+        lexer_module.main()
+    return exit_info.value.code, capsys.readouterr().err
+
+def test_main_reports_read_and_write_errors(monkeypatch, capsys, tmp_path):
+    source = tmp_path / "input.pas"
+    source.write_text(SAMPLE)
+    output = tmp_path / "out.txt"
+
+    def failing_stream(self, fileobj, chunk_size=65536):
+        yield from Lexer.tokenize(self, fileobj.read(10))[:1]
+        raise OSError(errno.EIO, "Input/output error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Lexer, 'tokenize_stream', failing_stream)
+        code, err = run_main(patch, capsys, str(source), str(output))
+    assert code == 1 and err.startswith(f"Error reading file '{source}'")
+    # Output parsial dihapus
+    assert not output.exists()
+
+    blocked = tmp_path / "bukan-folder"
+    blocked.write_text("")
+    code, err = run_main(monkeypatch, capsys, str(source), str(blocked / "out.txt"))
+    assert code == 1 and err.startswith(f"Error writing to file '{blocked / 'out.txt'}'")
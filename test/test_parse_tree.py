@@ -0,0 +1,79 @@
+import io
+import os
+
+import pytest
+
+from lexical.lexer import Lexer
+from lexical.token import Token, TokenView
+from semantic.ast_converter import ASTConverter
+from syntax.parsetree import Node, NonTerminal
+from syntax.syntax import SyntaxAnalyzer
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DFA_FILE_PATH = os.path.join(os.path.dirname(TEST_DIR), 'src', 'lexical', 'dfa.json')
+
+with open(os.path.join(TEST_DIR, 'milestone-3', 'program.pas')) as f:
+    PROGRAM = f.read()
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+def leaves(node):
+    """Token di subtree `node` (urut kiri ke kanan)."""
+    if isinstance(node.value, Token):
+        return [node.value]
+    return [token for child in node.children for token in leaves(child)]
+
+def subtrees(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"packrat": True, "pratt": True}])
+def test_spans_cover_subtree_tokens(lexer, options):
+    tokens = lexer.tokenize_buffer(PROGRAM)
+    tree = SyntaxAnalyzer(**options).parse(tokens)
+    assert (tree.first.index, tree.last.index) == (0, len(tokens) - 1)
+    checked = 0
+    for node in subtrees(tree):
+        covered = leaves(node)
+        if not covered:
+            # Subtree kosong (hanya epsilon) tidak punya span
+            assert node.first is None and node.last is None
+            continue
+        assert isinstance(node.first, TokenView) and isinstance(node.last, TokenView)
+        assert list(tokens)[node.first.index:node.last.index + 1] == covered
+        checked += 1
+    assert checked > len(tokens)
+
+def test_spans_from_token_stream(lexer):
+    # Token dari TokenStream adalah Token biasa tanpa index
+    tree = SyntaxAnalyzer().parse(lexer.tokenize_lazy(io.StringIO(PROGRAM)))
+    for node in subtrees(tree):
+        covered = leaves(node)
+        if covered:
+            assert (node.first, node.last) == (covered[0], covered[-1])
+            assert (node.first.line, node.first.column) == (covered[0].line, covered[0].column)
+
+def test_span_from_children():
+    first, middle, last = Token("IDENTIFIER", "a"), Token("ASSIGN_OPERATOR", ":="), Token("NUMBER", "1")
+    node = Node(NonTerminal("<Assignment>"))
+    empty = Node(NonTerminal("<Empty>"))
+    node.setChildren([empty, Node(first), Node(middle)])
+    assert (node.first, node.last) == (first, middle)
+    node.addChild(Node(last))
+    assert (node.first, node.last) == (first, last)
+    assert empty.first is None and empty.last is None
+
+def test_converter_dispatch_table(lexer):
+    converter = ASTConverter()
+    dispatch = converter.dispatch
+    assert dispatch[NonTerminal("<Program>")] == converter._convert_Program
+    assert dispatch[NonTerminal("<VarDeclOpt>")] == converter._convert_VarDeclarationPart
+    # Non-terminal tanpa converter jatuh ke _generic_visit
+    assert converter.visit(Node(NonTerminal("<TidakAda>"))) is None
+    tokens = lexer.tokenize_buffer(PROGRAM)
+    assert converter.convert(SyntaxAnalyzer().parse(tokens)) == SyntaxAnalyzer(build_ast=True).parse(tokens)
@@ -0,0 +1,264 @@
+import glob
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lexical.lexer import Lexer, LexicalError
+from lexical.token import TokenStream
+from syntax import codegen
+from syntax.parsetree import NonTerminal
+from syntax.syntax import SyntaxAnalyzer, SyntaxError
+
+# Setiap mode parser harus menghasilkan parse tree dan SyntaxError yang sama dengan parser
+# default (CFG backtracking rekursif) untuk korpus .pas dan input error turunannya.
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DFA_FILE_PATH = os.path.join(os.path.dirname(TEST_DIR), 'src', 'lexical', 'dfa.json')
+# Jumlah input error per file korpus (token ke-i/(n+1) dihapus atau digandakan)
+MUTATIONS = 4
+
+def tree_signature(node):
+    """Bentuk lengkap parse tree secara preorder: (label, jumlah anak). CompactNode ikut di-expand."""
+    signature = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        children = node.children
+        signature.append((str(node.value), len(children)))
+        stack.extend(reversed(children))
+    return signature
+
+def outcome(parse):
+    """Hasil `parse()`: signature tree, atau posisi, token, dan ekspektasi dari SyntaxError."""
+    try:
+        return ("tree", tree_signature(parse()))
+    except SyntaxError as e:
+        found, _, expected = e.message.partition("Expected ")
+        expected = expected.removeprefix("one of possible tokens: ")
+        return ("error", e.line, e.column, found.strip(), frozenset(expected.split(", ")))
+
+def mutated_sources(lexer, source):
+    """Input error dari `source`: beberapa token dihapus atau digandakan (satu per input)."""
+    tokens = lexer.tokenize_buffer(source)
+    count = len(tokens)
+    for step in range(1, MUTATIONS + 1):
+        index = count * step // (MUTATIONS + 1)
+        start, end = tokens.starts[index], tokens.starts[index] + tokens.lengths[index]
+        if step % 2:
+            yield source[:start] + source[end:]
+        else:
+            yield source[:end] + " " + source[start:end] + source[end:]
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+@pytest.fixture(scope="module")
+def cases(lexer):
+    """(nama, source, hasil parser default) untuk korpus dan input error yang lolos lexer."""
+    cases = []
+    reference = SyntaxAnalyzer()
+    for path in sorted(glob.glob(os.path.join(TEST_DIR, '*', '*.pas'))):
+        with open(path) as f:
+            source = f.read()
+        try:
+            sources = [source] + list(mutated_sources(lexer, source))
+        except LexicalError:
+            continue
+        name = os.path.relpath(path, TEST_DIR)
+        for number, text in enumerate(sources):
+            try:
+                tokens = lexer.tokenize_buffer(text)
+            except LexicalError:
+                continue
+            cases.append((f"{name}#{number}", text, outcome(lambda: reference.parse(tokens))))
+    assert any(expected[0] == "error" for _, _, expected in cases)
+    return cases
+
+def assert_same(cases, parse):
+    """Bandingkan `parse(source)` dengan hasil parser default untuk setiap case."""
+    for name, source, expected in cases:
+        assert outcome(lambda: parse(source)) == expected, name
+
+def parse_buffer(lexer, parser, source):
+    return parser.parse(lexer.tokenize_buffer(source))
+
+def parse_stream(lexer, parser, source):
+    # Chunk kecil agar token dibuang (TokenStream.trim) berkali-kali selama parse
+    return parser.parse(TokenStream(lexer.tokenize_stream(io.StringIO(source), 64), 8))
+
+# (opsi SyntaxAnalyzer, cara token diberikan ke parser)
+MODES = [
+    ({"packrat": True}, parse_buffer),
+    # Memo sangat kecil: entry dibuang (LRU) terus-menerus selama parse
+    ({"packrat": True, "memo_limit": 8}, parse_buffer),
+    ({"predictive": True}, parse_buffer),
+    ({"predictive": True, "packrat": True}, parse_buffer),
+    ({"iterative": True}, parse_buffer),
+    ({"iterative": True, "packrat": True, "predictive": True}, parse_buffer),
+    # value/children CompactNode memberikan bentuk lengkap, termasuk non-terminal kosong yang dibuang
+    ({"compact": True}, parse_buffer),
+    ({"compact": True, "packrat": True, "predictive": True}, parse_buffer),
+    ({"compact": True, "iterative": True}, parse_buffer),
+    ({"two_phase": True}, parse_buffer),
+    ({"two_phase": True, "packrat": True}, parse_buffer),
+    ({"two_phase": True, "iterative": True, "predictive": True}, parse_buffer),
+    ({"generated": True}, parse_buffer),
+    ({"generated": True, "packrat": True, "two_phase": True}, parse_buffer),
+    ({"generated": True, "compact": True}, parse_buffer),
+    ({"pratt": True}, parse_buffer),
+    ({"pratt": True, "packrat": True, "predictive": True}, parse_buffer),
+    ({"pratt": True, "iterative": True, "compact": True}, parse_buffer),
+    ({"pratt": True, "generated": True, "two_phase": True}, parse_buffer),
+    ({"parallel": True, "workers": 2}, parse_buffer),
+    ({}, parse_stream),
+    ({"predictive": True, "packrat": True}, parse_stream),
+    ({"iterative": True, "compact": True}, parse_stream),
+    ({"two_phase": True}, parse_stream),
+    ({"pratt": True}, parse_stream),
+    ({"generated": True}, parse_stream),
+]
+
+def mode_id(options, feed):
+    name = "-".join(key if value is True else f"{key}={value}" for key, value in options.items()) or "default"
+    return name + ("-stream" if feed is parse_stream else "")
+
+@pytest.mark.parametrize("options, feed", MODES, ids=[mode_id(*mode) for mode in MODES])
+def test_mode_matches_default(lexer, cases, options, feed):
+    parser = SyntaxAnalyzer(**options)
+    try:
+        assert_same(cases, lambda source: feed(lexer, parser, source))
+    finally:
+        parser.close()
+
+@pytest.mark.parametrize("iterative", [False, True])
+def test_packrat_memo_limit(lexer, iterative):
+    statements = "".join(f"  jika x > {i} maka x := x - {i} selain-itu x := (x + {i}) * 2;\n" for i in range(60))
+    tokens = lexer.tokenize_buffer(f"program p;\nvariabel x: integer;\nmulai\n{statements}  x := 0\nselesai.\n")
+    expected = tree_signature(SyntaxAnalyzer(iterative=iterative).parse(tokens))
+    unbounded = SyntaxAnalyzer(packrat=True, iterative=iterative).cfg
+    result, state = unbounded.parseToken(tokens)
+    assert tree_signature(result) == expected
+    full = len(state.memo)
+    for limit in (1, 16, full // 3):
+        cfg = SyntaxAnalyzer(packrat=True, memo_limit=limit, iterative=iterative).cfg
+        result, state = cfg.parseToken(tokens)
+        assert tree_signature(result) == expected
+        assert len(state.memo) == limit
+        # LRU: entry yang tersisa adalah yang terakhir dipakai, termasuk <Program> di posisi 0
+        assert list(state.memo)[-1][0] == NonTerminal("<Program>")
+
+def test_iterative_long_statement_list(lexer):
+    statements = "".join(f"  x := x + {i};\n" for i in range(5000))
+    tokens = lexer.tokenize_buffer(f"program panjang;\nvariabel x: integer;\nmulai\n{statements}  x := 0\nselesai.\n")
+    # Jauh melebihi recursion limit default untuk engine rekursif
+    tree = SyntaxAnalyzer(iterative=True).parse(tokens)
+    assert tree_signature(tree)[0] == ("<Program>", 3)
+
+def test_generated_cache(lexer, cases, tmp_path):
+    stale = tmp_path / "parser_0000000000000000.py"
+    stale.write_text("raise ImportError\n")
+    module = codegen.loadGeneratedParser(str(tmp_path))
+    # Modul untuk hash lain dihapus, modul untuk rules.py saat ini tersimpan di cache
+    assert [path.name for path in tmp_path.iterdir()] == [os.path.basename(codegen.generatedPath(str(tmp_path)))]
+    assert codegen.loadGeneratedParser(str(tmp_path)) is module
+    parser = SyntaxAnalyzer()
+    parser.cfg.setGenerated(module)
+    assert_same(cases, lambda source: parser.parse(lexer.tokenize_buffer(source)))
+
+def test_generated_corrupt_cache(lexer, cases, tmp_path):
+    with open(codegen.generatedPath(str(tmp_path)), 'w') as f:
+        f.write("def parse(\n")
+    # File cache yang rusak tidak dipakai, parser di-generate di memori
+    parser = SyntaxAnalyzer()
+    parser.cfg.setGenerated(codegen.loadGeneratedParser(str(tmp_path)))
+    assert_same(cases, lambda source: parser.parse(lexer.tokenize_buffer(source)))
+
+def test_pratt_expressions(lexer):
+    # Ekspresi dengan semua level operator, prefix, akses array/field, dan pemanggilan fungsi
+    expressions = [
+        "-a + b * c - (d bagi 2) mod e",
+        "tidak (a < b) dan c <> d atau e",
+        "f(a, b[1].x, -3) * +g[h(1)]",
+        "a = b = c",
+        "a + * b",
+        "f(a, )",
+        "(a + b",
+    ]
+    reference = SyntaxAnalyzer()
+    parser = SyntaxAnalyzer(pratt=True)
+    for expression in expressions:
+        tokens = lexer.tokenize_buffer(f"program p;\nmulai\n  x := {expression}\nselesai.\n")
+        assert outcome(lambda: parser.parse(tokens)) == outcome(lambda: reference.parse(tokens)), expression
+
+def test_parallel_subprograms(lexer):
+    # Cukup banyak subprogram agar span di-parse di worker, termasuk satu yang gagal
+    subprograms = "".join(
+        f"prosedur p{i}(a: integer);\nvariabel b: integer;\nmulai\n  b := a + {i}\nselesai;\n"
+        for i in range(8)
+    )
+    program = f"program p;\nvariabel x: integer;\n{subprograms}mulai\n  p1(x)\nselesai.\n"
+    broken = program.replace("b := a + 5", "b := a +")
+    parser = SyntaxAnalyzer(parallel=True, workers=2)
+    reference = SyntaxAnalyzer()
+    try:
+        for source in (program, broken):
+            tokens = lexer.tokenize_buffer(source)
+            assert outcome(lambda: parser.parse(tokens)) == outcome(lambda: reference.parse(tokens))
+    finally:
+        parser.close()
+
+@pytest.mark.parametrize("options", [
+    {"incremental": True},
+    {"incremental": True, "predictive": True, "pratt": True},
+    {"incremental": True, "compact": True},
+])
+def test_incremental(lexer, options):
+    # Setiap file korpus: hapus satu token lalu kembalikan, reparse setelah setiap edit
+    reference = SyntaxAnalyzer(**{key: value for key, value in options.items() if key != "incremental"})
+    parser = SyntaxAnalyzer(**options)
+    for path in sorted(glob.glob(os.path.join(TEST_DIR, '*', '*.pas'))):
+        with open(path) as f:
+            source = f.read()
+        try:
+            tokens = lexer.tokenize_buffer(source)
+        except LexicalError:
+            continue
+        name = os.path.relpath(path, TEST_DIR)
+        assert outcome(lambda: parser.parse(tokens)) == outcome(lambda: reference.parse(tokens)), name
+        for step in range(1, MUTATIONS + 1):
+            index = len(tokens) * step // (MUTATIONS + 1)
+            start, length = tokens.starts[index], tokens.lengths[index]
+            lexeme = source[start:start + length]
+            for offset, removed, inserted in ((start, length, ""), (start, 0, lexeme)):
+                try:
+                    tokens, edit = lexer.relex(tokens, offset, removed, inserted)
+                except LexicalError:
+                    break
+                source = tokens.source
+                fresh = lexer.tokenize_buffer(source)
+                assert outcome(lambda: parser.reparse(tokens, edit)) == outcome(lambda: reference.parse(fresh)), (name, step)
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"packrat": True, "predictive": True, "pratt": True},
+    {"iterative": True, "two_phase": True},
+    {"generated": True, "compact": True},
+])
+def test_concurrent_parses(lexer, cases, options):
+    # Satu SyntaxAnalyzer dipakai beberapa thread sekaligus (state per parse di ParseState)
+    parser = SyntaxAnalyzer(**options)
+    sources = [(source, lexer.tokenize_buffer(source)) for _, source, _ in cases]
+    expected = {source: outcome(lambda: parser.parse(tokens)) for source, tokens in sources}
+
+    def run(shift):
+        ordered = sources[shift:] + sources[:shift]
+        return [(source, outcome(lambda: parser.parse(tokens))) for source, tokens in ordered * 3]
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(run, range(0, 6 * 7, 7)))
+    for result in results:
+        for source, actual in result:
+            assert actual == expected[source]
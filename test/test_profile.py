@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+
+import pytest
+
+import compiler
+from lexical.lexer import Lexer
+from syntax.syntax import SyntaxAnalyzer, SyntaxError
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DFA_FILE_PATH = os.path.join(os.path.dirname(TEST_DIR), 'src', 'lexical', 'dfa.json')
+
+SOURCE = """program p;
+variabel
+  a, b: integer;
+mulai
+  a := 1 + 2 * (3 - b);
+  jika a > b maka b := a selain-itu b := 0
+selesai.
+"""
+# Error sintaks di statement terakhir: two_phase mengulang parse dengan pencatatan error
+BROKEN = SOURCE.replace("b := 0", "b := ")
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+def counts(profiler):
+    """toDict tanpa waktu (waktu berbeda di setiap parse)."""
+    result = {}
+    for lhs, stats in profiler.toDict().items():
+        result[lhs] = ({key: value for key, value in stats.items() if key not in ("time", "self_time", "alternatives")},
+                       [{key: value for key, value in alternative.items() if key != "time"}
+                        for alternative in stats["alternatives"]])
+    return result
+
+def profile(lexer, source, **options):
+    parser = SyntaxAnalyzer(profile=True, **options)
+    try:
+        parser.parse(lexer.tokenize_buffer(source))
+    except SyntaxError:
+        pass
+    return parser.profiler
+
+def test_profile_counts(lexer):
+    profiler = profile(lexer, SOURCE)
+    stats = profiler.toDict()
+    assert stats["<Program>"]["calls"] == 1 and stats["<Program>"]["successes"] == 1
+    for lhs, rule in stats.items():
+        assert rule["calls"] == rule["successes"] + rule["failures"], lhs
+        if rule["alternatives"]:
+            # Setiap pemanggilan yang berhasil berhenti di tepat satu alternatif
+            assert sum(alternative["successes"] for alternative in rule["alternatives"]) == rule["successes"], lhs
+            assert sum(alternative["wasted"] for alternative in rule["alternatives"]) == rule["wasted"], lhs
+    # toDict urut waktu terbesar, <Program> membungkus semua aturan lain
+    assert next(iter(stats)) == "<Program>"
+    assert json.loads(profiler.toJSON()) == stats
+
+def test_profile_does_not_change_result(lexer):
+    tokens = lexer.tokenize_buffer(SOURCE)
+    for options in ({}, {"packrat": True, "predictive": True}, {"pratt": True}):
+        expected = SyntaxAnalyzer(build_ast=True, **options).parse(tokens)
+        assert SyntaxAnalyzer(build_ast=True, profile=True, **options).parse(tokens) == expected
+
+@pytest.mark.parametrize("source", [SOURCE, BROKEN])
+def test_two_phase_counts_final_pass_only(lexer, source):
+    # Parse cepat yang gagal dibuang, hasilnya sama dengan satu parse dengan pencatatan error
+    assert counts(profile(lexer, source, two_phase=True)) == counts(profile(lexer, source))
+
+def test_incremental_counts_final_pass_only(lexer):
+    assert counts(profile(lexer, BROKEN, incremental=True)) == counts(profile(lexer, BROKEN, packrat=True))
+
+def test_profile_accumulates_and_resets(lexer):
+    parser = SyntaxAnalyzer(profile=True)
+    tokens = lexer.tokenize_buffer(SOURCE)
+    parser.parse(tokens)
+    once = counts(parser.profiler)
+    parser.parse(tokens)
+    assert counts(parser.profiler)["<Program>"][0]["calls"] == 2
+    parser.profiler.reset()
+    assert parser.profiler.toDict() == {}
+    parser.parse(tokens)
+    assert counts(parser.profiler) == once
+
+def test_format_table(lexer):
+    profiler = profile(lexer, SOURCE)
+    lines = profiler.formatTable().splitlines()
+    assert lines[0].split() == ["Rule", "calls", "ok", "fail", "wasted", "time", "ms", "self", "ms"]
+    assert set(lines[1]) == {"-"}
+    assert lines[2].split()[:3] == ["<Program>", "1", "1"]
+    rules = [line for line in lines[2:] if not line.startswith("  #")]
+    assert [line.split()[0] for line in rules] == list(profiler.toDict())
+    # Alternatif yang pernah dicoba di bawah aturannya, label panjang dipotong
+    assert lines[3].startswith("  #0 ") and all(len(line.split("  ")[1]) <= 40 for line in lines if line.startswith("  #"))
+    limited = profiler.formatTable(limit=2).splitlines()
+    assert len([line for line in limited[2:] if not line.startswith("  #")]) == 2
+
+def run_compiler(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['compiler.py', *args])
+    try:
+        compiler.main()
+        code = 0
+    except SystemExit as e:
+        code = e.code
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "program.pas"
+    path.write_text(SOURCE)
+    return str(path)
+
+def test_cli_parse_profile_table(monkeypatch, capsys, source_file):
+    code, out, err = run_compiler(monkeypatch, capsys, "--parse-profile", source_file)
+    assert code == 0 and out
+    assert err.splitlines()[0].split()[:2] == ["Rule", "calls"]
+    assert err.splitlines()[2].split()[:3] == ["<Program>", "1", "1"]
+
+def test_cli_parse_profile_json(monkeypatch, capsys, source_file):
+    code, out, err = run_compiler(monkeypatch, capsys, "--parse-profile=json", source_file)
+    assert code == 0 and out
+    stats = json.loads(err)
+    assert stats["<Program>"]["calls"] == 1 and stats["<Program>"]["successes"] == 1
+
+def test_cli_parse_profile_on_syntax_error(monkeypatch, capsys, tmp_path):
+    path = tmp_path / "broken.pas"
+    path.write_text(BROKEN)
+    code, _, err = run_compiler(monkeypatch, capsys, "--parse-profile=json", str(path))
+    assert code == 1
+    # Pesan error dicetak sebelum laporan profil, hanya parse diagnostik yang dihitung
+    message, report = err.split("\n{", 1)
+    assert "Unexpected token" in message
+    program = json.loads("{" + report)["<Program>"]
+    assert (program["calls"], program["failures"]) == (1, 1)
+
+@pytest.mark.parametrize("options", [["--parse-profile=xml"], ["--parse-profile", "--generated-parser"]])
+def test_cli_rejects_invalid_profile_options(monkeypatch, capsys, source_file, options):
+    code, _, err = run_compiler(monkeypatch, capsys, *options, source_file)
+    assert code == 1 and err.startswith("Usage:")
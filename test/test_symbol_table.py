@@ -0,0 +1,82 @@
+import pytest
+
+from semantic.ast_decorator import PatchedSymbolTable
+from semantic.symbol_table import SymbolTable, ObjectKind, TypeKind
+
+def chain_lookup(table, name):
+    """Lookup lama: telusuri rantai link setiap block dari scope terdalam."""
+    for lev in range(table.current_level, -1, -1):
+        curr = table.btab[table.display[lev]].last
+        while curr > 0:
+            entry = table.tab[curr]
+            if entry.identifier == name:
+                return curr
+            curr = entry.link
+    return 0
+
+NAMES = ["x", "y", "z", "p", "q", "INTEGER", "TRUE", "tidakada"]
+
+def assert_lookups(table):
+    for name in NAMES:
+        assert table.lookup(name) == chain_lookup(table, name), name
+
+@pytest.fixture(params=[SymbolTable, PatchedSymbolTable])
+def table(request):
+    return request.param()
+
+def test_shadowing_and_exit_scope(table):
+    x = table.add_variable("x", TypeKind.INTEGER)
+    y = table.add_variable("y", TypeKind.REAL)
+    p = table.enter("p", ObjectKind.PROCEDURE, TypeKind.NOTYPE, 0, 1, 0, 0)
+    assert_lookups(table)
+
+    table.enter_scope("p")
+    local_x = table.add_variable("x", TypeKind.REAL)
+    z = table.add_variable("z", TypeKind.INTEGER)
+    assert (table.lookup("x"), table.lookup("y"), table.lookup("z"), table.lookup("p")) == (local_x, y, z, p)
+    assert table.lookup_local("y") == 0 and table.lookup_local("x") == local_x
+    assert_lookups(table)
+
+    table.enter_scope("q")
+    inner_y = table.add_variable("y", TypeKind.CHAR)
+    assert (table.lookup("x"), table.lookup("y")) == (local_x, inner_y)
+    assert_lookups(table)
+    table.exit_scope()
+
+    assert (table.lookup("x"), table.lookup("y")) == (local_x, y)
+    assert_lookups(table)
+    table.exit_scope()
+
+    # Nama lokal tidak terlihat lagi setelah exit_scope, nama global kembali terlihat
+    assert (table.lookup("x"), table.lookup("y"), table.lookup("z")) == (x, y, 0)
+    assert_lookups(table)
+
+def test_sibling_scopes(table):
+    table.enter_scope("p")
+    table.add_variable("z", TypeKind.INTEGER)
+    table.exit_scope()
+    table.enter_scope("q")
+    assert table.lookup("z") == 0 and table.lookup_local("z") == 0
+    q_z = table.add_variable("z", TypeKind.REAL)
+    assert table.lookup("z") == q_z
+    table.exit_scope()
+    assert table.lookup("z") == 0
+
+def test_redeclaration_uses_index(table):
+    table.add_variable("x", TypeKind.INTEGER)
+    with pytest.raises(ValueError, match="Duplicate identifier 'x'"):
+        table.add_variable("x", TypeKind.REAL)
+    with pytest.raises(ValueError, match="Duplicate identifier 'x'"):
+        table.add_constant("x", TypeKind.INTEGER, 1)
+    table.enter_scope("p")
+    table.add_variable("x", TypeKind.REAL)
+    table.exit_scope()
+
+def test_reserved_identifiers(table):
+    integer = table.lookup("INTEGER")
+    assert table.get_entry(integer).obj == ObjectKind.TYPE
+    assert table.get_entry(table.lookup("TRUE")).adr == 1
+    # Keyword tidak ada di rantai link block global
+    assert table.lookup("MULAI") == 0 == chain_lookup(table, "MULAI")
+    # Nama case-sensitive
+    assert table.lookup("integer") == 0
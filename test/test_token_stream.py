@@ -0,0 +1,112 @@
+import io
+import os
+
+import pytest
+
+from lexical.lexer import Lexer
+from lexical.token import TokenStream
+from syntax.syntax import SyntaxAnalyzer, SyntaxError
+
+DFA_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'lexical', 'dfa.json')
+
+class PeakTokenStream(TokenStream):
+    """TokenStream yang mencatat jumlah token dan lexeme terbanyak yang pernah disimpan."""
+    peak = 0
+    peak_lexemes = 0
+
+    def fill(self, index):
+        available = super().fill(index)
+        self.peak = max(self.peak, len(self.kinds))
+        self.peak_lexemes = max(self.peak_lexemes, len(self.lexeme_ids), len(self.lexeme_names))
+        return available
+
+def tree_signature(node):
+    """Label node secara preorder (str() tree bersarang dalam terlalu besar untuk input panjang)."""
+    labels = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        labels.append(node.label())
+        stack.extend(reversed(node.treeChildren()))
+    return labels
+
+def large_program(statements):
+    body = "".join(
+        f"  x := x + {i} * (y - 1);\n  jika x > 3 maka y := 2 selain-itu y := x;\n"
+        for i in range(statements)
+    )
+    return f"program besar;\nvariabel x, y: integer;\nmulai\n{body}  x := 0\nselesai.\n"
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+def parse_stream(lexer, source, chunk_size, **options):
+    tokens = PeakTokenStream(lexer.tokenize_stream(io.StringIO(source), 4096), chunk_size)
+    try:
+        result = tree_signature(SyntaxAnalyzer(**options).parse(tokens))
+    except SyntaxError as e:
+        result = str(e)
+    return result, tokens
+
+# Engine rekursif dibatasi recursion limit, jadi input besar hanya untuk engine iterative
+@pytest.mark.parametrize("statements, chunk_size, options", [
+    (1500, 256, {"iterative": True}),
+    (1500, 256, {"iterative": True, "predictive": True}),
+    (1500, 256, {"iterative": True, "packrat": True, "compact": True}),
+    (100, 32, {}),
+    (100, 32, {"predictive": True, "packrat": True}),
+    (100, 32, {"compact": True}),
+])
+def test_stream_retains_bounded_tokens(lexer, statements, chunk_size, options):
+    source = large_program(statements)
+    result, tokens = parse_stream(lexer, source, chunk_size, **options)
+    assert len(tokens) > 50 * chunk_size
+    assert tokens.peak <= 2 * chunk_size
+    assert result == tree_signature(SyntaxAnalyzer(**options).parse(lexer.tokenize_buffer(source)))
+
+def test_stream_retains_bounded_lexemes(lexer):
+    # Setiap identifier dan angka berbeda, jadi tabel lexeme hanya terbatas jika trim ikut
+    # membuang lexeme yang tidak dipakai token tersimpan
+    body = "".join(f"  v{i} := {i} + w{i};\n" for i in range(3000))
+    source = f"program unik;\nmulai\n{body}  x := 0\nselesai.\n"
+    result, tokens = parse_stream(lexer, source, 128, iterative=True)
+    assert result == tree_signature(SyntaxAnalyzer(iterative=True).parse(lexer.tokenize_buffer(source)))
+    assert len(tokens) > 100 * 128
+    # Lexeme terminal grammar tetap di-intern, sisanya paling banyak sebanyak token tersimpan
+    assert tokens.peak_lexemes <= len(tokens.pinned_lexemes) + 2 * 128
+
+def test_stream_error_after_trim(lexer):
+    source = large_program(1000).replace("x := x + 800 *", "x := x + 800 * *")
+    result, tokens = parse_stream(lexer, source, 64, iterative=True)
+    with pytest.raises(SyntaxError) as expected:
+        SyntaxAnalyzer(iterative=True).parse(lexer.tokenize_buffer(source))
+    assert result == str(expected.value)
+    assert tokens.peak <= 2 * 64
+
+def test_trimmed_tokens_are_not_accessible(lexer):
+    source = large_program(10)
+    expected = lexer.tokenize_buffer(source)
+    tokens = TokenStream(lexer.tokenize_stream(io.StringIO(source), 4096), 16)
+    assert tokens.fill(40)
+    first = tokens[4]
+    assert tokens.trim(20) == 20
+    assert len(tokens.kinds) == len(tokens) - 20
+    with pytest.raises(IndexError):
+        tokens[19]
+    # Index tetap absolut setelah trim
+    assert [tokens[index] for index in range(20, 40)] == [expected[index] for index in range(20, 40)]
+    # Token yang sudah diambil sebelum trim tetap berlaku
+    assert (first.token_type, first.lexeme) == ("IDENTIFIER", "x")
+
+def test_trim_reuses_lexeme_ids(lexer):
+    tokens = TokenStream(lexer.tokenize_stream(io.StringIO("program p; mulai a := b; c := d selesai."), 4096), 4)
+    keyword = tokens.lexeme_id("mulai")
+    assert tokens.fill(5)
+    a = tokens.lexemes[4]
+    assert tokens.trim(5) == 5
+    # 'a' hanya dipakai token yang dibuang, 'mulai' di-intern lewat lexeme_id
+    assert "a" not in tokens.lexeme_ids and tokens.lexeme_ids["mulai"] == keyword
+    assert tokens.fill(9)
+    assert tokens.lexemes[8 - tokens.base] == a  # token 8 (c) memakai ulang id milik a
+    assert [tokens[index].lexeme for index in range(5, 12)] == [":=", "b", ";", "c", ":=", "d", "selesai"]
@@ -0,0 +1,139 @@
+import glob
+import io
+import os
+import sys
+from dataclasses import fields
+
+import pytest
+
+from lexical.lexer import Lexer, LexicalError
+from lexical.token import Token
+from semantic.ast_analyzer import ASTAnalyzerError
+from semantic.ast_decorator import ASTDecorator
+from semantic.ast_nodes import *
+from semantic.print_tree import ASTPrinter
+from semantic.semantic import SemanticAnalyzer, SemanticError
+from syntax.parsetree import Node, NonTerminal
+from syntax.syntax import SyntaxAnalyzer, SyntaxError
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DFA_FILE_PATH = os.path.join(os.path.dirname(TEST_DIR), 'src', 'lexical', 'dfa.json')
+
+# Lebih dalam dari recursion limit Python (traversal rekursif lama gagal dengan RecursionError)
+DEPTH = sys.getrecursionlimit() * 3
+
+def old_print_ast_decorated(node, prefix="", is_last=True):
+    """Printer AST dekorasi rekursif sebelum traversal memakai stack eksplisit."""
+    connector = "└─ " if is_last else "├─ "
+    node_name = node.__class__.__name__.replace("Node", "")
+    line_prefix = "" if prefix == "" else prefix + connector
+    left_part = f"{line_prefix}{node_name}{node._get_inline_details()}"
+    annotations = node._get_annotations()
+    if annotations:
+        result = f"{left_part.ljust(40)}  →  {annotations}\n"
+    else:
+        result = f"{left_part}\n"
+    children = []
+    for f in fields(node):
+        if f.name in ['type', 'symbol_entry']:
+            continue
+        if f.name == "type_node" and node.__class__.__name__ in ["VarDeclNode", "ParameterNode"]:
+            continue
+        val = getattr(node, f.name)
+        if isinstance(val, ASTNode):
+            children.append(val)
+        elif isinstance(val, list):
+            children.extend(item for item in val if isinstance(item, ASTNode))
+    child_prefix = prefix + ("   " if is_last else "│  ")
+    for i, child in enumerate(children):
+        result += old_print_ast_decorated(child, child_prefix, i == len(children) - 1)
+    return result
+
+def old_parse_tree_str(node, level=0, prefix="", is_last=True):
+    """Node.__str__ rekursif lama."""
+    if level == 0:
+        tree_str, child_prefix = f"{node.value}\n", ""
+    else:
+        tree_str = f"{prefix}{'└── ' if is_last else '├── '}{node.value}\n"
+        child_prefix = prefix + ("    " if is_last else "│   ")
+    for i, child in enumerate(node.children):
+        tree_str += old_parse_tree_str(child, level + 1, child_prefix, i == len(node.children) - 1)
+    return tree_str
+
+@pytest.fixture(scope="module")
+def sources():
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(TEST_DIR, 'milestone-*', '*.pas'))):
+        with open(path) as f:
+            sources[os.path.relpath(path, TEST_DIR)] = f.read()
+    return sources
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+def test_write_ast_decorated_matches_old_printer(lexer, sources):
+    checked = 0
+    for name, source in sources.items():
+        try:
+            ast = SyntaxAnalyzer(build_ast=True).parse(lexer.tokenize_buffer(source))
+            decorated, _, _ = SemanticAnalyzer().analyze(ast)
+        except (LexicalError, SyntaxError, SemanticError):
+            continue
+        lines = []
+        decorated.write_ast_decorated(lines.append)
+        expected = old_print_ast_decorated(decorated)
+        assert "".join(lines) == expected == str(decorated), name
+        # Satu baris per panggilan write
+        assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+        checked += 1
+    assert checked >= 4
+
+def test_write_tree_matches_old_printer(lexer, sources):
+    parser = SyntaxAnalyzer()
+    for name, source in sources.items():
+        try:
+            tree = parser.parse(lexer.tokenize_buffer(source))
+        except (LexicalError, SyntaxError):
+            continue
+        out = io.StringIO()
+        tree.writeTree(out.write)
+        assert out.getvalue() == old_parse_tree_str(tree) == str(tree), name
+
+def deep_program(depth, leaf):
+    """Program dengan satu assignment a := a + (a + (... + leaf)) sedalam `depth`, di dalam blok bersarang."""
+    expr = leaf
+    for _ in range(depth):
+        expr = BinOpNode('+', VarNode('a'), expr)
+    statement = AssignNode(VarNode('a'), expr)
+    for _ in range(depth):
+        statement = CompoundNode([statement])
+    return ProgramNode('deep', [VarDeclNode('a', TypeNode('integer'))], statement)
+
+def test_deep_ast_analysis_and_printing():
+    ast = deep_program(DEPTH, NumNode(1))
+    decorated, _, _ = SemanticAnalyzer().analyze(ast)
+    lines = []
+    decorated.write_ast_decorated(lines.append)
+    # Program, VarDecl, Compound x DEPTH, Assign, Var, (BinOp, Var) x DEPTH, Num
+    assert len(lines) == 5 + 3 * DEPTH
+    assert lines[-1].lstrip(" │└├─").startswith("Num(1)")
+    assert ASTPrinter().print(decorated).count("BinOp('+')") == DEPTH
+
+def test_deep_ast_error_propagates():
+    # Error dari daun terdalam sampai ke pemanggil seperti pada rekursi biasa
+    with pytest.raises(ASTAnalyzerError, match="Variable 'b' not declared."):
+        ASTDecorator().generate_decorated_ast(deep_program(DEPTH, VarNode('b')))
+
+def test_deep_parse_tree_printing():
+    root = node = Node(NonTerminal("<Statement>"))
+    for _ in range(DEPTH):
+        child = Node(NonTerminal("<Statement>"))
+        node.addChildren([child, Node(Token("SEMICOLON", ";"))])
+        node = child
+    out = io.StringIO()
+    root.writeTree(out.write)
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 1 + 2 * DEPTH
+    assert lines[DEPTH] == "│   " * (DEPTH - 1) + "├── <Statement>"
+    assert lines[-1] == "└── SEMICOLON(;)"
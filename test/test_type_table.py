@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from lexical.lexer import Lexer
+from semantic.semantic import SemanticAnalyzer, SemanticError
+from semantic.symbol_table import TypeKind, TypeTable, INTEGER_TYPE, REAL_TYPE
+from syntax.syntax import SyntaxAnalyzer
+
+DFA_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'lexical', 'dfa.json')
+
+@pytest.fixture(scope="module")
+def lexer():
+    return Lexer(DFA_FILE_PATH)
+
+def analyze(lexer, source):
+    """Symbol table hasil analisis semantik `source` (AST dibangun langsung oleh parser)."""
+    ast = SyntaxAnalyzer(build_ast=True).parse(lexer.tokenize_buffer(source))
+    _, symbol_table, _ = SemanticAnalyzer().analyze(ast)
+    return symbol_table
+
+def variable_types(lexer, declarations):
+    symbol_table = analyze(lexer, f"program p;\n{declarations}\nmulai\nselesai.\n")
+    def type_of(name):
+        return symbol_table.type_of(symbol_table.get_entry(symbol_table.lookup(name)))
+    return type_of
+
+def test_identical_types_are_interned(lexer):
+    type_of = variable_types(lexer, """tipe
+  TA = larik [1..3] dari integer;
+  TR = rekaman variabel x: integer; y: real; selesai;
+variabel
+  a: larik [1..3] dari integer;
+  b: TA;
+  m: larik [1..2] dari larik [1..3] dari integer;
+  r: rekaman variabel x: integer; y: real; selesai;
+  s: TR;""")
+    assert type_of('a') is type_of('b')
+    assert type_of('m').element is type_of('a')
+    assert type_of('r') is type_of('s')
+    assert type_of('r').kind is TypeKind.RECORD
+    assert type_of('r').field('x') is INTEGER_TYPE and type_of('r').field('y') is REAL_TYPE
+    assert repr(type_of('m')) == "ARRAY[1..2] OF ARRAY[1..3] OF INTEGER"
+
+def test_different_types_are_distinct(lexer):
+    type_of = variable_types(lexer, """variabel
+  a: larik [1..3] dari integer;
+  b: larik [0..3] dari integer;
+  c: larik [1..3] dari real;
+  r: rekaman variabel x: integer; y: real; selesai;
+  s: rekaman variabel y: real; x: integer; selesai;""")
+    assert type_of('a') is not type_of('b')
+    assert type_of('a') is not type_of('c')
+    assert type_of('r') is not type_of('s')
+
+def test_type_table_interning():
+    table = TypeTable()
+    integer = TypeTable.basic(TypeKind.INTEGER)
+    array = table.array(integer, 1, 3, integer)
+    assert table.array(integer, 1, 3, integer) is array
+    assert table.array(integer, 1, 4, integer) is not array
+    record = table.record((("x", integer), ("a", array)))
+    assert table.record((("x", integer), ("a", table.array(integer, 1, 3, integer)))) is record
+    assert TypeTable.size_of(record) == 4
+
+RECORD_PROGRAM = """program R;
+tipe
+  TP = rekaman variabel x: integer; y: real; selesai;
+variabel
+  p: TP;
+  q: rekaman variabel x: integer; y: real; selesai;
+  m: larik [1..2] dari larik [1..2] dari integer;
+  n: integer;
+  z: real;
+mulai
+  p.x := 3;
+  p.y := p.x;
+  n := p.x + m[1][2];
+  z := q.y;
+  q := p;
+  m[2][1] := n
+selesai.
+"""
+
+def test_record_field_access_type_checks(lexer):
+    analyze(lexer, RECORD_PROGRAM)
+
+@pytest.mark.parametrize("statement, message", [
+    ("n := p.y", "Type mismatch in assignment. Cannot assign REAL to INTEGER"),
+    ("n := p", "Type mismatch in assignment. Cannot assign RECORD(x: INTEGER; y: REAL) to INTEGER"),
+    ("n := p.w", "Record has no field 'w'."),
+    ("n := n.x", "Variable is not a record."),
+    ("n := m[1]", "Type mismatch in assignment. Cannot assign ARRAY[1..2] OF INTEGER to INTEGER"),
+    ("n := m[1][3]", "Array index out of bounds: 3. Valid: [1..2]"),
+])
+def test_record_and_array_errors(lexer, statement, message):
+    source = RECORD_PROGRAM.replace("  m[2][1] := n\n", f"  m[2][1] := n;\n  {statement}\n")
+    with pytest.raises(SemanticError) as error:
+        analyze(lexer, source)
+    assert str(error.value.message) == message
+
+def test_unknown_record_type_is_not_checked(lexer):
+    # Tipe yang tidak ter-resolve (NOTYPE) tidak menghasilkan error akses field
+    analyze(lexer, "program p;\nvariabel\n  u: TTidakAda;\n  n: integer;\nmulai\n  n := u.x;\n  u.x := n\nselesai.\n")